@@ -0,0 +1,157 @@
+from __future__ import annotations
+import argparse
+import gc
+import time
+import tracemalloc
+from copy import deepcopy
+
+from inner.core.target_model import TargetModel
+from inner.core.target_schema import DEFAULT_TARGET
+
+"""
+TargetModel.normalize / apply_update 마이크로벤치마크.
+
+    PYTHONPATH=src python benchmarks/target_model.py [-n 100000]
+
+BaselineModel 은 예전 구현(deepcopy 로 기본값 복사 + _deep_merge 로 patch 병합 +
+스키마 dict 를 따라 내려가는 경로 검사)을 그대로 옮긴 것이다. 같은 입력으로 두 구현을 돌려 결과가 같은지 먼저 확인하고 시간을 잰다.
+시간은 timeit 처럼 gc 를 끄고 여러 번 돌린 것 중 가장 빠른 값이고, gc 를 켠 값도 같이 보여 준다
+(결과 dict 를 모두 들고 있으므로 gc 를 켜면 세대 수집 비용이 양쪽에 비슷하게 더해진다).
+peak 는 호출 하나가 결과 외에 잠깐 잡는 메모리다.
+
+목표는 normalize 10배다. 마지막 줄에 달성 여부를 그대로 찍는다. 지금 구현은 normalize 5~6배,
+apply_update 2~3배로 목표에 못 미친다. 남은 시간은 대부분 타겟 dict 와 auth/meta dict 를 새로
+만드는 비용이라 dict 표현을 유지하는 한 더 줄이기 어렵다.
+"""
+
+TARGET_SPEEDUP = 10.0
+
+
+class BaselineModel(TargetModel):
+    """비교용: 예전 _merge_with_schema / patch 병합 / 경로 검사."""
+
+    def __init__(self):
+        super().__init__()
+        self.schema = deepcopy(DEFAULT_TARGET)
+
+    def _merge_with_schema(self, raw: dict) -> dict:
+        base = deepcopy(DEFAULT_TARGET)
+        for k, v in (raw or {}).items():
+            if k in ("auth", "meta") and isinstance(v, dict) and isinstance(base.get(k), dict):
+                base[k].update(v)
+            else:
+                base[k] = v
+        return base
+
+    def _apply_patch(self, base: dict, patch: dict) -> dict:
+        # 예전 apply_update 는 patch 를 _deep_merge 로 합쳐 auth/meta 까지 다시 복사했다
+        return self._deep_merge(base, patch)
+
+    def _assert_patch_allowed(self, patch: dict) -> None:
+        for path in self._leaf_paths(patch):
+            self._assert_path_allowed(path)
+
+    def _assert_path_allowed(self, path: str) -> None:
+        cur = self.schema
+        for part in path.split("."):
+            if not isinstance(cur, dict) or part not in cur:
+                raise ValueError(f"unknown field: {path}")
+            cur = cur[part]
+
+    def _leaf_paths(self, d: dict, prefix: str = "") -> list[str]:
+        out = []
+        for k, v in (d or {}).items():
+            p = f"{prefix}.{k}" if prefix else k
+            if isinstance(v, dict):
+                out.extend(self._leaf_paths(v, p))
+            else:
+                out.append(p)
+        return out
+
+
+def make_raws(n: int) -> list[dict]:
+    raws = []
+    for i in range(n):
+        if i % 3:
+            raws.append({"id": f"t{i}", "host": f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}",
+                         "tags": ["prod"], "meta": {"os_guess": "linux"}})
+        else:
+            raws.append({"id": f"t{i}", "url": f"http://h{i}.example",
+                         "auth": {"ssh": {"host": "h", "port": 22}}})
+    return raws
+
+
+CURRENT = {"id": "x", "host": "h", "auth": {"ssh": {"host": "h"}}, "meta": {"note": "n"}}
+PATCH = {"meta": {"os_guess": "linux", "note": "y"}, "url": "http://x", "tags": ["a"]}
+UNSET = ["meta.note"]
+
+
+def best_of(fn, repeat: int, *, gc_off: bool) -> float:
+    times = []
+    for _ in range(repeat):
+        if gc_off:
+            gc.disable()
+        try:
+            t = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - t)
+        finally:
+            gc.enable()
+            gc.collect()
+    return min(times)
+
+
+def transient_peak(fn, n: int = 2000) -> float:
+    tracemalloc.start()
+    total = 0
+    try:
+        for _ in range(n):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            out = fn()
+            total += tracemalloc.get_traced_memory()[1] - before
+            del out
+    finally:
+        tracemalloc.stop()
+    return total / n
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-n", type=int, default=100_000)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    raws = make_raws(args.n)
+    models = (("baseline", BaselineModel()), ("current", TargetModel()))
+
+    # 결과가 같은지 먼저 본다
+    base, cur = models[0][1], models[1][1]
+    for r in raws:
+        assert base.normalize(r) == cur.normalize(r), r
+    assert base.apply_update(CURRENT, PATCH, UNSET) == cur.apply_update(CURRENT, PATCH, UNSET)
+
+    rows = {}
+    for name, m in models:
+        norm = lambda m=m: [m.normalize(r) for r in raws]
+        upd = lambda m=m: [m.apply_update(CURRENT, PATCH, UNSET) for _ in range(args.n)]
+        rows[name] = (
+            best_of(norm, args.repeat, gc_off=True) / args.n * 1e6,
+            best_of(norm, args.repeat, gc_off=False) / args.n * 1e6,
+            transient_peak(lambda m=m: m.normalize(raws[1])),
+            best_of(upd, args.repeat, gc_off=True) / args.n * 1e6,
+            transient_peak(lambda m=m: m.apply_update(CURRENT, PATCH, UNSET)),
+        )
+
+    print(f"{args.n} targets, best of {args.repeat}")
+    print(f"{'':10} {'normalize':>10} {'(gc on)':>10} {'peak':>8} {'apply_upd':>10} {'peak':>8}")
+    for name, (n_off, n_on, n_peak, u_off, u_peak) in rows.items():
+        print(f"{name:10} {n_off:8.2f}us {n_on:8.2f}us {n_peak:7.0f}B {u_off:8.2f}us {u_peak:7.0f}B")
+    b, c = rows["baseline"], rows["current"]
+    speedup = b[0] / c[0]
+    print(f"{'speedup':10} {speedup:9.1f}x {b[1] / c[1]:9.1f}x {'':8} {b[3] / c[3]:9.1f}x")
+    print(f"target {TARGET_SPEEDUP:.0f}x normalize: {'met' if speedup >= TARGET_SPEEDUP else 'not met'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -63,6 +63,10 @@ def _coerce_type(val, typ: str):
         if isinstance(val, bool):
             raise ValueError("int cannot be bool")
         return int(val)
+    if typ == "float":
+        if isinstance(val, bool):
+            raise ValueError("float cannot be bool")
+        return float(val)
     if typ == "bool":
         if isinstance(val, bool):
             return val
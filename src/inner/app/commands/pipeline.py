@@ -0,0 +1,105 @@
+from __future__ import annotations
+from rich.console import Console
+
+from inner.core.artifacts import has_path
+from inner.core.pipeline import PipelineError, module_io, plan, run_pipeline
+from inner.core.result_schema import validate_result, ResultSchemaError
+from inner.core.runner import error_result, missing_options
+from inner.core.storage.backend import open_result_store
+
+console = Console()
+
+def register(scanner, state):
+
+    def _resolve_modules(tokens):
+        if tokens == ["all"]:
+            return [scanner.modules[mid] for mid in sorted(scanner.modules)]
+
+        candidates = state.get("module_candidates") or sorted(scanner.modules)
+        out = []
+        for tok in tokens:
+            mid = tok
+            if tok.isdigit():
+                idx = int(tok)
+                if idx < 0 or idx >= len(candidates):
+                    raise PipelineError(f"invalid module index: {idx}")
+                mid = candidates[idx]
+            m = scanner.get_module(mid)
+            if not m:
+                raise PipelineError(f"unknown module: {mid}")
+            out.append(m)
+        return out
+
+    def _options_for(module):
+        # 사용 중인 모듈은 set 한 값을, 나머지는 기본값을 쓴다
+        mid = module.MODULE["id"]
+        opts = {k: v.get("default") for k, v in module.MODULE.get("options", {}).items()}
+        if mid == state.get("module_id"):
+            opts.update(state.get("options") or {})
+        return opts
+
+    def _show_plan(modules, artifacts):
+        produced = {o for m in modules for o in module_io(m)[1]}
+        for i, level in enumerate(plan(modules)):
+            console.print(f"[bold]stage {i}[/bold]: {', '.join(level)}")
+        for m in modules:
+            for inp in module_io(m)[0]:
+                if inp not in produced and not has_path(artifacts, inp):
+                    console.print(f"[yellow]warn[/yellow] {m.MODULE['id']}: input '{inp}' has no producer")
+
+    def pipeline_cmd(args):
+        sub = args[0].lower() if args else ""
+        if sub not in ("plan", "run") or len(args) < 2:
+            console.print("[red]usage:[/red] pipeline [plan|run] <module_id|index ...|all>")
+            return
+
+        try:
+            modules = _resolve_modules(args[1:])
+        except PipelineError as e:
+            console.print(f"[red]{e}[/red]")
+            return
+
+        target_id = state.get("target_id")
+        target = scanner.get_target(target_id) if target_id else None
+
+        store = open_result_store()
+        artifacts = store.aggregate_artifacts(target_id) if target_id else {}
+
+        try:
+            _show_plan(modules, artifacts)
+        except PipelineError as e:
+            console.print(f"[red]{e}[/red]")
+            return
+
+        if sub == "plan":
+            return
+
+        for m in modules:
+            missing = missing_options(m, _options_for(m))
+            if missing:
+                console.print(f"[red]{m.MODULE['id']}: missing required options: {', '.join(missing)}[/red]")
+                return
+
+        console.print(f"[bold cyan][*] running pipeline ({len(modules)} stages)[/bold cyan]")
+
+        for m, result, err in run_pipeline(modules, target, _options_for, artifacts=artifacts):
+            mid = m.MODULE["id"]
+            if isinstance(err, PipelineError):
+                console.print(f"[yellow][-] {mid}: {err}[/yellow]")
+                continue
+            if err is not None:
+                console.print(f"[magenta][!] {mid}: {type(err).__name__}: {err}[/magenta]")
+                result = error_result(m, target_id, err)
+
+            try:
+                validate_result(result)
+                store.append(result, validated=True)
+            except ResultSchemaError as e:
+                console.print(f"[red]{mid}: invalid result schema:[/red] {e}")
+                continue
+
+            console.print(f"[green][+][/green] {mid} {result.get('status')} {result.get('title', '')}")
+
+        console.print("[green][+] pipeline finished[/green]")
+
+    return pipeline_cmd
@@ -3,19 +3,58 @@ import json
 from rich.console import Console
 from rich.table import Table
 
-from inner.core.storage.result_store import ResultStore
+from inner.core.storage.backend import open_result_store
 
 console = Console()
 
+PAGE_SIZE = 50
+
+
+class ResultPager:
+    """
+    결과 목록을 쪽 단위로 읽는다. fetch(offset, limit) 가 그 쪽의 결과를 돌려준다.
+    state["result_candidates"] 로도 쓰이므로 len()/[i] 를 지원한다 (본 적 없는 쪽은 그때 읽는다).
+    """
+
+    def __init__(self, fetch, total: int, page_size: int = PAGE_SIZE):
+        self.fetch = fetch
+        self.total = total
+        self.page_size = max(1, page_size)
+        self.offset = 0
+        self._ids: dict[int, list] = {}   # offset -> 그 쪽의 result_id 목록
+
+    def page(self, offset: int) -> list:
+        items = self.fetch(offset, self.page_size)
+        self._ids[offset] = [r.get("result_id") for r in items]
+        self.offset = offset
+        return items
+
+    def __len__(self) -> int:
+        return self.total
+
+    def __getitem__(self, idx: int):
+        if idx < 0 or idx >= self.total:
+            raise IndexError(idx)
+        start = idx - idx % self.page_size
+        ids = self._ids.get(start)
+        if ids is None:
+            ids = self._ids[start] = [r.get("result_id") for r in self.fetch(start, self.page_size)]
+        if idx - start >= len(ids):
+            raise IndexError(idx)
+        return ids[idx - start]
+
 def register(scanner, state):
-    store = ResultStore()
+    store = open_result_store()
 
-    def _render(items):
+    def _render(items, start=0, total=None):
         if not items:
             console.print("[dim](no results)[/dim]")
             return
 
-        table = Table(title="Results")
+        title = "Results"
+        if total is not None:
+            title = f"Results {start + 1}-{start + len(items)} of {total}"
+        table = Table(title=title)
         table.add_column("#", justify="right")
         table.add_column("result_id", style="bold")
         table.add_column("status")
@@ -24,7 +63,7 @@ def register(scanner, state):
         table.add_column("module")
         table.add_column("title")
 
-        for i, r in enumerate(items):
+        for i, r in enumerate(items, start):
             status = r.get("status", "")
             style = None
             if status == "FAIL":
@@ -45,6 +84,13 @@ def register(scanner, state):
                 style=style,
             )
         console.print(table)
+        if total is not None and total > len(items):
+            console.print("[dim]results next / results prev[/dim]")
+
+    def _show_page(pager, offset):
+        items = pager.page(offset)
+        state["result_candidates"] = pager
+        _render(items, offset, pager.total)
 
     def _parse_filters(args):
         # key=value 형태만 필터로
@@ -62,25 +108,49 @@ def register(scanner, state):
         candidates = state.get("result_candidates") or []
         if token.isdigit():
             idx = int(token)
-            if idx < 0 or idx >= len(candidates):
+            try:
+                return candidates[idx]
+            except IndexError:
                 console.print(f"[red]invalid index:[/red] {idx}")
                 return None
-            return candidates[idx]
         return token
 
     def results_cmd(args):
         sub = args[0].lower() if args else "list"
 
         if sub == "list":
+            # results list [key=value ...] [sort=-severity] [limit=50] : 쪽 단위로 필요한 만큼만 읽는다
             filters = _parse_filters(args[1:])
-            items = store.list(
-                target_id=filters.get("target_id"),
-                module_id=filters.get("module_id"),
-                status=filters.get("status"),
-                severity=filters.get("severity"),
-            )
-            state["result_candidates"] = [r.get("result_id") for r in items]
-            _render(items)
+            query = {
+                k: filters.get(k)
+                for k in ("target_id", "module_id", "status", "severity", "since", "until")
+            }
+            sort = filters.get("sort")
+            limit = filters.get("limit", "")
+            page_size = int(limit) if limit.isdigit() and int(limit) > 0 else PAGE_SIZE
+            try:
+                total = store.count(**query)
+                pager = ResultPager(
+                    lambda offset, n: store.list(**query, sort=sort, offset=offset, limit=n),
+                    total,
+                    page_size,
+                )
+                _show_page(pager, 0)
+            except ValueError as e:
+                console.print(f"[red]{e}[/red]")
+            return
+
+        if sub in ("next", "prev"):
+            pager = state.get("result_candidates")
+            if not isinstance(pager, ResultPager):
+                console.print("[dim](run results list or results search first)[/dim]")
+                return
+            step = pager.page_size if sub == "next" else -pager.page_size
+            offset = pager.offset + step
+            if offset < 0 or offset >= pager.total:
+                console.print(f"[dim](no {'more' if sub == 'next' else 'previous'} results)[/dim]")
+                return
+            _show_page(pager, offset)
             return
 
         if sub == "show":
@@ -91,36 +161,21 @@ def register(scanner, state):
             if not rid:
                 return
 
-            for r in store.iter_all() or []:
-                if r.get("result_id") == rid:
-                    console.print_json(json.dumps(r, ensure_ascii=False, indent=2))
-                    return
-            console.print(f"[red]result not found:[/red] {rid}")
+            r = store.get(rid)
+            if r is None:
+                console.print(f"[red]result not found:[/red] {rid}")
+                return
+            console.print_json(json.dumps(r, ensure_ascii=False, indent=2))
             return
 
         if sub == "search":
             if len(args) < 2:
-                console.print("[red]usage:[/red] results search <keyword>")
+                console.print("[red]usage:[/red] results search <word> [word...]")
                 return
-            kw = " ".join(args[1:]).lower()
-
-            found = []
-            for r in store.iter_all() or []:
-                hay = " ".join([
-                    str(r.get("result_id","")),
-                    str(r.get("module_id","")),
-                    str(r.get("target_id","")),
-                    str(r.get("status","")),
-                    str(r.get("severity","")),
-                    str(r.get("title","")),
-                    str(r.get("description","")),
-                    " ".join(r.get("tags", []) or []),
-                ]).lower()
-                if kw in hay:
-                    found.append(r)
-
-            state["result_candidates"] = [r.get("result_id") for r in found]
-            _render(found)
+            # 단어마다 prefix 일치, 모든 단어 AND (역색인 사용)
+            found = store.search(" ".join(args[1:]))
+
+            _show_page(ResultPager(lambda offset, n: found[offset:offset + n], len(found)), 0)
             return
 
         if sub in ("remove", "rm", "del"):
@@ -153,6 +208,46 @@ def register(scanner, state):
             console.print("[green][+] cleared results[/green]")
             return
 
-        console.print("[red]usage:[/red] results [list|show|search|remove|clear]")
+        if sub == "compact":
+            stats = store.compact()
+            console.print(
+                f"[green][+] compacted:[/green] kept {stats['kept']}, dropped {stats['dropped']}, "
+                f"{stats['bytes_before']} -> {stats['bytes_after']} bytes"
+            )
+            return
+
+        if sub == "segments":
+            # results segments [seal] : 봉인된 gzip 세그먼트 요약 (seal 이면 활성 세그먼트를 지금 봉인)
+            if len(args) > 1 and args[1].lower() == "seal":
+                seg = store.seal()
+                if seg is None:
+                    console.print("[dim](nothing to seal)[/dim]")
+                else:
+                    console.print(f"[green][+] sealed:[/green] {seg['name']} ({seg['count']} lines)")
+
+            segs = store.segments()
+            if not segs:
+                console.print("[dim](no sealed segments)[/dim]")
+                return
+            table = Table(title="Segments")
+            table.add_column("name", style="bold")
+            table.add_column("lines", justify="right")
+            table.add_column("min_ts")
+            table.add_column("max_ts")
+            table.add_column("targets", justify="right")
+            table.add_column("bytes", justify="right")
+            for s in segs:
+                table.add_row(
+                    s["name"],
+                    str(s["count"]),
+                    str(s.get("min_ts") or ""),
+                    str(s.get("max_ts") or ""),
+                    str(len(s.get("targets") or [])),
+                    str(s["size"]),
+                )
+            console.print(table)
+            return
+
+        console.print("[red]usage:[/red] results [list|next|prev|show|search|remove|clear|compact|segments]")
 
     return results_cmd
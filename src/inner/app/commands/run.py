@@ -1,52 +1,153 @@
 from rich.console import Console
 from inner.core.result_schema import validate_result, ResultSchemaError
-from inner.core.storage.result_store import ResultStore
-from inner.core.clients.http import HttpClient
+from inner.core.config import load_config
+from inner.core.storage.backend import open_result_store
+from inner.core.storage.result_writer import DURABILITY, ResultWriter
+from inner.core.runner import build_ctx, error_result, invoke_module, missing_options, run_many
+from inner.core.target_query import TargetQueryError
 
 console = Console()
 
+def _parse_filters(args):
+    st = load_config()["storage"]
+    filters = {
+        "query": [], "workers": 4,
+        "durability": st["durability"],
+        "every": int(st["durability_every"]),
+        "interval": float(st["durability_interval"]),
+    }
+    for p in args:
+        # field:value 는 타겟 질의 조건 (tag:prod os_guess:linux -tag:decom)
+        if ":" in p and ("=" not in p or p.index(":") < p.index("=")):
+            filters["query"].append(p)
+            continue
+        if "=" not in p:
+            console.print(f"[yellow]ignored[/yellow] {p} (use key=value or field:value)")
+            continue
+        k, v = [x.strip() for x in p.split("=", 1)]
+        if k in ("tag", "tags"):
+            # 예전 형식: tag=a,b 는 모든 태그를 가진 타겟
+            filters["query"].extend(f"tag:{x}" for x in v.split(",") if x)
+        elif k == "type":
+            filters["query"].append(f"type:{v}")
+        elif k == "workers" and v.isdigit():
+            filters["workers"] = int(v)
+        elif k == "durability" and v in DURABILITY:
+            filters["durability"] = v
+        elif k == "every" and v.isdigit():
+            filters["every"] = int(v)
+        elif k == "interval":
+            try:
+                filters["interval"] = float(v)
+            except ValueError:
+                console.print(f"[yellow]ignored[/yellow] {p}")
+        else:
+            console.print(f"[yellow]ignored[/yellow] {p}")
+    return filters
+
 def register(scanner, state):
-    def run_cmd(args):
+    def _prepare():
         mid = state.get("module_id")
         if not mid:
             console.print("[red]no module in use[/red]")
-            return
-
-        target_id = state.get("target_id")
-        target = scanner.get_target(target_id) if target_id else None
+            return None, None
 
         module = scanner.get_module(mid)
-        spec = module.MODULE.get("options", {})
         opts = state.get("options", {})
 
-        missing = [
-            k for k, s in spec.items()
-            if s.get("required") and (opts.get(k) in (None, ""))
-        ]
+        missing = missing_options(module, opts)
         if missing:
             console.print(f"[red]missing required options: {', '.join(missing)}[/red]")
+            return None, None
+        return module, opts
+
+    def run_all(args):
+        module, opts = _prepare()
+        if not module:
             return
 
-        console.print(f"[bold cyan][*] running module {mid}[/bold cyan]")
+        filters = _parse_filters(args)
+        supported = set(module.MODULE.get("targets") or ["host", "url"])
 
-        store = ResultStore()
-        http_client = HttpClient(
-            timeout=opts.get("timeout", 5),
+        try:
+            selected = scanner.select_targets(" ".join(filters["query"]))
+        except TargetQueryError as e:
+            console.print(f"[red]{e}[/red]")
+            return
+        targets = [t for t in selected if t.get("type") in supported]
+        if not targets:
+            console.print("[dim](no matching targets)[/dim]")
+            return
+
+        mid = module.MODULE["id"]
+        console.print(
+            f"[bold cyan][*] running module {mid} on {len(targets)} targets "
+            f"(workers={filters['workers']})[/bold cyan]"
         )
 
-        ctx = {
-            "target": target,
-            "options": opts,
-            "artifacts": store.aggregate_artifacts(target_id) if target_id else {},
-            "meta": {
-                "module_id": mid,
-            },
-            "clients": {
-                "http": http_client
-            },
-        }
+        store = open_result_store()
+        stored = failed = 0
+
+        # 결과는 durability 정책에 따라 모아서 쓰고, 중단되어도 finally 에서 남은 버퍼를 쓴다
+        writer = ResultWriter(
+            store,
+            durability=filters["durability"],
+            every=filters["every"],
+            interval=filters["interval"],
+        )
+        try:
+            for t, result, err in run_many(
+                module, targets, opts,
+                workers=filters["workers"],
+                artifacts_for=store.aggregate_artifacts,
+            ):
+                tid = t.get("id")
+                if err is not None:
+                    failed += 1
+                    result = error_result(module, tid, err)
+                    console.print(f"[magenta][!] {tid}: {type(err).__name__}: {err}[/magenta]")
+
+                if not result:
+                    console.print(f"[dim]{tid}: (no result)[/dim]")
+                    continue
 
-        result = module.run(ctx)
+                try:
+                    writer.add(result)
+                except ResultSchemaError as e:
+                    failed += 1
+                    console.print(f"[red]{tid}: invalid result schema:[/red] {e}")
+                    continue
+
+                stored += 1
+                console.print(f"[green][+][/green] {tid} {result.get('status')} {result.get('title', '')}")
+        finally:
+            writer.close()
+            store.close()
+
+        console.print(f"[green][+] batch finished: {stored} stored, {failed} failed[/green]")
+
+    def run_cmd(args):
+        if args and args[0].lower() == "all":
+            run_all(args[1:])
+            return
+
+        module, opts = _prepare()
+        if not module:
+            return
+
+        mid = module.MODULE["id"]
+        target_id = state.get("target_id")
+        target = scanner.get_target(target_id) if target_id else None
+
+        console.print(f"[bold cyan][*] running module {mid}[/bold cyan]")
+
+        store = open_result_store()
+        ctx = build_ctx(
+            module, target, opts,
+            artifacts=store.aggregate_artifacts(target_id) if target_id else {},
+        )
+
+        result = invoke_module(module, ctx)
 
 
         try:
@@ -58,9 +159,9 @@ def register(scanner, state):
         if not result:
             console.print("[dim](no result)[/dim]")
             return
-        
+
         try:
-            store.append(result)
+            store.append(result, validated=True)
         except ResultSchemaError as e:
             console.print(f"[red]invalid result schema:[/red] {e}")
             return
@@ -0,0 +1,70 @@
+from __future__ import annotations
+from pathlib import Path
+from rich.console import Console
+
+from inner.core.config import load_config
+from inner.core.storage.backend import sqlite_database
+from inner.core.storage.result_store import ResultStore
+from inner.core.storage.sqlite_store import SqliteResultStore, SqliteTargetStore
+from inner.core.storage.target_store import TargetStore
+
+console = Console()
+
+USAGE = "storage [info|migrate [targets=<targets.json>] [results=<results.jsonl>]]"
+
+
+def register(scanner, state):
+    def _info(cfg):
+        st = cfg["storage"]
+        console.print(f"backend: [bold]{st['backend']}[/bold]")
+        if st["backend"] == "sqlite":
+            console.print(f"sqlite_path: {st['sqlite_path']}")
+        else:
+            console.print(f"targets_path: {st['targets_path']}")
+            console.print(f"results_path: {st['results_path']}")
+
+    def _migrate(cfg, args):
+        st = cfg["storage"]
+        paths = {"targets": st["targets_path"], "results": st["results_path"]}
+        for p in args:
+            if "=" not in p:
+                console.print(f"[yellow]ignored[/yellow] {p} (use key=value)")
+                continue
+            k, v = [x.strip() for x in p.split("=", 1)]
+            if k not in paths:
+                console.print(f"[yellow]ignored[/yellow] {p}")
+                continue
+            paths[k] = v
+
+        db = sqlite_database(st["sqlite_path"])
+        console.print(f"[bold cyan][*] migrating into {st['sqlite_path']}[/bold cyan]")
+
+        if Path(paths["targets"]).exists():
+            added, skipped = SqliteTargetStore(db=db).add_many(TargetStore(paths["targets"]).list())
+            console.print(f"[green][+] targets:[/green] {added} imported, {skipped} skipped")
+        else:
+            console.print(f"[dim]targets: {paths['targets']} not found[/dim]")
+
+        src = ResultStore(paths["results"])
+        if src.log.size():
+            added, skipped = SqliteResultStore(db=db).import_many(src.iter_all())
+            console.print(f"[green][+] results:[/green] {added} imported, {skipped} skipped")
+        else:
+            console.print(f"[dim]results: {paths['results']} not found[/dim]")
+
+        if st["backend"] != "sqlite":
+            console.print('[dim]set "storage": {"backend": "sqlite"} in data/config.json (or INNER_STORAGE=sqlite) to use it[/dim]')
+
+    def storage_cmd(args):
+        sub = args[0].lower() if args else "info"
+        cfg = load_config()
+
+        if sub == "info":
+            _info(cfg)
+            return
+        if sub == "migrate":
+            _migrate(cfg, args[1:])
+            return
+        console.print(f"[red]usage:[/red] {USAGE}")
+
+    return storage_cmd
@@ -1,5 +1,8 @@
 from __future__ import annotations
 import json
+import time
+
+from inner.core.target_query import TargetQueryError
 
 def set_path(d: dict, path: str, value):
     keys = path.split(".")
@@ -48,10 +51,11 @@ def register(scanner, state):
             "rm": remove,
             "del": remove,
             "use": use,
+            "import": import_,
         }
         fn = handlers.get(sub)
         if not fn:
-            print("usage: targets [list|show|add|set|unset|remove]")
+            print("usage: targets [list|show|add|import|set|unset|remove]")
             return
         fn(args[1:])
 
@@ -67,6 +71,42 @@ def register(scanner, state):
         except Exception as e:
             print(f"[-] {e}")
 
+    def import_(args):
+        # targets import <file> [format=csv|jsonl|hosts] [tag=a,b]
+        if not args:
+            print("usage: targets import <file> [format=csv|jsonl|hosts] [tag=a,b]")
+            return
+        path, fmt, tags = args[0], None, []
+        for p in args[1:]:
+            if "=" not in p:
+                print(f"[-] need key=value: {p}")
+                return
+            k, v = [x.strip() for x in p.split("=", 1)]
+            if k == "format":
+                fmt = v
+            elif k in ("tag", "tags"):
+                tags.extend(x for x in v.split(",") if x)
+            else:
+                print(f"[-] unknown option: {k}")
+                return
+
+        started = time.time()
+        try:
+            report = scanner.import_targets(path, fmt=fmt, tags=tags)
+        except (OSError, ValueError) as e:
+            print(f"[-] {e}")
+            return
+
+        print(
+            f"[+] imported {report.added} targets "
+            f"(read {report.read}, duplicates {report.duplicates}, invalid {report.invalid}) "
+            f"in {time.time() - started:.1f}s"
+        )
+        for err in report.errors:
+            print(f"    [-] {err}")
+        if report.invalid > len(report.errors):
+            print(f"    ... {report.invalid - len(report.errors)} more")
+
     def set_(args):
         if len(args) < 2:
             print("usage: targets set <id> key=value [key=value ...]")
@@ -102,12 +142,20 @@ def register(scanner, state):
         except Exception as e:
             print(f"[-] {e}")
 
-    def list_(_args):
-        items = scanner.list_targets()
+    def list_(args):
+        # targets list [tag:prod type:url os_guess:linux -tag:decom ...]
+        if args:
+            try:
+                items = scanner.select_targets(" ".join(args))
+            except TargetQueryError as e:
+                print(f"[-] {e}")
+                return
+        else:
+            items = scanner.list_targets()
         state["target_candidates"] = [t.get("id") for t in items]
 
         if not items:
-            print("(no targets)")
+            print("(no matching targets)" if args else "(no targets)")
             return
 
         for i, t in enumerate(items):
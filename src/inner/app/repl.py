@@ -3,6 +3,8 @@ from inner.app.commands.targets import register as register_targets
 from inner.app.commands.modules import register as register_modules
 from inner.app.commands.run import register as register_run
 from inner.app.commands.results import register as register_results
+from inner.app.commands.pipeline import register as register_pipeline
+from inner.app.commands.storage import register as register_storage
 
 def repl():
     scanner = Scanner()
@@ -23,6 +25,8 @@ def repl():
     cmd_modules = register_modules(scanner, state)
     cmd_run = register_run(scanner, state)
     cmd_results = register_results(scanner, state)
+    cmd_pipeline = register_pipeline(scanner, state)
+    cmd_storage = register_storage(scanner, state)
 
     commands = {
         "help": cmd_help,
@@ -40,6 +44,8 @@ def repl():
         "run": cmd_run,
         "results": cmd_results,
         "result": cmd_results,
+        "pipeline": cmd_pipeline,
+        "storage": cmd_storage,
 
     }
 
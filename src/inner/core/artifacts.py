@@ -0,0 +1,79 @@
+from __future__ import annotations
+import json
+from typing import Any, Dict, Optional, Tuple
+
+
+def _item_key(item: Any) -> Any:
+    """리스트 중복 제거용 키. dict/list 같은 unhashable 항목은 정규화한 JSON 문자열로 비교한다."""
+    try:
+        hash(item)
+        return item
+    except TypeError:
+        return ("\x00json", json.dumps(item, sort_keys=True, ensure_ascii=False, default=str))
+
+
+def _merge(base: Dict[str, Any], inc: Dict[str, Any], seen: Dict[int, Tuple[list, set]]) -> None:
+    for k, v in inc.items():
+        if v is None:
+            continue
+
+        if isinstance(v, dict):
+            cur = base.get(k)
+            if not isinstance(cur, dict):
+                base[k] = {}
+            _merge(base[k], v, seen)
+
+        elif isinstance(v, list):
+            cur = base.get(k)
+            if not isinstance(cur, list):
+                base[k] = []
+                cur = base[k]
+
+            entry = seen.get(id(cur))
+            if entry is None or entry[0] is not cur:
+                entry = (cur, {_item_key(x) for x in cur})
+                seen[id(cur)] = entry
+            keys = entry[1]
+
+            for item in v:
+                key = _item_key(item)
+                if key not in keys:
+                    keys.add(key)
+                    cur.append(item)
+
+        else:
+            base[k] = v
+
+
+def merge_artifacts(base: Dict[str, Any], inc: Dict[str, Any]) -> None:
+    """
+    inc를 base에 재귀적으로 병합한다 (base를 직접 수정).
+      - dict: 재귀 병합
+      - list: 기존 순서를 유지하며 없는 항목만 추가 (set으로 비교)
+      - 그 외: 덮어쓰기 (None은 무시)
+    """
+    _merge(base, inc, {})
+
+
+class ArtifactMerger:
+    """
+    같은 base에 여러 번 병합할 때 쓴다. 리스트마다 만든 set을 호출 사이에 유지하므로
+    결과 N개를 차례로 병합해도 기존 항목을 매번 다시 훑지 않는다.
+    """
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None):
+        self.data: Dict[str, Any] = data if data is not None else {}
+        self._seen: Dict[int, Tuple[list, set]] = {}
+
+    def merge(self, inc: Dict[str, Any]) -> None:
+        _merge(self.data, inc, self._seen)
+
+
+def has_path(artifacts: Dict[str, Any], path: str) -> bool:
+    """"web.urls" 같은 점 경로가 비어 있지 않은 값으로 존재하는지."""
+    cur: Any = artifacts
+    for part in path.split("."):
+        if not isinstance(cur, dict) or part not in cur:
+            return False
+        cur = cur[part]
+    return cur not in (None, [], {}, "")
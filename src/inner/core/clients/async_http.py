@@ -0,0 +1,184 @@
+from __future__ import annotations
+import asyncio
+import ssl
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Tuple
+from urllib.parse import urlsplit
+
+
+@dataclass
+class AsyncResponse:
+    url: str
+    status_code: int
+    reason: str = ""
+    headers: Dict[str, str] = field(default_factory=dict)   # key는 소문자
+    content: bytes = b""
+    elapsed: float = 0.0
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+
+class AsyncHttpClient:
+    """
+    stdlib asyncio 스트림 기반 HTTP/1.1 클라이언트.
+
+    async def run(ctx) 모듈에 ctx["clients"]["http"]로 주입된다.
+    호스트별 keep-alive 커넥션을 재사용하고, 동시 요청 수는 limit으로 제한한다.
+    (프록시는 지원하지 않음)
+    """
+
+    def __init__(
+        self,
+        *,
+        base_headers: Optional[Dict[str, str]] = None,
+        timeout: float = 5,
+        verify_ssl: bool = False,
+        limit: int = 100,
+    ):
+        self.timeout = timeout
+        self.verify_ssl = verify_ssl
+        self.headers = {"User-Agent": "inner-scanner", "Accept": "*/*"}
+        if base_headers:
+            self.headers.update(base_headers)
+
+        self._sem = asyncio.Semaphore(max(1, int(limit)))
+        self._idle: Dict[Tuple[str, str, int], deque] = defaultdict(deque)
+        self._ssl_ctx = ssl.create_default_context()
+        if not verify_ssl:
+            self._ssl_ctx.check_hostname = False
+            self._ssl_ctx.verify_mode = ssl.CERT_NONE
+
+    async def __aenter__(self) -> "AsyncHttpClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def get(self, url: str, **kwargs) -> AsyncResponse:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, data: bytes = b"", **kwargs) -> AsyncResponse:
+        return await self.request("POST", url, data=data, **kwargs)
+
+    async def request(self, method: str, url: str, *, data: bytes = b"", **kwargs) -> AsyncResponse:
+        timeout = kwargs.get("timeout", self.timeout)
+        headers = dict(self.headers)
+        headers.update(kwargs.get("headers") or {})
+
+        async with self._sem:
+            return await asyncio.wait_for(
+                self._request(method.upper(), url, data, headers),
+                timeout=timeout,
+            )
+
+    async def close(self) -> None:
+        for conns in self._idle.values():
+            while conns:
+                _, writer = conns.popleft()
+                writer.close()
+        self._idle.clear()
+
+    # --- internal ---
+    async def _request(self, method: str, url: str, data: bytes, headers: Dict[str, str]) -> AsyncResponse:
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https"):
+            raise ValueError(f"unsupported scheme: {url}")
+
+        host = parts.hostname or ""
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, host, port)
+
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        default_port = 443 if scheme == "https" else 80
+        headers.setdefault("Host", host if port == default_port else f"{host}:{port}")
+        if data or method in ("POST", "PUT", "PATCH"):
+            headers["Content-Length"] = str(len(data))
+
+        head = f"{method} {path} HTTP/1.1\r\n"
+        head += "".join(f"{k}: {v}\r\n" for k, v in headers.items())
+        payload = (head + "\r\n").encode("latin-1") + (data or b"")
+
+        started = time.monotonic()
+
+        # 풀에서 꺼낸 커넥션은 서버가 이미 닫았을 수 있으므로 한 번은 새 커넥션으로 재시도
+        while True:
+            reused = bool(self._idle[key])
+            reader, writer = self._idle[key].popleft() if reused else await self._connect(scheme, host, port)
+            try:
+                writer.write(payload)
+                await writer.drain()
+                resp, keep = await self._read_response(reader, method)
+                break
+            except (ConnectionError, asyncio.IncompleteReadError):
+                writer.close()
+                if not reused:
+                    raise
+            except BaseException:
+                writer.close()
+                raise
+
+        if keep:
+            self._idle[key].append((reader, writer))
+        else:
+            writer.close()
+
+        resp.url = url
+        resp.elapsed = time.monotonic() - started
+        return resp
+
+    async def _connect(self, scheme: str, host: str, port: int):
+        if scheme == "https":
+            return await asyncio.open_connection(host, port, ssl=self._ssl_ctx, server_hostname=host)
+        return await asyncio.open_connection(host, port)
+
+    async def _read_response(self, reader: asyncio.StreamReader, method: str) -> Tuple[AsyncResponse, bool]:
+        line = await reader.readline()
+        if not line:
+            raise asyncio.IncompleteReadError(b"", None)
+
+        proto, _, rest = line.decode("latin-1").strip().partition(" ")
+        code, _, reason = rest.partition(" ")
+
+        headers: Dict[str, str] = {}
+        while True:
+            h = await reader.readline()
+            if h in (b"\r\n", b"\n", b""):
+                break
+            k, _, v = h.decode("latin-1").partition(":")
+            headers[k.strip().lower()] = v.strip()
+
+        status = int(code)
+        keep = proto == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+
+        if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            body = b""
+        elif "chunked" in headers.get("transfer-encoding", "").lower():
+            body = await self._read_chunked(reader)
+        elif "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
+        else:
+            body = await reader.read()
+            keep = False
+
+        return AsyncResponse(url="", status_code=status, reason=reason, headers=headers, content=body), keep
+
+    async def _read_chunked(self, reader: asyncio.StreamReader) -> bytes:
+        chunks = []
+        while True:
+            size_line = await reader.readline()
+            size = int(size_line.split(b";", 1)[0].strip() or b"0", 16)
+            if size == 0:
+                # trailer
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                return b"".join(chunks)
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
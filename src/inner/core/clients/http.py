@@ -1,6 +1,38 @@
 from __future__ import annotations
+import threading
 import requests
-from typing import Optional, Dict, Any
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+from typing import Optional, Dict, Any, Iterable
+
+from inner.core.clients.ratelimit import HostLimiter
+
+RETRY_STATUSES = (500, 502, 503, 504)
+
+
+class _SocketCountingPool:
+    """요청 직전에 소켓이 없으면(신규 연결 또는 끊긴 keep-alive 재연결) 새 연결로 센다."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sockets_opened = 0
+        self._count_lock = threading.Lock()
+
+    def _make_request(self, conn, *args, **kwargs):
+        if getattr(conn, "sock", None) is None:
+            with self._count_lock:
+                self.sockets_opened += 1
+        return super()._make_request(conn, *args, **kwargs)
+
+
+class _CountingHTTPPool(_SocketCountingPool, HTTPConnectionPool):
+    pass
+
+
+class _CountingHTTPSPool(_SocketCountingPool, HTTPSConnectionPool):
+    pass
+
 
 class HttpClient:
     def __init__(
@@ -10,11 +42,75 @@ class HttpClient:
         timeout: int = 5,
         verify_ssl: bool = False,
         proxies: Optional[Dict[str, str]] = None,
+        rate_limit: float = 0,
+        burst: int = 1,
+        adaptive: bool = False,
+        max_concurrency: int = 32,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        keep_alive: bool = True,
+        retries: int = 0,
+        backoff: float = 0.0,
+        retry_statuses: Iterable[int] = RETRY_STATUSES,
     ):
         self.session = requests.Session()
         self.timeout = timeout
         self.verify_ssl = verify_ssl
 
+        # rate_limit: 호스트별 초당 요청 수 (0이면 제한 없음)
+        # adaptive: 지연/429/503에 따라 호스트별 동시 요청 수를 1..max_concurrency 사이에서 조절
+        self.limiter = HostLimiter(
+            rate_limit=rate_limit,
+            burst=burst,
+            adaptive=adaptive,
+            max_concurrency=max_concurrency,
+        )
+
+        # pool_connections: 캐시할 호스트별 커넥션 풀 개수
+        # pool_maxsize: 호스트당 유지할 keep-alive 커넥션 수 (동시 워커 수 이상 권장)
+        # retries/backoff: 연결 오류와 retry_statuses(5xx) 응답의 재시도 횟수와 지수 백오프 계수
+        # 읽기 오류는 재시도하지 않는다 (read=False). 그래야 읽기 타임아웃이 MaxRetryError 로 감싸이지 않고
+        # 예전처럼 requests.ReadTimeout 으로 올라온다. retries=0 이면 requests 기본값(max_retries=0)과 같다.
+        self.adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=Retry(
+                total=retries,
+                connect=retries,
+                read=False,
+                status=retries,
+                backoff_factor=backoff,
+                status_forcelist=tuple(retry_statuses),
+                raise_on_status=False,
+                respect_retry_after_header=True,
+            ) if retries else 0,
+        )
+        self.retry = self.adapter.max_retries
+        self.session.mount("http://", self.adapter)
+        self.session.mount("https://", self.adapter)
+
+        # 풀 재사용 통계: LRU에서 밀려난 풀의 카운터도 누적해 둔다
+        self._retired: Dict[str, Dict[str, int]] = {}
+        self._stats_lock = threading.Lock()
+        self.adapter.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPPool,
+            "https": _CountingHTTPSPool,
+        }
+        pools = self.adapter.poolmanager.pools
+        prev_dispose = pools.dispose_func
+
+        def _dispose(pool):
+            self._retire_pool(pool)
+            if prev_dispose:
+                prev_dispose(pool)
+            else:
+                pool.close()
+
+        pools.dispose_func = _dispose
+
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
+
         if base_headers:
             self.session.headers.update(base_headers)
 
@@ -22,16 +118,88 @@ class HttpClient:
             self.session.proxies.update(proxies)
 
     def get(self, url: str, **kwargs) -> requests.Response:
-        return self.session.get(
-            url,
-            timeout=kwargs.get("timeout", self.timeout),
-            verify=kwargs.get("verify", self.verify_ssl),
-            allow_redirects=kwargs.get("allow_redirects", False),
-        )
+        # stream=True면 헤더만 받은 상태로 반환하므로 사용 측에서 close() 해야 한다
+        with self.limiter.slot(url) as obs:
+            r = self.session.get(
+                url,
+                timeout=kwargs.get("timeout", self.timeout),
+                verify=kwargs.get("verify", self.verify_ssl),
+                allow_redirects=kwargs.get("allow_redirects", False),
+                stream=kwargs.get("stream", False),
+            )
+            obs["status"] = r.status_code
+            return r
+
+    def head(self, url: str, **kwargs) -> requests.Response:
+        with self.limiter.slot(url) as obs:
+            r = self.session.head(
+                url,
+                timeout=kwargs.get("timeout", self.timeout),
+                verify=kwargs.get("verify", self.verify_ssl),
+                allow_redirects=kwargs.get("allow_redirects", False),
+            )
+            obs["status"] = r.status_code
+            return r
 
     def post(self, url: str, **kwargs) -> requests.Response:
-        return self.session.post(
-            url,
-            timeout=kwargs.get("timeout", self.timeout),
-            verify=kwargs.get("verify", self.verify_ssl),
-        )
+        with self.limiter.slot(url) as obs:
+            r = self.session.post(
+                url,
+                timeout=kwargs.get("timeout", self.timeout),
+                verify=kwargs.get("verify", self.verify_ssl),
+            )
+            obs["status"] = r.status_code
+            return r
+
+    @staticmethod
+    def response_bytes(r: requests.Response, body: Optional[bytes] = None) -> int:
+        """
+        응답 1건의 수신 바이트 근사치 (상태줄 + 헤더 + 실제로 읽은 본문).
+        본문 크기는 소켓에서 읽은 양(raw.tell)으로 재고, 그걸 알 수 없으면 호출한 쪽이 읽은 body 로 센다
+        (stream=True 로 받고 본문을 안 읽었으면 body=None -> 0).
+        """
+        head = len(f"HTTP/1.1 {r.status_code} {r.reason}\r\n") + 2
+        head += sum(len(k) + len(v) + 4 for k, v in r.headers.items())
+        try:
+            n = int(r.raw.tell())
+        except Exception:
+            n = len(body) if body is not None else 0
+        return head + n
+
+    def limiter_stats(self) -> Dict[str, Any]:
+        return self.limiter.stats()
+
+    def pool_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        호스트별 커넥션 사용 현황.
+            new      : 새로 연 TCP/TLS 커넥션 수
+            requests : 보낸 요청 수 (재시도 포함)
+            reused   : keep-alive 커넥션을 재사용한 요청 수
+        """
+        with self._stats_lock:
+            out = {k: dict(v) for k, v in self._retired.items()}
+
+        managers = [self.adapter.poolmanager] + list(self.adapter.proxy_manager.values())
+        for pm in managers:
+            for key in list(pm.pools.keys()):
+                pool = pm.pools.get(key)
+                if pool is not None:
+                    self._add_pool_counts(out, pool)
+
+        for s in out.values():
+            s["reused"] = max(0, s["requests"] - s["new"])
+        return out
+
+    def close(self) -> None:
+        self.session.close()
+
+    # --- internal ---
+    def _retire_pool(self, pool) -> None:
+        with self._stats_lock:
+            self._add_pool_counts(self._retired, pool)
+
+    def _add_pool_counts(self, out: Dict[str, Dict[str, int]], pool) -> None:
+        key = f"{pool.host}:{pool.port}"
+        s = out.setdefault(key, {"new": 0, "requests": 0})
+        s["new"] += getattr(pool, "sockets_opened", getattr(pool, "num_connections", 0))
+        s["requests"] += getattr(pool, "num_requests", 0)
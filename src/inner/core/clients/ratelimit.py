@@ -0,0 +1,195 @@
+from __future__ import annotations
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+from urllib.parse import urlsplit
+
+BACKOFF_STATUS = {429, 503}
+
+
+class TokenBucket:
+    """rate(초당 토큰) 속도로 채워지고 최대 burst개까지 쌓이는 토큰 버킷."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """토큰 1개를 예약하고, 사용 가능해질 때까지 기다려야 하는 시간(초)을 반환한다."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self) -> None:
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD 방식의 동시성 게이트.
+
+    - window개 응답마다 p95 지연을 계산해, 지금까지의 최저 p95 대비
+      rise배 이내면 limit을 1 올리고, 그 이상이면 3/4로 줄인다.
+    - 429/503 응답을 받으면 즉시 limit을 절반으로 줄인다.
+    """
+
+    def __init__(
+        self,
+        *,
+        initial: int = 2,
+        minimum: int = 1,
+        maximum: int = 32,
+        window: int = 20,
+        rise: float = 1.5,
+    ):
+        self.minimum = max(1, int(minimum))
+        self.maximum = max(self.minimum, int(maximum))
+        self.limit = min(self.maximum, max(self.minimum, int(initial)))
+        self.window = max(1, int(window))
+        self.rise = rise
+
+        self.inflight = 0
+        self.backoffs = 0
+        self.best_p95: Optional[float] = None
+        self._samples: deque = deque(maxlen=self.window)
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        with self._cond:
+            while self.inflight >= self.limit:
+                self._cond.wait()
+            self.inflight += 1
+
+    def release(self, latency: Optional[float] = None, status: Optional[int] = None) -> None:
+        with self._cond:
+            self.inflight -= 1
+
+            if status in BACKOFF_STATUS:
+                self.backoffs += 1
+                self._resize(self.limit // 2)
+                self._samples.clear()
+            elif latency is not None:
+                self._samples.append(latency)
+                if len(self._samples) >= self.window:
+                    self._adjust()
+
+            self._cond.notify_all()
+
+    def _adjust(self) -> None:
+        ordered = sorted(self._samples)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        self._samples.clear()
+
+        if self.best_p95 is None or p95 < self.best_p95:
+            self.best_p95 = p95
+
+        if p95 > self.best_p95 * self.rise:
+            self._resize(self.limit * 3 // 4)
+        else:
+            self._resize(self.limit + 1)
+
+    def _resize(self, n: int) -> None:
+        self.limit = min(self.maximum, max(self.minimum, n))
+
+
+class HostLimiter:
+    """호스트(netloc)별 토큰 버킷과 적응형 동시성 게이트를 관리한다."""
+
+    def __init__(
+        self,
+        *,
+        rate_limit: float = 0,
+        burst: int = 1,
+        adaptive: bool = False,
+        max_concurrency: int = 32,
+    ):
+        self.rate_limit = float(rate_limit or 0)
+        self.burst = burst
+        self.adaptive = adaptive
+        self.max_concurrency = max_concurrency
+
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._gates: Dict[str, AdaptiveConcurrency] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate_limit > 0 or self.adaptive
+
+    @contextmanager
+    def slot(self, url: str) -> Iterator[dict]:
+        """
+        요청 1건의 전송 구간. 사용 측은 응답 상태코드를 obs["status"]에 기록한다.
+            with limiter.slot(url) as obs:
+                r = session.get(url)
+                obs["status"] = r.status_code
+        """
+        obs: dict = {"status": None}
+        if not self.enabled:
+            yield obs
+            return
+
+        host = urlsplit(url).netloc
+        gate = self._gate(host)
+        bucket = self._bucket(host)
+
+        if gate is not None:
+            gate.acquire()
+        started = time.monotonic()
+        try:
+            if bucket is not None:
+                bucket.acquire()
+                started = time.monotonic()
+            yield obs
+        finally:
+            if gate is not None:
+                status = obs.get("status")
+                latency = time.monotonic() - started if status is not None else None
+                gate.release(latency, status)
+
+    def stats(self) -> Dict[str, dict]:
+        with self._lock:
+            hosts = set(self._buckets) | set(self._gates)
+            out = {}
+            for h in sorted(hosts):
+                s: dict = {}
+                if h in self._buckets:
+                    s["rate_limit"] = self.rate_limit
+                    s["burst"] = self._buckets[h].burst
+                if h in self._gates:
+                    g = self._gates[h]
+                    s["concurrency"] = g.limit
+                    s["backoffs"] = g.backoffs
+                    s["best_p95"] = round(g.best_p95, 4) if g.best_p95 is not None else None
+                out[h] = s
+            return out
+
+    def _bucket(self, host: str) -> Optional[TokenBucket]:
+        if self.rate_limit <= 0:
+            return None
+        with self._lock:
+            b = self._buckets.get(host)
+            if b is None:
+                b = self._buckets[host] = TokenBucket(self.rate_limit, self.burst)
+            return b
+
+    def _gate(self, host: str) -> Optional[AdaptiveConcurrency]:
+        if not self.adaptive:
+            return None
+        with self._lock:
+            g = self._gates.get(host)
+            if g is None:
+                g = self._gates[host] = AdaptiveConcurrency(maximum=self.max_concurrency)
+            return g
@@ -0,0 +1,84 @@
+from __future__ import annotations
+import copy
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict
+
+"""
+전역 설정. data/config.json 을 읽고, 없는 키는 DEFAULTS 로 채운다.
+
+{
+  "storage": {
+    "backend": "file",            # file | sqlite
+    "sqlite_path": "data/inner.db",
+    "compact_ratio": 0.5,         # results.jsonl 에서 지워진 바이트 비율이 넘으면 자동 compact (0=끔)
+    "compact_min_bytes": 1048576,
+    "segment_max_bytes": 67108864,  # 활성 results.jsonl 이 이 크기를 넘으면 gzip 세그먼트로 봉인 (0=끔)
+    "segment_max_age": 0,           # 활성 세그먼트를 연 지 이 초가 지나면 봉인 (0=끔)
+    "durability": "flush",          # run all 결과 저장: none | flush | fsync
+    "durability_every": 1,          # flush/fsync 를 몇 건마다 할지
+    "durability_interval": 0        # 또는 몇 초마다 할지 (0=끔)
+  }
+}
+
+환경 변수가 있으면 파일보다 우선한다.
+    INNER_CONFIG          설정 파일 경로
+    INNER_STORAGE         storage.backend
+    INNER_SQLITE_PATH     storage.sqlite_path
+"""
+
+CONFIG_PATH = "data/config.json"
+BACKENDS = ("file", "sqlite")
+
+DEFAULTS: Dict[str, Any] = {
+    "storage": {
+        "backend": "file",
+        "sqlite_path": "data/inner.db",
+        "targets_path": "data/targets.json",
+        "results_path": "data/results.jsonl",
+        "compact_ratio": 0.5,
+        "compact_min_bytes": 1 << 20,
+        "segment_max_bytes": 64 << 20,
+        "segment_max_age": 0,
+        "durability": "flush",
+        "durability_every": 1,
+        "durability_interval": 0,
+    },
+}
+
+_ENV = {
+    "INNER_STORAGE": ("storage", "backend"),
+    "INNER_SQLITE_PATH": ("storage", "sqlite_path"),
+}
+
+
+def _merge(base: Dict[str, Any], inc: Dict[str, Any]) -> None:
+    for k, v in inc.items():
+        if isinstance(v, dict) and isinstance(base.get(k), dict):
+            _merge(base[k], v)
+        else:
+            base[k] = v
+
+
+def load_config(path: str | None = None) -> Dict[str, Any]:
+    cfg = copy.deepcopy(DEFAULTS)
+
+    p = Path(path or os.environ.get("INNER_CONFIG") or CONFIG_PATH)
+    if p.exists():
+        try:
+            data = json.loads(p.read_text(encoding="utf-8"))
+        except json.JSONDecodeError as e:
+            raise ValueError(f"invalid config: {p}: {e}") from None
+        if isinstance(data, dict):
+            _merge(cfg, data)
+
+    for env, (section, key) in _ENV.items():
+        v = os.environ.get(env)
+        if v:
+            cfg[section][key] = v
+
+    backend = cfg["storage"]["backend"]
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown storage backend: {backend} (allowed: {', '.join(BACKENDS)})")
+    return cfg
@@ -0,0 +1,147 @@
+from __future__ import annotations
+import copy
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from inner.core.artifacts import ArtifactMerger
+from inner.core.runner import run_isolated
+from inner.core.storage.checkpoint_store import CheckpointStore
+
+"""
+모듈 파이프라인(DAG) 실행기.
+
+MODULE["inputs"] / MODULE["outputs"]에 선언한 아티팩트 경로("web.urls" 등)로
+의존 관계를 만든다. A의 outputs 중 하나가 B의 inputs에 있으면 A -> B 이다.
+의존이 없는 단계는 병렬로 실행하고, 각 단계에는 저장소의 기존 아티팩트에
+조상 단계들의 결과 아티팩트를 메모리에서 병합해 넘긴다.
+"""
+
+
+class PipelineError(ValueError):
+    pass
+
+
+def module_io(module) -> Tuple[List[str], List[str]]:
+    meta = module.MODULE
+    return list(meta.get("inputs") or []), list(meta.get("outputs") or [])
+
+
+def build_graph(modules: List[Any]) -> Dict[str, List[str]]:
+    """module_id -> 바로 앞 단계(module_id) 목록"""
+    ids = [m.MODULE["id"] for m in modules]
+    if len(set(ids)) != len(ids):
+        raise PipelineError("duplicate module in pipeline")
+
+    producers: Dict[str, List[str]] = {}
+    for m in modules:
+        for out in module_io(m)[1]:
+            producers.setdefault(out, []).append(m.MODULE["id"])
+
+    deps: Dict[str, List[str]] = {}
+    for m in modules:
+        mid = m.MODULE["id"]
+        ds: List[str] = []
+        for inp in module_io(m)[0]:
+            for p in producers.get(inp, []):
+                if p != mid and p not in ds:
+                    ds.append(p)
+        deps[mid] = ds
+    return deps
+
+
+def plan(modules: List[Any]) -> List[List[str]]:
+    """위상 정렬한 실행 단계 목록. 같은 단계의 모듈끼리는 서로 독립이다."""
+    deps = build_graph(modules)
+    order = [m.MODULE["id"] for m in modules]
+
+    levels: List[List[str]] = []
+    done: set = set()
+    while len(done) < len(order):
+        level = [mid for mid in order if mid not in done and all(d in done for d in deps[mid])]
+        if not level:
+            left = ", ".join(mid for mid in order if mid not in done)
+            raise PipelineError(f"dependency cycle: {left}")
+        levels.append(level)
+        done.update(level)
+    return levels
+
+
+def ancestors(deps: Dict[str, List[str]], mid: str) -> List[str]:
+    out: List[str] = []
+    stack = list(deps[mid])
+    while stack:
+        d = stack.pop()
+        if d in out:
+            continue
+        out.append(d)
+        stack.extend(deps[d])
+    return out
+
+
+def run_pipeline(
+    modules: List[Any],
+    target: Optional[dict],
+    options_for: Callable[[Any], Dict[str, Any]],
+    *,
+    artifacts: Optional[Dict[str, Any]] = None,
+    workers: int = 4,
+    checkpoints: Optional[CheckpointStore] = None,
+) -> Iterator[Tuple[Any, Optional[Dict[str, Any]], Optional[BaseException]]]:
+    """
+    단계가 끝나는 순서대로 (module, result, error)를 yield 한다.
+    선행 단계가 실패하면 후속 단계는 실행하지 않고 error에 PipelineError를 담아 넘긴다.
+    """
+    by_id = {m.MODULE["id"]: m for m in modules}
+    deps = build_graph(modules)
+    order_index = {mid: i for i, level in enumerate(plan(modules)) for mid in level}
+
+    base = artifacts or {}
+    outputs: Dict[str, Dict[str, Any]] = {}
+    failed: set = set()
+    pending = dict(deps)
+    checkpoints = checkpoints or CheckpointStore()
+
+    def _stage_artifacts(mid: str) -> Dict[str, Any]:
+        merged = ArtifactMerger(copy.deepcopy(base))
+        for a in sorted(ancestors(deps, mid), key=lambda x: order_index[x]):
+            merged.merge(outputs.get(a) or {})
+        return merged.data
+
+    def _one(mid: str, arts: Dict[str, Any]) -> Dict[str, Any]:
+        # 병렬 단계가 같은 target 을 받으므로 run_isolated 가 단계마다 복사하고 HttpClient 를 닫는다
+        module = by_id[mid]
+        return run_isolated(module, target, options_for(module), artifacts=arts, checkpoints=checkpoints)
+
+    with ThreadPoolExecutor(max_workers=max(1, int(workers)), thread_name_prefix="inner-stage") as pool:
+        running: Dict[Any, str] = {}
+
+        def _submit_ready() -> List[str]:
+            skipped = []
+            for mid in [m for m, ds in pending.items() if all(d in outputs or d in failed for d in ds)]:
+                del pending[mid]
+                if any(d in failed for d in deps[mid]):
+                    failed.add(mid)
+                    skipped.append(mid)
+                    continue
+                running[pool.submit(_one, mid, _stage_artifacts(mid))] = mid
+            return skipped
+
+        while pending or running:
+            for mid in _submit_ready():
+                yield by_id[mid], None, PipelineError("skipped: upstream stage failed")
+            if not running:
+                continue
+
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for fut in done:
+                mid = running.pop(fut)
+                try:
+                    result = fut.result()
+                except Exception as e:
+                    failed.add(mid)
+                    yield by_id[mid], None, e
+                    continue
+
+                arts = result.get("artifacts") if isinstance(result, dict) else None
+                outputs[mid] = arts if isinstance(arts, dict) else {}
+                yield by_id[mid], result, None
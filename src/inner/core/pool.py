@@ -0,0 +1,53 @@
+from __future__ import annotations
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, Tuple
+
+
+def ordered_map(
+    fn: Callable[[Any], Any],
+    items: Iterable[Any],
+    *,
+    workers: int = 1,
+    window: int = 0,
+) -> Iterator[Tuple[int, Any, Any]]:
+    """
+    items를 workers개의 스레드로 처리하고 (index, item, result)를 입력 순서대로 yield 한다.
+
+    - 응답 도착 순서와 무관하게 결과 순서는 항상 결정적이다.
+    - in-flight 작업은 window개(기본 workers * 2)로 제한되므로 items는 lazy iterator여도 된다.
+    - 소비 측에서 break(generator close) 하면 아직 시작하지 않은 작업은 모두 취소된다.
+    - fn에서 발생한 예외는 해당 순서에서 그대로 다시 발생한다.
+    """
+    workers = max(1, int(workers or 1))
+
+    if workers == 1:
+        for i, item in enumerate(items):
+            yield i, item, fn(item)
+        return
+
+    window = max(workers, int(window or workers * 2))
+    it = enumerate(items)
+    pending: deque = deque()
+
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="inner-worker")
+    try:
+        for i, item in it:
+            pending.append((i, item, pool.submit(fn, item)))
+            if len(pending) >= window:
+                break
+
+        while pending:
+            i, item, fut = pending.popleft()
+            result = fut.result()
+
+            nxt = next(it, None)
+            if nxt is not None:
+                j, nitem = nxt
+                pending.append((j, nitem, pool.submit(fn, nitem)))
+
+            yield i, item, result
+    finally:
+        for _, _, fut in pending:
+            fut.cancel()
+        pool.shutdown(wait=True, cancel_futures=True)
@@ -1,5 +1,6 @@
 from __future__ import annotations
-from typing import Dict, Any
+from itertools import repeat
+from typing import Any, Dict, Iterable
 
 """
 status:
@@ -15,6 +16,7 @@ severity:
 
 STATUS_VALUES = {"PASS", "INFO", "WARN", "FAIL", "ERROR"}
 SEVERITY_VALUES = {"NONE", "LOW", "MEDIUM", "HIGH", "CRITICAL"}
+SEVERITY_ORDER = ("NONE", "LOW", "MEDIUM", "HIGH", "CRITICAL")   # 정렬용 (낮은 것부터)
 
 REQUIRED_FIELDS = {
     "module_id",
@@ -60,39 +62,51 @@ def normalize_result(result: Dict[str, Any]) -> Dict[str, Any]:
     return result
 
 
+# validate_result 가 쓰는 검사표. 모듈을 읽을 때 한 번 만들어 두고 결과마다 그대로 훑는다.
+_STATUS_ERROR = f"(allowed: {', '.join(sorted(STATUS_VALUES))})"
+_SEVERITY_ERROR = f"(allowed: {', '.join(sorted(SEVERITY_VALUES))})"
+_TYPE_CHECKS = tuple((k, typ, f"{k} must be {typ.__name__}") for k, typ in OPTIONAL_FIELD_TYPES.items())
+_STR_LIST_CHECKS = tuple((k, f"{k} must be list[str]") for k in ("evidence", "references", "tags"))
+_STR = repeat(str)      # map(isinstance, items, _STR): 끝나지 않는 반복자라 여러 번 써도 된다
+
+
 def validate_result(result: Dict[str, Any]) -> None:
+    """
+    결과 하나를 검사한다. 틀리면 ResultSchemaError.
+    검사 순서와 메시지는 필드별로 하나씩 보던 예전 구현과 같다
+    (필수 필드 -> status -> severity -> 선택 필드 타입 -> list[str] 원소).
+    evidence 처럼 긴 목록은 원소마다 파이썬 코드를 돌지 않고 map(isinstance) 로 한 번에 본다.
+    """
     if not isinstance(result, dict):
         raise ResultSchemaError("result must be a dict")
 
-    missing = REQUIRED_FIELDS - result.keys()
-    if missing:
+    if not result.keys() >= REQUIRED_FIELDS:
+        missing = REQUIRED_FIELDS - result.keys()
         raise ResultSchemaError(f"missing required fields: {', '.join(sorted(missing))}")
 
-    status = result.get("status")
-    severity = result.get("severity")
-
+    status = result["status"]
     if status not in STATUS_VALUES:
-        raise ResultSchemaError(
-            f"invalid status: {status} (allowed: {', '.join(sorted(STATUS_VALUES))})"
-        )
-
+        raise ResultSchemaError(f"invalid status: {status} {_STATUS_ERROR}")
+    severity = result["severity"]
     if severity not in SEVERITY_VALUES:
-        raise ResultSchemaError(
-            f"invalid severity: {severity} (allowed: {', '.join(sorted(SEVERITY_VALUES))})"
-        )
-
-    for k, typ in OPTIONAL_FIELD_TYPES.items():
-        if k in result and result[k] is not None and not isinstance(result[k], typ):
-            raise ResultSchemaError(f"{k} must be {typ.__name__}")
-
-    if "evidence" in result:
-        if not all(isinstance(x, str) for x in result["evidence"]):
-            raise ResultSchemaError("evidence must be list[str]")
-    if "references" in result:
-        if not all(isinstance(x, str) for x in result["references"]):
-            raise ResultSchemaError("references must be list[str]")
-    if "tags" in result:
-        if not all(isinstance(x, str) for x in result["tags"]):
-            raise ResultSchemaError("tags must be list[str]")
+        raise ResultSchemaError(f"invalid severity: {severity} {_SEVERITY_ERROR}")
+
+    get = result.get
+    for k, typ, msg in _TYPE_CHECKS:
+        v = get(k)
+        if v is not None and not isinstance(v, typ):
+            raise ResultSchemaError(msg)
+
+    for k, msg in _STR_LIST_CHECKS:
+        if k in result:
+            v = result[k]
+            if v != [] and not all(map(isinstance, v, _STR)):
+                raise ResultSchemaError(msg)
     if "artifacts" in result and not isinstance(result["artifacts"], dict):
-        raise ResultSchemaError("artifacts must be dict")
\ No newline at end of file
+        raise ResultSchemaError("artifacts must be dict")
+
+
+def validate_results(results: Iterable[Dict[str, Any]]) -> None:
+    """여러 건을 검사한다. 처음 틀린 결과의 ResultSchemaError 를 그대로 올린다."""
+    for result in results:
+        validate_result(result)
@@ -0,0 +1,159 @@
+from __future__ import annotations
+import asyncio
+import copy
+import inspect
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from inner.core.clients.async_http import AsyncHttpClient
+from inner.core.clients.http import HttpClient
+from inner.core.storage.checkpoint_store import CheckpointStore
+
+
+def is_async_module(module) -> bool:
+    return inspect.iscoroutinefunction(getattr(module, "run", None))
+
+
+def invoke_module(module, ctx: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    module.run(ctx)를 실행한다.
+    async def run(ctx)이면 코어가 자체 이벤트 루프를 만들어 구동하고,
+    ctx["clients"]["http"]에는 AsyncHttpClient를 주입한다.
+    """
+    if not is_async_module(module):
+        return module.run(ctx)
+    return asyncio.run(_drive_async(module, ctx))
+
+
+async def _drive_async(module, ctx: Dict[str, Any]) -> Dict[str, Any]:
+    opts = ctx.get("options") or {}
+    clients = ctx.setdefault("clients", {})
+
+    async with AsyncHttpClient(
+        timeout=opts.get("timeout", 5),
+        limit=opts.get("concurrency") or 100,
+    ) as http:
+        clients["http"] = http
+        return await module.run(ctx)
+
+
+def build_http_client(opts: Dict[str, Any]) -> HttpClient:
+    return HttpClient(
+        timeout=opts.get("timeout", 5),
+        rate_limit=opts.get("rate_limit") or 0,
+        burst=opts.get("burst") or 1,
+        adaptive=bool(opts.get("adaptive", False)),
+        max_concurrency=opts.get("threads") or 32,
+        pool_maxsize=max(10, int(opts.get("threads") or 1)),
+        keep_alive=bool(opts.get("keep_alive", True)),
+        retries=opts.get("retries") or 0,
+        backoff=opts.get("backoff") or 0.0,
+    )
+
+
+def missing_options(module, opts: Dict[str, Any]) -> list[str]:
+    spec = module.MODULE.get("options", {})
+    return [
+        k for k, s in spec.items()
+        if s.get("required") and (opts.get(k) in (None, ""))
+    ]
+
+
+def build_ctx(
+    module,
+    target: Optional[dict],
+    opts: Dict[str, Any],
+    *,
+    artifacts: Optional[Dict[str, Any]] = None,
+    checkpoints: Optional[CheckpointStore] = None,
+) -> Dict[str, Any]:
+    """모듈 1회 실행용 ctx. 실행마다 새 HttpClient를 만들어 타겟 간 세션을 공유하지 않는다."""
+    mid = module.MODULE["id"]
+    target_id = (target or {}).get("id")
+
+    # async 모듈은 invoke_module이 이벤트 루프 안에서 AsyncHttpClient를 주입한다
+    clients = {}
+    if not is_async_module(module):
+        clients["http"] = build_http_client(opts)
+
+    return {
+        "target": target,
+        "options": opts,
+        "artifacts": artifacts or {},
+        "meta": {
+            "module_id": mid,
+        },
+        "clients": clients,
+        "checkpoint": (checkpoints or CheckpointStore()).bind(mid, target_id),
+    }
+
+
+def error_result(module, target_id: Optional[str], exc: BaseException) -> Dict[str, Any]:
+    """모듈 실행 자체가 실패했을 때 저장할 ERROR 결과."""
+    return {
+        "module_id": module.MODULE["id"],
+        "target_id": target_id,
+        "status": "ERROR",
+        "severity": "NONE",
+        "title": "Module execution failed",
+        "description": f"{type(exc).__name__}: {exc}",
+        "evidence": [],
+        "recommendation": "",
+        "references": [],
+        "tags": module.MODULE.get("tags", []),
+        "meta": {},
+    }
+
+
+def run_isolated(
+    module,
+    target: Optional[dict],
+    opts: Dict[str, Any],
+    *,
+    artifacts: Optional[Dict[str, Any]] = None,
+    checkpoints: Optional[CheckpointStore] = None,
+) -> Dict[str, Any]:
+    """
+    모듈 1회 실행. 다른 스레드와 공유할 수 있는 target 은 복사본을 넘기고
+    (저장소 캐시의 dict 이거나 병렬 단계끼리 같은 dict 일 수 있다) 끝나면 HttpClient 를 닫는다.
+    """
+    ctx = build_ctx(module, copy.deepcopy(target), dict(opts), artifacts=artifacts, checkpoints=checkpoints)
+    try:
+        return invoke_module(module, ctx)
+    finally:
+        http = ctx["clients"].get("http")
+        if isinstance(http, HttpClient):
+            http.close()
+
+
+def run_many(
+    module,
+    targets: Iterable[dict],
+    opts: Dict[str, Any],
+    *,
+    workers: int = 4,
+    artifacts_for: Optional[Callable[[str], Dict[str, Any]]] = None,
+    checkpoints: Optional[CheckpointStore] = None,
+) -> Iterator[Tuple[dict, Optional[Dict[str, Any]], Optional[BaseException]]]:
+    """
+    여러 타겟에 같은 모듈을 스레드 풀로 실행하고, 끝나는 순서대로 (target, result, error)를 yield 한다.
+    타겟마다 ctx/HttpClient를 따로 만들고 예외도 타겟 단위로 격리한다.
+    """
+    checkpoints = checkpoints or CheckpointStore()
+
+    def _one(target: dict) -> Dict[str, Any]:
+        artifacts = artifacts_for(target["id"]) if artifacts_for else {}
+        return run_isolated(module, target, opts, artifacts=artifacts, checkpoints=checkpoints)
+
+    with ThreadPoolExecutor(max_workers=max(1, int(workers)), thread_name_prefix="inner-target") as pool:
+        futures = {pool.submit(_one, t): t for t in targets}
+        try:
+            for fut in as_completed(futures):
+                t = futures[fut]
+                try:
+                    yield t, fut.result(), None
+                except Exception as e:
+                    yield t, None, e
+        finally:
+            for fut in futures:
+                fut.cancel()
@@ -1,12 +1,19 @@
 from __future__ import annotations
-from inner.core.storage.target_store import TargetStore
+import copy
+from pathlib import Path
+from inner.core.storage.backend import open_target_store
+from inner.core.target_import import ImportReport, prepare_targets, read_records
 from inner.core.target_model import TargetModel
 from inner.plugins.registry import load_modules
 
 class Scanner:
     def __init__(self):
-        self.store = TargetStore()
+        self.store = open_target_store()
         self.model = TargetModel()
+        # 저장소에는 정규화된 타겟만 두고 읽을 때는 다시 정규화하지 않는다.
+        # 예전 형식(정규화 전 저장)이면 처음 한 번만 바꿔 저장한다
+        if not self.store.normalized:
+            self.store.normalize_all(self.model.normalize)
         self.modules = load_modules()
 
     def add_target(self, raw: dict):
@@ -14,16 +21,45 @@ class Scanner:
         self.store.add(t)
 
     def get_target(self, tid: str):
+        # 저장소 캐시와 분리된 복사본
         t = self.store.get(tid)
-        return self.model.normalize(t) if t else None
+        return copy.deepcopy(t) if t else None
 
     def list_targets(self):
-        return [self.model.normalize(t) for t in self.store.list()]
+        """저장소 캐시의 dict 를 그대로 돌려준다 (읽기 전용)."""
+        return self.store.list()
+
+    def find_targets(self, *, host=None, url=None, tags=(), type=None):
+        """host/url/tag 색인으로 찾는다. 조건은 모두 AND (읽기 전용)."""
+        return self.store.find(host=host, url=url, tags=tags, type=type)
+
+    def select_targets(self, query: str):
+        """target_query 질의로 고른다 (예: "tag:prod type:url os_guess:linux"). 읽기 전용."""
+        return self.store.select(query)
+
+    def import_targets(self, path, *, fmt=None, tags=()) -> ImportReport:
+        """파일을 읽으며 전개/검증/중복 검사를 하고 저장소에는 add_many 로 한 번에 쓴다."""
+        report = ImportReport()
+        records = read_records(Path(path), fmt)
+        # 쓰는 도중(sqlite 는 트랜잭션 안)에는 저장소 캐시가 바뀌므로 시작 시점의 id 색인으로 중복을 본다
+        existing = {t["id"] for t in self.store.list()}
+        targets = prepare_targets(
+            records,
+            self.model.normalize,
+            existing.__contains__,
+            report,
+            tags=tags,
+        )
+        added, skipped = self.store.add_many(targets)
+        report.added = added
+        report.duplicates += skipped
+        return report
 
     def update_target(self, tid: str, patch: dict):
         cur = self.store.get(tid)
         if not cur:
             raise ValueError(f"target not found: {tid}")
+        cur = copy.deepcopy(cur)
 
         unset = patch.pop("__unset__", [])
         updated = self.model.apply_update(cur, patch, unset)
@@ -0,0 +1,124 @@
+from __future__ import annotations
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from inner.core.artifacts import ArtifactMerger
+
+"""
+타겟별 아티팩트 병합 결과(materialized view)를 results.jsonl.artifacts/ 아래에 보관한다.
+
+뷰 파일 하나 = 타겟 하나:
+    {"target_id", "ident", "covered", "dead_seen", "all": {...}, "modules": {module_id: {...}}}
+
+- covered   : 이 오프셋 앞의 결과까지 반영됨. 이후 결과만 인덱스로 찾아 이어서 병합한다.
+- ident     : 로그 오프셋 공간 식별자(SegmentLog.ident). compact 등으로 바뀌면 오프셋이 달라지므로 버린다.
+- dead_seen : 반영 당시 이 타겟의 삭제된 결과 수. 병합은 되돌릴 수 없으므로
+              (다른 프로세스가) 이 타겟 결과를 지웠으면 처음부터 다시 만든다.
+"""
+
+
+class ArtifactView:
+    def __init__(self, target_id: str, ident: str):
+        self.target_id = target_id
+        self.ident = ident
+        self.covered = 0
+        self.dead_seen = 0
+        self.all = ArtifactMerger()
+        self.modules: Dict[str, ArtifactMerger] = {}
+        self.dirty = False
+
+    def merge(self, module_id: Optional[str], artifacts: Dict[str, Any]) -> None:
+        self.all.merge(artifacts)
+        if module_id:
+            m = self.modules.get(module_id)
+            if m is None:
+                m = self.modules[module_id] = ArtifactMerger()
+            m.merge(artifacts)
+        self.dirty = True
+
+    def get(self, module_id: Optional[str] = None) -> Dict[str, Any]:
+        if not module_id:
+            return self.all.data
+        m = self.modules.get(module_id)
+        return m.data if m else {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "target_id": self.target_id,
+            "ident": self.ident,
+            "covered": self.covered,
+            "dead_seen": self.dead_seen,
+            "all": self.all.data,
+            "modules": {k: m.data for k, m in self.modules.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "ArtifactView":
+        v = cls(d["target_id"], d["ident"])
+        v.covered = d["covered"]
+        v.dead_seen = d["dead_seen"]
+        v.all = ArtifactMerger(d.get("all") or {})
+        v.modules = {k: ArtifactMerger(m) for k, m in (d.get("modules") or {}).items()}
+        return v
+
+
+class ArtifactCache:
+    def __init__(self, data_path: Path):
+        self.root = Path(data_path).with_name(Path(data_path).name + ".artifacts")
+        self.views: Dict[str, ArtifactView] = {}
+
+    def _path(self, target_id: str) -> Path:
+        key = hashlib.sha1(target_id.encode("utf-8")).hexdigest()[:16]
+        return self.root / f"{key}.json"
+
+    def load(self, target_id: str) -> Optional[ArtifactView]:
+        v = self.views.get(target_id)
+        if v is not None:
+            return v
+
+        p = self._path(target_id)
+        if not p.exists():
+            return None
+        try:
+            d = json.loads(p.read_text(encoding="utf-8"))
+            if d.get("target_id") != target_id:
+                return None
+            v = ArtifactView.from_dict(d)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        self.views[target_id] = v
+        return v
+
+    def new(self, target_id: str, ident: str) -> ArtifactView:
+        v = self.views[target_id] = ArtifactView(target_id, ident)
+        return v
+
+    def save(self, view: ArtifactView) -> None:
+        if not view.dirty:
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(view.to_dict(), f, ensure_ascii=False)
+            os.replace(tmp, self._path(view.target_id))
+        finally:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+        view.dirty = False
+
+    def invalidate(self, target_id: str) -> None:
+        self.views.pop(target_id, None)
+        p = self._path(target_id)
+        if p.exists():
+            p.unlink()
+
+    def drop(self) -> None:
+        self.views.clear()
+        if self.root.exists():
+            shutil.rmtree(self.root, ignore_errors=True)
@@ -0,0 +1,45 @@
+from __future__ import annotations
+import threading
+from typing import Any, Dict, Optional
+
+from inner.core.config import load_config
+from inner.core.storage.result_store import ResultStore
+from inner.core.storage.sqlite_store import SqliteDatabase, SqliteResultStore, SqliteTargetStore
+from inner.core.storage.target_store import TargetStore
+
+"""
+설정(storage.backend)에 맞는 저장소를 만든다. 앱 코드는 저장소 클래스를 직접 만들지 말고
+open_target_store() / open_result_store() 를 쓴다.
+"""
+
+_dbs: Dict[str, SqliteDatabase] = {}
+_dbs_lock = threading.Lock()
+
+
+def sqlite_database(path: str) -> SqliteDatabase:
+    """같은 DB 파일은 프로세스 안에서 SqliteDatabase 하나를 공유한다."""
+    with _dbs_lock:
+        db = _dbs.get(path)
+        if db is None:
+            db = _dbs[path] = SqliteDatabase(path)
+        return db
+
+
+def open_target_store(config: Optional[Dict[str, Any]] = None):
+    st = (config or load_config())["storage"]
+    if st["backend"] == "sqlite":
+        return SqliteTargetStore(db=sqlite_database(st["sqlite_path"]))
+    return TargetStore(st["targets_path"])
+
+
+def open_result_store(config: Optional[Dict[str, Any]] = None):
+    st = (config or load_config())["storage"]
+    if st["backend"] == "sqlite":
+        return SqliteResultStore(db=sqlite_database(st["sqlite_path"]))
+    return ResultStore(
+        st["results_path"],
+        compact_ratio=float(st["compact_ratio"]),
+        compact_min_bytes=int(st["compact_min_bytes"]),
+        segment_max_bytes=int(st["segment_max_bytes"]),
+        segment_max_age=int(st["segment_max_age"]),
+    )
@@ -0,0 +1,69 @@
+from __future__ import annotations
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+class CheckpointStore:
+    """모듈 실행 중간 상태를 (module_id, target_id) 단위 JSON 파일로 보관한다."""
+
+    def __init__(self, root: str = "data/checkpoints"):
+        self.root = Path(root)
+
+    def _path(self, module_id: str, target_id: Optional[str]) -> Path:
+        key = hashlib.sha1(f"{module_id}\x00{target_id or ''}".encode("utf-8")).hexdigest()[:16]
+        return self.root / f"{key}.json"
+
+    def load(self, module_id: str, target_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        p = self._path(module_id, target_id)
+        if not p.exists():
+            return None
+        try:
+            data = json.loads(p.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+        return data.get("state")
+
+    def save(self, module_id: str, target_id: Optional[str], state: Dict[str, Any]) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        p = self._path(module_id, target_id)
+        data = {"module_id": module_id, "target_id": target_id, "state": state}
+
+        # 중간에 죽어도 이전 체크포인트가 깨지지 않도록 임시 파일에 쓴 뒤 교체
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp, p)
+        finally:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+
+    def remove(self, module_id: str, target_id: Optional[str]) -> None:
+        p = self._path(module_id, target_id)
+        if p.exists():
+            p.unlink()
+
+    def bind(self, module_id: str, target_id: Optional[str]) -> "Checkpoint":
+        return Checkpoint(self, module_id, target_id)
+
+
+class Checkpoint:
+    """ctx["checkpoint"]로 모듈에 주입되는 핸들. 모듈은 파일 위치를 몰라도 된다."""
+
+    def __init__(self, store: CheckpointStore, module_id: str, target_id: Optional[str]):
+        self.store = store
+        self.module_id = module_id
+        self.target_id = target_id
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        return self.store.load(self.module_id, self.target_id)
+
+    def save(self, state: Dict[str, Any]) -> None:
+        self.store.save(self.module_id, self.target_id, state)
+
+    def clear(self) -> None:
+        self.store.remove(self.module_id, self.target_id)
@@ -0,0 +1,78 @@
+from __future__ import annotations
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 잠금 없이 스레드 잠금만 건다
+    fcntl = None
+
+"""
+데이터 파일 옆 <name>.lock 에 flock 을 거는 프로세스 간 잠금.
+
+- exclusive : append / seal / compact / clear 처럼 로그를 바꾸는 작업
+- shared    : 잠금 밖에서 오래 도는 스캔이 활성 파일을 한 덩어리씩 읽을 때
+
+같은 스레드 안에서는 다시 들어갈 수 있다 (바깥이 exclusive 면 안쪽 shared 는 그대로 통과).
+같은 프로세스의 다른 스레드끼리는 threading.RLock 으로 줄 세운다.
+"""
+
+
+class FileLock:
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._rlock = threading.RLock()
+        self._fh = None
+        self._depth = 0
+        self._exclusive = False
+        self.epoch = 0      # 가장 바깥 잠금을 잡을 때마다 1씩 는다
+
+    def _acquire(self, mode: int) -> None:
+        if fcntl is None:
+            return
+        if self._fh is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fh = self.path.open("a+b")
+        fcntl.flock(self._fh.fileno(), mode)
+
+    def _release(self) -> None:
+        if fcntl is not None and self._fh is not None:
+            fcntl.flock(self._fh.fileno(), fcntl.LOCK_UN)
+
+    @contextmanager
+    def _hold(self, exclusive: bool) -> Iterator[None]:
+        with self._rlock:
+            if self._depth == 0:
+                self._acquire((fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH) if fcntl else 0)
+                self._exclusive = exclusive
+                self.epoch += 1
+            self._depth += 1
+            try:
+                yield
+            finally:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._exclusive = False
+                    self._release()
+
+    @property
+    def held(self) -> bool:
+        return self._depth > 0
+
+    @property
+    def held_exclusive(self) -> bool:
+        return self._depth > 0 and self._exclusive
+
+    def exclusive(self):
+        return self._hold(True)
+
+    def shared(self):
+        return self._hold(False)
+
+    def close(self) -> None:
+        with self._rlock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
@@ -0,0 +1,260 @@
+from __future__ import annotations
+import json
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+"""
+results.jsonl 옆에 두는 오프셋 인덱스 (results.jsonl.idx).
+
+오프셋은 SegmentLog 의 논리 오프셋이다 (봉인된 gzip 세그먼트 + 활성 파일을 이어 붙인 위치).
+첫 줄은 헤더({"version", "ident"}), 이후 로그의 줄마다 JSON 배열 한 줄을 적는다.
+    결과      [offset, length, result_id, target_id, module_id, status, severity, timestamp]
+    tombstone [offset, length, result_id]
+append 시 데이터 파일과 함께 한 줄씩 덧붙이므로 전체를 다시 쓰는 일은
+로그가 바깥에서 바뀌었을 때(크기 감소, 오프셋 불일치)나 compact 로 ident가 바뀐 뒤뿐이다.
+
+삭제는 데이터 파일에 {"__tombstone__": result_id} 줄을 덧붙이는 것으로 한다.
+tombstone은 그보다 앞에 있는 같은 result_id 결과만 지운다 (이후 다시 append 된 것은 산다).
+
+인덱스가 데이터 파일보다 뒤처져 있으면(다른 프로세스가 쓴 경우 등)
+덮이지 않은 꼬리 부분만 읽어 따라잡는다.
+"""
+
+INDEX_VERSION = 4
+FIELDS = ("target_id", "module_id", "status", "severity")
+TOMBSTONE_KEY = "__tombstone__"
+
+
+def is_tombstone(r: Dict[str, Any]) -> bool:
+    return TOMBSTONE_KEY in r
+
+
+class ResultIndex:
+    def __init__(self, log):
+        self.log = log
+        self.path = log.path.with_name(log.path.name + ".idx")
+        self._reset()
+
+    def _reset(self) -> None:
+        self.offsets = array("Q")
+        self.lengths = array("Q")
+        self.ts: List[Optional[str]] = []   # 위치별 timestamp (정렬/기간 필터용)
+        self.by_id: Dict[str, List[int]] = {}
+        self.by_field: Dict[str, Dict[Any, array]] = {f: {} for f in FIELDS}
+        self.dead: set = set()    # tombstone으로 지워진 결과 위치
+        self.live_bytes = 0
+        self.end = 0              # 인덱스가 덮는 데이터 파일 끝 오프셋
+        self._idx_size = 0        # 읽어 들인 인덱스 파일 크기
+        self.ident = None         # 인덱스가 가리키는 로그 오프셋 공간
+        self._loaded = False
+
+    # ---- 메모리 구조 ----
+
+    def _add(self, offset: int, length: int, rid: Any, values: List[Any]) -> None:
+        pos = len(self.offsets)
+        self.offsets.append(offset)
+        self.lengths.append(length)
+        ts = values[len(FIELDS)] if len(values) > len(FIELDS) else None
+        self.ts.append(ts if isinstance(ts, str) else None)
+        if rid:
+            self.by_id.setdefault(rid, []).append(pos)
+        for f, v in zip(FIELDS, values):
+            if v is None:
+                continue
+            self.by_field[f].setdefault(v, array("Q")).append(pos)
+        self.live_bytes += length
+        self.end = max(self.end, offset + length)
+
+    def _kill(self, offset: int, length: int, rid: Any) -> None:
+        for pos in self.by_id.get(rid) or []:
+            if pos not in self.dead:
+                self.dead.add(pos)
+                self.live_bytes -= self.lengths[pos]
+        self.end = max(self.end, offset + length)
+
+    def _apply(self, offset: int, length: int, r: Dict[str, Any]) -> list:
+        """데이터 파일의 한 줄을 반영하고, 인덱스 파일에 적을 항목을 돌려준다."""
+        if is_tombstone(r):
+            rid = r[TOMBSTONE_KEY]
+            self._kill(offset, length, rid)
+            return [offset, length, rid]
+        values = [r.get(f) for f in FIELDS] + [r.get("timestamp")]
+        self._add(offset, length, r.get("result_id"), values)
+        return [offset, length, r.get("result_id")] + values
+
+    # ---- 동기화 ----
+
+    def refresh(self) -> None:
+        """인덱스 파일/로그의 변화(ident, 크기 기준)를 반영한다."""
+        if self._loaded and self.ident != self.log.ident():
+            self.rebuild()
+            return
+
+        if not self._loaded:
+            self._loaded = True
+            if not self._read_index():
+                self.rebuild()
+                return
+
+        if self.path.exists() and self.path.stat().st_size > self._idx_size:
+            if not self._read_index():
+                self.rebuild()
+                return
+
+        size = self.log.size()
+        if size < self.end:
+            self.rebuild()
+        elif size > self.end:
+            self._catch_up()
+
+    def _read_index(self) -> bool:
+        """인덱스 파일의 아직 안 읽은 부분을 읽는다. 형식이 다르면 False."""
+        if not self.path.exists():
+            return False
+        with self.path.open("rb") as f:
+            if self._idx_size == 0:
+                try:
+                    header = json.loads(f.readline())
+                except ValueError:
+                    return False
+                if not isinstance(header, dict) or header.get("version") != INDEX_VERSION:
+                    return False
+                if header.get("ident") != self.log.ident():
+                    return False
+                self.ident = header["ident"]
+            else:
+                f.seek(self._idx_size)
+
+            while True:
+                line = f.readline()
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    off, length, rid, *values = json.loads(line)
+                except ValueError:
+                    return False
+                if values:
+                    self._add(off, length, rid, values)
+                else:
+                    self._kill(off, length, rid)
+                self._idx_size = f.tell()
+        return True
+
+    def _catch_up(self) -> None:
+        entries = []
+        for off, length, r in self.log.scan(self.end):
+            self.end = max(self.end, off + length)
+            if r is not None:
+                entries.append(self._apply(off, length, r))
+        self._write_entries(entries)
+
+    def rebuild(self) -> None:
+        self._reset()
+        self._loaded = True
+        self.ident = self.log.ident()
+        if self.log.size() == 0:
+            if self.path.exists():
+                self.path.unlink()
+            return
+
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with tmp.open("wb") as f:
+            f.write(json.dumps({"version": INDEX_VERSION, "ident": self.ident}).encode("utf-8") + b"\n")
+            for off, length, r in self.log.scan(0):
+                self.end = max(self.end, off + length)
+                if r is None:
+                    continue
+                f.write(json.dumps(self._apply(off, length, r), ensure_ascii=False).encode("utf-8") + b"\n")
+        tmp.replace(self.path)
+        self._idx_size = self.path.stat().st_size
+
+    def _write_entries(self, entries: List[list]) -> None:
+        if not entries:
+            return
+        if not self.path.exists():
+            self.rebuild()
+            return
+        with self.path.open("ab") as f:
+            for e in entries:
+                f.write(json.dumps(e, ensure_ascii=False).encode("utf-8") + b"\n")
+            self._idx_size = f.tell()
+
+    def record(self, offset: int, length: int, r: Dict[str, Any]) -> None:
+        """append 직후 호출. 데이터 파일에 방금 쓴 한 줄(결과 또는 tombstone)을 인덱스에 반영한다."""
+        if offset != self.end:
+            # 그 사이 다른 쓰기가 끼어들었으면 꼬리부터 다시 따라잡는다
+            self.refresh()
+            return
+        self._write_entries([self._apply(offset, length, r)])
+
+    def record_many(self, items: List[Tuple[int, int, Dict[str, Any]]]) -> None:
+        """append_many 직후 호출. 한 번에 쓴 줄들을 (offset, length, record) 순서대로 반영하고 인덱스 파일에는 한 번만 쓴다."""
+        if not items:
+            return
+        if items[0][0] != self.end:
+            self.refresh()
+            return
+        self._write_entries([self._apply(off, length, r) for off, length, r in items])
+
+    def drop(self) -> None:
+        if self.path.exists():
+            self.path.unlink()
+        self._reset()
+
+    # ---- 조회 ----
+
+    def live_ids(self, result_id: str) -> List[int]:
+        return [p for p in self.by_id.get(result_id) or [] if p not in self.dead]
+
+    def dead_offsets(self) -> set:
+        return {self.offsets[p] for p in self.dead}
+
+    def garbage_bytes(self) -> int:
+        """지워진 결과 + tombstone + 깨진 줄이 차지하는 바이트 (compact로 회수 가능한 양)."""
+        return self.end - self.live_bytes
+
+    def positions(self, **filters: Optional[str]) -> Optional[List[int]]:
+        """
+        필터에 맞는 살아 있는 레코드 위치(파일 순서). 필터가 하나도 없으면 None.
+        가장 짧은 목록부터 교집합을 좁혀 간다.
+        """
+        lists = []
+        for f in FIELDS:
+            v = filters.get(f)
+            if not v:
+                continue
+            hit = self.by_field[f].get(v)
+            if hit is None:
+                return []
+            lists.append(hit)
+        if not lists:
+            return None
+
+        lists.sort(key=len)
+        out = [p for p in lists[0] if p not in self.dead]
+        for other in lists[1:]:
+            keep = set(other)
+            out = [p for p in out if p in keep]
+            if not out:
+                break
+        return out
+
+    def span(self, pos: int) -> Tuple[int, int]:
+        return self.offsets[pos], self.lengths[pos]
+
+    def live_positions(self) -> List[int]:
+        dead = self.dead
+        if not dead:
+            return list(range(len(self.offsets)))
+        return [p for p in range(len(self.offsets)) if p not in dead]
+
+    def values(self, field: str) -> List[Any]:
+        """위치별 필드 값 (정렬용). timestamp 는 그대로, 나머지는 역색인을 뒤집어 만든다."""
+        if field == "timestamp":
+            return self.ts
+        out: List[Any] = [None] * len(self.offsets)
+        for v, positions in self.by_field[field].items():
+            for p in positions:
+                out[p] = v
+        return out
+
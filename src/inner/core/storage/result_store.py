@@ -1,43 +1,329 @@
 from __future__ import annotations
 from pathlib import Path
-from typing import Dict, Any, Iterable, Optional
-from inner.core.result_schema import validate_result, ResultSchemaError
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Optional
+from inner.core.result_schema import SEVERITY_ORDER, validate_results
+from inner.core.artifacts import merge_artifacts
+from inner.core.storage.artifact_cache import ArtifactCache
+from inner.core.storage.result_index import ResultIndex, TOMBSTONE_KEY, is_tombstone
+from inner.core.storage.search_index import SearchIndex, tokenize
+from inner.core.storage.segment_log import SegmentLog
+import copy
+import functools
 import json
+import threading
+import time
 import uuid
 
+def _locked(fn):
+    @functools.wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        with self._lock, self.log.lock.exclusive():
+            return fn(self, *args, **kwargs)
+    return wrapper
+
+
+SORT_FIELDS = ("timestamp", "target_id", "module_id", "status", "severity")
+QUERY_CHUNK = 500
+
+
+def parse_sort(sort: Optional[str]) -> tuple[Optional[str], bool]:
+    """"severity" / "-severity" -> (필드, 내림차순 여부)."""
+    if not sort:
+        return None, False
+    desc = sort.startswith("-")
+    field = sort.lstrip("-+")
+    if field not in SORT_FIELDS:
+        raise ValueError(f"unknown sort field: {field} (allowed: {', '.join(SORT_FIELDS)})")
+    return field, desc
+
+
+def sort_key(field: str) -> Callable[[Any], tuple]:
+    """값이 없는 것은 맨 앞(내림차순이면 맨 뒤). severity 는 NONE < LOW < ... < CRITICAL 순서."""
+    if field == "severity":
+        rank = {v: i for i, v in enumerate(SEVERITY_ORDER)}
+        return lambda v: (v is not None, rank.get(v, -1))
+    return lambda v: (v is not None, str(v) if v is not None else "")
+
+
+def _now() -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def _in_range(r: Dict[str, Any], since: Optional[str], until: Optional[str]) -> bool:
+    return _ts_in_range(r.get("timestamp"), since, until)
+
+
+def _ts_in_range(ts: Any, since: Optional[str], until: Optional[str]) -> bool:
+    """timestamp 문자열 비교. until 은 앞자리만 비교하므로 "2024-05-01" 이면 그날 전체를 포함한다."""
+    if not isinstance(ts, str):
+        return False
+    if since and ts < since:
+        return False
+    if until and ts[:len(until)] > until:
+        return False
+    return True
+
+
 class ResultStore:
-    def __init__(self, path: str = "data/results.jsonl"):
+    def __init__(
+        self,
+        path: str = "data/results.jsonl",
+        *,
+        compact_ratio: float = 0.5,
+        compact_min_bytes: int = 1 << 20,
+        segment_max_bytes: int = 64 << 20,
+        segment_max_age: int = 0,
+    ):
         self.path = Path(path)
         self.path.parent.mkdir(parents=True, exist_ok=True)
+        # path 는 활성 세그먼트, 봉인된 세그먼트는 <path>.segments/ 아래 gzip 으로 보관한다
+        self.log = SegmentLog(self.path, max_bytes=segment_max_bytes, max_age=segment_max_age)
+        self.index = ResultIndex(self.log)
+        self.artifacts = ArtifactCache(self.path)
+        self.search_index = SearchIndex(self.log)
+        # run all 은 워커 스레드에서 aggregate_artifacts 를 부르므로 인덱스/뷰 갱신은 잠금 안에서 한다
+        self._lock = threading.RLock()
+        # 지워진 바이트가 이 비율/크기를 넘으면 remove 직후 자동으로 compact 한다 (0이면 끔)
+        self.compact_ratio = compact_ratio
+        self.compact_min_bytes = compact_min_bytes
 
     def _assign_result_id(self, result: dict) -> dict:
         if "result_id" not in result or not result["result_id"]:
             result["result_id"] = uuid.uuid4().hex[:12]
         return result
 
-    def append(self, result: Dict[str, Any]) -> None:
-        try:
-            validate_result(result)
-        except ResultSchemaError:
-            raise
-        
-        result = self._assign_result_id(result)
-        line = json.dumps(result, ensure_ascii=False)
-        with self.path.open("a", encoding="utf-8") as f:
-            f.write(line + "\n")
-
-    def iter_all(self) -> Iterable[Dict[str, Any]]:
-        if not self.path.exists():
+    def append(self, result: Dict[str, Any], *, validated: bool = False) -> None:
+        self.append_many([result], validated=validated)
+
+    def append_many(
+        self, results: List[Dict[str, Any]], *, fsync: bool = False, validated: bool = False
+    ) -> int:
+        """
+        결과 여러 건을 잠금 한 번, write 한 번으로 덧붙인다. 하나라도 스키마가 틀리면 아무것도 쓰지 않는다.
+        fsync=True 면 돌아오기 전에 디스크까지 내린다.
+        validated=True 면 호출한 쪽이 이미 validate_result 를 통과시킨 결과로 보고 다시 검사하지 않는다.
+        """
+        if not validated:
+            validate_results(results)
+        if not results:
+            return 0
+
+        lines = []
+        for result in results:
+            result = self._assign_result_id(result)
+            if not result.get("timestamp"):
+                result["timestamp"] = _now()
+            lines.append((json.dumps(result, ensure_ascii=False) + "\n").encode("utf-8"))
+
+        with self._lock, self.log.lock.exclusive():
+            self.index.refresh()
+            offset = self.log.append(b"".join(lines), fsync=fsync)
+
+            items = []
+            for result, line in zip(results, lines):
+                items.append((offset, len(line), result))
+                offset += len(line)
+            first = len(self.index.offsets)
+            self.index.record_many(items)
+
+            for off, length, result in items:
+                self._update_view(result, off, length)
+            if self.index.offsets and self.index.offsets[-1] == items[-1][0]:
+                self.search_index.record_many(
+                    [(first + i, off, length, r) for i, (off, length, r) in enumerate(items)]
+                )
+            # 봉인은 논리 오프셋을 바꾸지 않으므로 인덱스/뷰/검색 색인은 그대로 쓸 수 있다
+            self.log.maybe_rotate()
+        return len(results)
+
+    def _write_line(self, obj: Dict[str, Any]) -> tuple[int, int]:
+        line = (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+
+        self.index.refresh()
+        offset = self.log.append(line)
+        self.index.record(offset, len(line), obj)
+        return offset, len(line)
+
+    def sync(self) -> None:
+        """열어 둔 핸들로 쓴 내용을 디스크까지 내린다."""
+        with self._lock:
+            self.log.sync()
+
+    def close(self) -> None:
+        with self._lock:
+            self.log.close()
+
+    def _update_view(self, result: Dict[str, Any], offset: int, length: int) -> None:
+        """메모리에 올라와 있고 바로 앞까지 반영된 뷰면 새 결과를 바로 병합한다. 아니면 다음 조회 때 따라잡는다."""
+        view = self.artifacts.views.get(result.get("target_id"))
+        if view is None or view.covered != offset:
             return
-        with self.path.open("r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
+        a = result.get("artifacts")
+        if a and isinstance(a, dict):
+            view.merge(result.get("module_id"), a)
+        view.covered = offset + length
+
+    def _read_positions(self, positions: list[int]) -> Iterable[Optional[Dict[str, Any]]]:
+        if not positions:
+            return
+        with self.log.reader() as rd:
+            for pos in positions:
+                offset, length = self.index.span(pos)
                 try:
-                    yield json.loads(line)
-                except json.JSONDecodeError:
+                    r = json.loads(rd.read(offset, length))
+                except ValueError:
+                    r = None
+                yield r if isinstance(r, dict) else None
+
+    def _iter_positions(self, positions: list[int]) -> Iterable[Dict[str, Any]]:
+        for r in self._read_positions(positions):
+            if r is not None:
+                yield r
+
+    @_locked
+    def get(self, result_id: str) -> Optional[Dict[str, Any]]:
+        if not result_id:
+            return None
+        self.index.refresh()
+        live = self.index.live_ids(result_id)
+        if not live:
+            return None
+
+        r = next(iter(self._read_positions(live[:1])), None)
+        if r is not None and r.get("result_id") == result_id:
+            return r
+
+        # 오프셋이 어긋났다면 파일이 바깥에서 바뀐 것이므로 인덱스를 다시 만든다
+        self.index.rebuild()
+        live = self.index.live_ids(result_id)
+        if not live:
+            return None
+        return next(iter(self._read_positions(live[:1])), None)
+
+    def _segment_skip(
+        self,
+        since: Optional[str],
+        until: Optional[str],
+        target_id: Optional[str] = None,
+    ) -> Optional[Callable[[Dict[str, Any]], bool]]:
+        """세그먼트 요약만 보고 통째로 건너뛸 수 있는지 판단하는 함수."""
+        if not (since or until or target_id):
+            return None
+
+        def skip(seg: Dict[str, Any]) -> bool:
+            if since or until:
+                lo, hi = seg.get("min_ts"), seg.get("max_ts")
+                if lo is None or hi is None:
+                    return True
+                if since and hi < since:
+                    return True
+                if until and lo[:len(until)] > until:
+                    return True
+            if target_id and target_id not in seg.get("targets", ()):
+                return True
+            return False
+
+        return skip
+
+    def _positions(
+        self,
+        *,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        sort: Optional[str] = None,
+        **filters: Optional[str],
+    ) -> List[int]:
+        """필터/기간/정렬을 인덱스만으로 적용한 위치 목록. 레코드는 읽지 않는다."""
+        field, desc = parse_sort(sort)
+        positions = self.index.positions(**filters)
+        if positions is None:
+            positions = self.index.live_positions()
+        if since or until:
+            ts = self.index.ts
+            positions = [p for p in positions if _ts_in_range(ts[p], since, until)]
+        if field:
+            values, key = self.index.values(field), sort_key(field)
+            positions = sorted(positions, key=lambda p: key(values[p]), reverse=desc)
+        return positions
+
+    def iter_all(
+        self,
+        *,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        target_id: Optional[str] = None,
+    ) -> Iterable[Dict[str, Any]]:
+        """
+        tombstone과 그 tombstone이 지운 결과는 건너뛴다.
+        since/until/target_id 가 있으면 요약상 해당 없는 봉인 세그먼트는 풀지 않는다.
+        """
+        with self._lock, self.log.lock.exclusive():
+            self.index.refresh()
+            dead = self.index.dead_offsets()
+        for off, _, r in self.log.scan(0, skip=self._segment_skip(since, until, target_id)):
+            if r is None or is_tombstone(r) or off in dead:
+                continue
+            if target_id and r.get("target_id") != target_id:
+                continue
+            if (since or until) and not _in_range(r, since, until):
+                continue
+            yield r
+
+    def query(
+        self,
+        *,
+        target_id: Optional[str] = None,
+        module_id: Optional[str] = None,
+        status: Optional[str] = None,
+        severity: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        sort: Optional[str] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        list 와 같은 조건의 결과를 필요한 것만 읽어 차례로 내보낸다.
+        대상 위치는 인덱스로 먼저 정하고(정렬 포함), offset/limit 로 자른 뒤 QUERY_CHUNK 건씩 읽는다.
+        sort 는 SORT_FIELDS 중 하나, 앞에 "-" 를 붙이면 내림차순. 없으면 파일(기록) 순서.
+        """
+        filters = {"target_id": target_id, "module_id": module_id, "status": status, "severity": severity}
+        with self._lock, self.log.lock.exclusive():
+            self.index.refresh()
+            ident = self.index.ident
+            positions = self._positions(since=since, until=until, sort=sort, **filters)
+        end = None if limit is None else offset + max(0, limit)
+        positions = positions[offset:end]
+
+        for i in range(0, len(positions), QUERY_CHUNK):
+            with self._lock, self.log.lock.exclusive():
+                self.index.refresh()
+                if self.index.ident != ident:
+                    # 읽는 사이 compact 되어 위치가 바뀌었다
+                    return
+                chunk = list(self._iter_positions(positions[i:i + QUERY_CHUNK]))
+            for r in chunk:
+                # 인덱스가 어긋난 경우를 대비해 값은 한 번 더 확인한다
+                if not all(not v or r.get(k) == v for k, v in filters.items()):
                     continue
+                yield r
+
+    @_locked
+    def count(
+        self,
+        *,
+        target_id: Optional[str] = None,
+        module_id: Optional[str] = None,
+        status: Optional[str] = None,
+        severity: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> int:
+        self.index.refresh()
+        return len(self._positions(
+            since=since, until=until,
+            target_id=target_id, module_id=module_id, status=status, severity=severity,
+        ))
 
     def list(
         self,
@@ -46,48 +332,114 @@ class ResultStore:
         module_id: Optional[str] = None,
         status: Optional[str] = None,
         severity: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        sort: Optional[str] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
     ) -> list[Dict[str, Any]]:
-        out = []
-        for r in self.iter_all():
-            if target_id and r.get("target_id") != target_id:
-                continue
-            if module_id and r.get("module_id") != module_id:
-                continue
-            if status and r.get("status") != status:
-                continue
-            if severity and r.get("severity") != severity:
-                continue
-            out.append(r)
-        return out
+        return list(self.query(
+            target_id=target_id,
+            module_id=module_id,
+            status=status,
+            severity=severity,
+            since=since,
+            until=until,
+            sort=sort,
+            offset=offset,
+            limit=limit,
+        ))
+
+    @_locked
+    def search(self, query: str) -> list[Dict[str, Any]]:
+        """단어마다 prefix 일치, 모든 단어 AND. 파일 순서대로 돌려준다."""
+        terms = tokenize(query)
+        if not terms:
+            return []
+        self.index.refresh()
+        self.search_index.refresh(self.index, self._read_positions)
+        return list(self._iter_positions(self.search_index.search(terms, self.index.dead)))
+
+    @_locked
+    def segments(self) -> list[Dict[str, Any]]:
+        """봉인된 세그먼트 요약 목록 (results segments 출력용)."""
+        return [dict(s, file=str(self.log.segment_path(s["name"]))) for s in self.log.segments()]
 
+    @_locked
+    def seal(self) -> Optional[Dict[str, Any]]:
+        return self.log.seal()
+
+    @_locked
     def clear(self) -> None:
-        if self.path.exists():
-            self.path.unlink()
-    
+        self.log.clear()
+        self.index.drop()
+        self.artifacts.drop()
+        self.search_index.drop()
+
+    @_locked
     def remove_by_id(self, result_id: str) -> int:
-        if not self.path.exists():
+        """파일을 다시 쓰지 않고 tombstone 한 줄만 덧붙인다."""
+        self.index.refresh()
+        live = self.index.live_ids(result_id)
+        if not live:
             return 0
 
-        kept = []
-        removed = 0
+        # 병합된 아티팩트는 빼낼 수 없으므로 해당 타겟의 뷰는 버리고 다음 조회 때 다시 만든다
+        for r in self._iter_positions(live):
+            if r.get("target_id"):
+                self.artifacts.invalidate(r["target_id"])
 
-        for r in self.iter_all() or []:
-            if r.get("result_id") == result_id:
-                removed += 1
-            else:
-                kept.append(r)
+        self._write_line({TOMBSTONE_KEY: result_id, "timestamp": _now()})
+        self._maybe_compact()
+        return len(live)
 
-        if removed == 0:
-            return 0
+    @_locked
+    def garbage_bytes(self) -> int:
+        self.index.refresh()
+        return self.index.garbage_bytes()
+
+    def _maybe_compact(self) -> None:
+        if not self.compact_ratio:
+            return
+        garbage = self.index.garbage_bytes()
+        if garbage >= self.compact_min_bytes and garbage >= self.index.end * self.compact_ratio:
+            self.compact()
 
-        tmp = self.path.with_suffix(".tmp")
-        with tmp.open("w", encoding="utf-8") as f:
-            for r in kept:
-                f.write(json.dumps(r, ensure_ascii=False) + "\n")
+    @_locked
+    def compact(self) -> Dict[str, int]:
+        """
+        살아 있는 결과만 새 세대의 gzip 세그먼트로 한 줄씩 옮긴 뒤 교체한다.
+        메모리에는 지워진 결과의 오프셋만 올리므로 로그 크기와 무관하게 일정하다.
+        """
+        stats = {"kept": 0, "dropped": 0, "bytes_before": self.log.disk_size(), "bytes_after": 0}
+        self.index.refresh()
+        if self.index.end == 0:
+            return stats
+        dead = self.index.dead_offsets()
 
-        tmp.replace(self.path)
-        return removed
-    
+        def live_lines():
+            for off, line in self.log.scan_lines(0):
+                if not line.strip():
+                    continue
+                try:
+                    r = json.loads(line)
+                except ValueError:
+                    r = None
+                if not isinstance(r, dict) or is_tombstone(r) or off in dead:
+                    stats["dropped"] += 1
+                    continue
+                stats["kept"] += 1
+                yield line, r
+
+        self.log.rewrite(live_lines())
+        self.index.rebuild()
+        # 오프셋 공간이 바뀌었으므로 뷰/검색 색인도 다시 만든다
+        self.artifacts.drop()
+        self.search_index.drop()
+        stats["bytes_after"] = self.log.disk_size()
+        return stats
+
+    @_locked
     def aggregate_artifacts(
             self,
             target_id: str,
@@ -98,41 +450,45 @@ class ResultStore:
         if not target_id:
             raise ValueError("target_id is required")
 
-        merged: Dict[str, Any] = {}
+        self.index.refresh()
+        if self.index.end == 0:
+            return {}
+        view = self._artifact_view(target_id)
+        return copy.deepcopy(view.get(module_id))
 
-        for r in self.iter_all() or []:
-            if r.get("target_id") != target_id:
-                continue
-            if module_id and r.get("module_id") != module_id:
-                continue
+    def _artifact_view(self, target_id: str):
+        """
+        타겟의 아티팩트 뷰를 불러와 covered 이후 결과만 병합해 최신으로 만든다.
+        오프셋 공간이 바뀌었거나(compact 등) 그 사이 이 타겟 결과가 지워졌으면 처음부터 다시 만든다.
+        """
+        ident = self.log.ident()
+        all_pos = self.index.by_field["target_id"].get(target_id) or []
+        dead = self.index.dead
+        dead_seen = sum(1 for p in all_pos if p in dead) if dead else 0
 
-            a = r.get("artifacts")
-            if not a or not isinstance(a, dict):
-                continue
+        view = self.artifacts.load(target_id)
+        if view is None or view.ident != ident or view.covered > self.index.end or view.dead_seen != dead_seen:
+            view = self.artifacts.new(target_id, ident)
+            view.dirty = True
 
-            self._deep_merge(merged, a)
+        if view.covered < self.index.end:
+            positions = [
+                p for p in all_pos
+                if p not in dead and self.index.offsets[p] >= view.covered
+            ]
+            for r in self._iter_positions(positions):
+                if r.get("target_id") != target_id:
+                    continue
+                a = r.get("artifacts")
+                if a and isinstance(a, dict):
+                    view.merge(r.get("module_id"), a)
+            # 다른 타겟 결과만 늘어난 경우에는 covered만 메모리에서 올리고 파일은 다시 쓰지 않는다
+            view.dirty = view.dirty or bool(positions)
+            view.covered = self.index.end
+            view.dead_seen = dead_seen
 
-        return merged
+        self.artifacts.save(view)
+        return view
 
     def _deep_merge(self, base: Dict[str, Any], inc: Dict[str, Any]) -> None:
-        for k, v in inc.items():
-            if v is None:
-                continue
-
-            if isinstance(v, dict):
-                cur = base.get(k)
-                if not isinstance(cur, dict):
-                    base[k] = {}
-                self._deep_merge(base[k], v)
-
-            elif isinstance(v, list):
-                cur = base.get(k)
-                if not isinstance(cur, list):
-                    base[k] = []
-                    cur = base[k]
-                for item in v:
-                    if item not in cur:
-                        cur.append(item)
-
-            else:
-                base[k] = v
+        merge_artifacts(base, inc)
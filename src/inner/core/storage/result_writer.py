@@ -0,0 +1,74 @@
+from __future__ import annotations
+import time
+from typing import Any, Dict, List
+
+from inner.core.result_schema import validate_result
+
+"""
+결과를 모아 두었다가 append_many 로 한 번에 쓰는 버퍼 writer. run all 같은 배치 실행에서 쓴다.
+
+durability 정책 (커밋 = 버퍼를 append_many 로 파일에 씀):
+    none   주기적으로 커밋하지 않는다. 버퍼가 NONE_BUFFER_MAX 건이 되거나 close 때만 쓴다.
+    flush  every 건마다, 또는 마지막 커밋 후 interval 초가 지나면 커밋한다 (OS 버퍼까지).
+    fsync  flush 와 같은 시점에 커밋하고 fsync 까지 한다.
+
+interval 은 add 할 때 검사한다 (별도 타이머 스레드는 없다).
+저장소는 append_many(results, fsync=..., validated=...) 를 가진 ResultStore / SqliteResultStore 면 된다.
+"""
+
+DURABILITY = ("none", "flush", "fsync")
+NONE_BUFFER_MAX = 1000
+
+
+class ResultWriter:
+    def __init__(self, store, *, durability: str = "flush", every: int = 1, interval: float = 0.0):
+        if durability not in DURABILITY:
+            raise ValueError(f"unknown durability: {durability} (allowed: {', '.join(DURABILITY)})")
+        self.store = store
+        self.durability = durability
+        self.every = max(1, int(every))
+        self.interval = float(interval or 0)
+        self._buf: List[Dict[str, Any]] = []
+        self._last = time.monotonic()
+        self.written = 0
+
+    def add(self, result: Dict[str, Any], *, validated: bool = False) -> None:
+        """
+        스키마는 바로 검사한다 (틀리면 ResultSchemaError, 버퍼에 넣지 않음).
+        호출한 쪽에서 이미 검사했다면 validated=True 로 건너뛴다. 커밋할 때 저장소는 다시 검사하지 않는다.
+        """
+        if not validated:
+            validate_result(result)
+        self._buf.append(result)
+        if self._due():
+            self.flush()
+
+    def _due(self) -> bool:
+        if self.durability == "none":
+            return len(self._buf) >= NONE_BUFFER_MAX
+        if len(self._buf) >= self.every:
+            return True
+        return bool(self.interval) and time.monotonic() - self._last >= self.interval
+
+    def flush(self) -> int:
+        """버퍼를 지금 커밋한다. 쓴 건수를 돌려준다."""
+        n = 0
+        if self._buf:
+            n = self.store.append_many(self._buf, fsync=self.durability == "fsync", validated=True)
+            self._buf = []
+            self.written += n
+        self._last = time.monotonic()
+        return n
+
+    @property
+    def pending(self) -> int:
+        return len(self._buf)
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> "ResultWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
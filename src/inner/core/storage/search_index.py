@@ -0,0 +1,191 @@
+from __future__ import annotations
+import bisect
+import json
+import re
+from array import array
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from inner.core.storage.result_index import ResultIndex
+
+"""
+results search 용 역색인 (results.jsonl.search).
+
+결과 한 건의 result_id/module_id/target_id/status/severity/title/description/tags 를
+토큰(\\w+, 소문자)으로 나눠 token -> 결과 위치 목록을 만든다.
+파일에는 헤더 다음에 결과마다 [offset, length, [tokens...]] 한 줄을 적고,
+처음 search 할 때 읽어 들인 뒤로는 append 마다 한 줄씩 덧붙인다.
+
+질의: 공백으로 나눈 단어마다 그 단어로 시작하는 토큰을 찾고(prefix), 모든 단어를 만족(AND)하는 결과만 돌려준다.
+"""
+
+SEARCH_VERSION = 2
+SEARCH_FIELDS = ("result_id", "module_id", "target_id", "status", "severity", "title", "description")
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def result_text(r: Dict[str, Any]) -> str:
+    parts = [str(r.get(f) or "") for f in SEARCH_FIELDS]
+    parts.extend(str(t) for t in (r.get("tags") or []))
+    return " ".join(parts)
+
+
+def result_tokens(r: Dict[str, Any]) -> List[str]:
+    return sorted(set(tokenize(result_text(r))))
+
+
+def matches(r: Dict[str, Any], terms: List[str]) -> bool:
+    """역색인 없이 한 건을 검사할 때 (SQLite FTS5를 못 쓰는 환경 등)."""
+    toks = result_tokens(r)
+    for term in terms:
+        i = bisect.bisect_left(toks, term)
+        if i >= len(toks) or not toks[i].startswith(term):
+            return False
+    return True
+
+
+class SearchIndex:
+    def __init__(self, log):
+        self.log = log
+        self.path = log.path.with_name(log.path.name + ".search")
+        self._reset()
+
+    def _reset(self) -> None:
+        self.postings: Dict[str, array] = {}
+        self.ident = None
+        self.covered = 0
+        self.loaded = False
+        self._vocab: Optional[List[str]] = None   # prefix 검색용 정렬된 토큰 목록 (첫 검색 때 만들고 이후 insort)
+
+    def _add(self, pos: int, tokens: Iterable[str]) -> None:
+        for t in tokens:
+            p = self.postings.get(t)
+            if p is None:
+                p = self.postings[t] = array("Q")
+                if self._vocab is not None:
+                    bisect.insort(self._vocab, t)
+            p.append(pos)
+
+    # ---- 동기화 ----
+
+    def refresh(self, index: ResultIndex, read: Callable[[List[int]], Iterable[Dict[str, Any]]]) -> None:
+        """
+        index(이미 refresh 된 ResultIndex) 기준으로 따라잡는다.
+        read(positions)는 위치마다 결과(읽지 못하면 None)를 순서대로 돌려주는 함수.
+        """
+        ident = self.log.ident()
+
+        if not self.loaded:
+            self._load(index, ident)
+        if self.ident != ident or self.covered > index.end:
+            # compact 등으로 오프셋 공간이 바뀌었으면 처음부터 다시 만든다
+            self._reset()
+            self.loaded = True
+            self.ident = ident
+            self._write_header()
+
+        if self.covered >= index.end:
+            return
+
+        start = bisect.bisect_left(index.offsets, self.covered)
+        positions = list(range(start, len(index.offsets)))
+        lines = []
+        for pos, r in zip(positions, read(positions)):
+            off, length = index.span(pos)
+            tokens = result_tokens(r) if r is not None else []
+            self._add(pos, tokens)
+            lines.append([off, length, tokens])
+        self.covered = index.end
+        self._write(lines)
+
+    def _load(self, index: ResultIndex, ident: str) -> None:
+        self._reset()
+        self.loaded = True
+        if not self.path.exists():
+            return
+        with self.path.open("rb") as f:
+            try:
+                header = json.loads(f.readline())
+            except ValueError:
+                return
+            if not isinstance(header, dict) or header.get("version") != SEARCH_VERSION or header.get("ident") != ident:
+                return
+            self.ident = ident
+
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    off, length, tokens = json.loads(line)
+                except ValueError:
+                    break
+                pos = bisect.bisect_left(index.offsets, off)
+                if pos >= len(index.offsets) or index.offsets[pos] != off:
+                    # 인덱스와 어긋났으면 버리고 다시 만든다
+                    self._reset()
+                    self.loaded = True
+                    return
+                self._add(pos, tokens)
+                self.covered = off + length
+
+    def _write_header(self) -> None:
+        with self.path.open("wb") as f:
+            f.write(json.dumps({"version": SEARCH_VERSION, "ident": self.ident}).encode("utf-8") + b"\n")
+
+    def _write(self, lines: List[list]) -> None:
+        if not lines:
+            return
+        if not self.path.exists():
+            self._write_header()
+        with self.path.open("ab") as f:
+            for e in lines:
+                f.write(json.dumps(e, ensure_ascii=False).encode("utf-8") + b"\n")
+
+    def record_many(self, items: List[tuple]) -> None:
+        """
+        append 직후 호출. items 는 (pos, offset, length, result).
+        이 프로세스에서 이미 읽어 들였고 바로 앞까지 반영된 경우만, 이어지는 만큼 바로 색인한다.
+        """
+        if not self.loaded:
+            return
+        lines = []
+        for pos, offset, length, r in items:
+            if self.covered != offset:
+                break
+            tokens = result_tokens(r)
+            self._add(pos, tokens)
+            self.covered = offset + length
+            lines.append([offset, length, tokens])
+        self._write(lines)
+
+    def drop(self) -> None:
+        if self.path.exists():
+            self.path.unlink()
+        self._reset()
+
+    # ---- 조회 ----
+
+    def _prefix(self, term: str) -> Set[int]:
+        if self._vocab is None:
+            self._vocab = sorted(self.postings)
+        out: Set[int] = set()
+        i = bisect.bisect_left(self._vocab, term)
+        while i < len(self._vocab) and self._vocab[i].startswith(term):
+            out.update(self.postings[self._vocab[i]])
+            i += 1
+        return out
+
+    def search(self, terms: List[str], dead: Set[int]) -> List[int]:
+        if not terms:
+            return []
+        sets = sorted((self._prefix(t) for t in dict.fromkeys(terms)), key=len)
+        hit = sets[0]
+        for s in sets[1:]:
+            if not hit:
+                break
+            hit = hit & s
+        return sorted(p for p in hit if p not in dead)
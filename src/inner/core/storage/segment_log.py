@@ -0,0 +1,605 @@
+from __future__ import annotations
+import bisect
+import gzip
+import io
+import json
+import os
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from inner.core.storage.file_lock import FileLock
+from inner.core.storage.result_index import is_tombstone
+
+"""
+세그먼트로 나뉜 결과 로그.
+
+    data/results.jsonl                      활성 세그먼트 (평문, append 대상)
+    data/results.jsonl.segments/
+        manifest.json                       봉인된 세그먼트 목록과 요약
+        <gen>-000001.jsonl.gz               봉인된 세그먼트 (gzip)
+        <gen>-000001.blocks                 블록 표 [[평문 오프셋, 압축 오프셋], ...]
+
+모든 세그먼트를 이어 붙인 "논리 오프셋"을 쓰므로 인덱스/뷰/검색 색인은 세그먼트를 몰라도 된다.
+활성 세그먼트가 segment_max_bytes 를 넘거나 segment_max_age 초가 지나면 봉인(seal)한다.
+
+봉인된 세그먼트는 줄 단위로 자른 약 64KiB 블록마다 gzip member 하나로 압축한다.
+member를 이어 붙인 파일이라 gzip/zcat 으로 그대로 읽히고, 블록 표로 한 블록만 풀어 임의 접근할 수 있다.
+
+세그먼트 요약(count, min_ts/max_ts, targets)으로 시간/타겟 조건에 맞지 않는 세그먼트는 통째로 건너뛴다.
+
+쓰기(append/seal/rewrite/clear)는 <path>.lock 의 배타 잠금 안에서 하므로 여러 프로세스가 같은 로그에 써도 된다.
+활성 파일은 O_APPEND 핸들 하나를 열어 두고 계속 쓴다.
+"""
+
+MANIFEST_VERSION = 1
+BLOCK_SIZE = 64 * 1024
+SCAN_CHUNK = 1 << 20
+
+
+def _now() -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+
+
+def _parse(line: bytes) -> Optional[Dict[str, Any]]:
+    if not line.strip():
+        return None
+    try:
+        r = json.loads(line)
+    except ValueError:
+        return None
+    return r if isinstance(r, dict) else None
+
+
+class _SegmentWriter:
+    """완결된 줄들을 블록 단위 gzip 세그먼트로 쓰고 요약을 만든다."""
+
+    def __init__(self, root: Path, name: str, opened: str):
+        self.root = root
+        self.name = name
+        self.opened = opened
+        self._tmp = root / f"{name}.jsonl.gz.tmp"
+        self._out = self._tmp.open("wb")
+        self._buf = bytearray()
+        self._size = 0
+        self.blocks: List[List[int]] = []
+        self.count = 0
+        self.min_ts: Optional[str] = None
+        self.max_ts: Optional[str] = None
+        self.targets: set = set()
+
+    def add(self, line: bytes, r: Optional[Dict[str, Any]]) -> None:
+        if not self._buf:
+            self.blocks.append([self._size, self._out.tell()])
+        self._buf += line
+        self._size += len(line)
+
+        if r is not None:
+            ts = r.get("timestamp")
+            if isinstance(ts, str):
+                self.min_ts = ts if self.min_ts is None or ts < self.min_ts else self.min_ts
+                self.max_ts = ts if self.max_ts is None or ts > self.max_ts else self.max_ts
+            if not is_tombstone(r):
+                self.count += 1
+                if r.get("target_id") is not None:
+                    self.targets.add(r["target_id"])
+
+        if len(self._buf) >= BLOCK_SIZE:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._buf:
+            self._out.write(gzip.compress(bytes(self._buf), mtime=0))
+            self._buf.clear()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def close(self, base: int) -> Dict[str, Any]:
+        self._flush()
+        self.blocks.append([self._size, self._out.tell()])
+        self._out.flush()
+        os.fsync(self._out.fileno())
+        self._out.close()
+
+        _atomic_write(self.root / f"{self.name}.blocks", json.dumps(self.blocks).encode("utf-8"))
+        os.replace(self._tmp, self.root / f"{self.name}.jsonl.gz")
+        return {
+            "name": self.name,
+            "base": base,
+            "size": self._size,
+            "count": self.count,
+            "min_ts": self.min_ts,
+            "max_ts": self.max_ts,
+            "targets": sorted(self.targets, key=str),
+            "opened": self.opened,
+            "sealed": _now(),
+        }
+
+    def abort(self) -> None:
+        self._out.close()
+        if self._tmp.exists():
+            self._tmp.unlink()
+
+
+class LogReader:
+    """논리 오프셋으로 한 줄씩 읽는다. 활성 파일 핸들과 마지막으로 푼 블록을 재사용한다."""
+
+    def __init__(self, log: "SegmentLog"):
+        self.log = log
+        self.manifest = log.manifest()
+        self._bases = [s["base"] for s in self.manifest["segments"]]
+        self._active = None
+        self._block_key: Optional[Tuple[str, int]] = None
+        self._block_data = b""
+        self._files: Dict[str, Any] = {}
+
+    def read(self, offset: int, length: int) -> bytes:
+        m = self.manifest
+        if offset >= m["active_base"]:
+            if self._active is None:
+                if not self.log.path.exists():
+                    return b""
+                self._active = self.log.path.open("rb")
+            self._active.seek(offset - m["active_base"] + m["active_offset"])
+            return self._active.read(length)
+
+        i = bisect.bisect_right(self._bases, offset) - 1
+        if i < 0:
+            return b""
+        seg = m["segments"][i]
+        u = offset - seg["base"]
+        blocks = self.log.blocks(seg["name"])
+        starts = [b[0] for b in blocks]
+        j = bisect.bisect_right(starts, u) - 1
+        if j < 0 or j >= len(blocks) - 1:
+            return b""
+
+        key = (seg["name"], j)
+        if key != self._block_key:
+            f = self._files.get(seg["name"])
+            if f is None:
+                f = self._files[seg["name"]] = self.log.segment_path(seg["name"]).open("rb")
+            f.seek(blocks[j][1])
+            self._block_data = gzip.decompress(f.read(blocks[j + 1][1] - blocks[j][1]))
+            self._block_key = key
+
+        start = u - blocks[j][0]
+        return self._block_data[start:start + length]
+
+    def close(self) -> None:
+        if self._active is not None:
+            self._active.close()
+        for f in self._files.values():
+            f.close()
+        self._files.clear()
+
+    def __enter__(self) -> "LogReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class SegmentLog:
+    def __init__(self, path: str | Path, *, max_bytes: int = 64 << 20, max_age: int = 0):
+        self.path = Path(path)
+        self.root = self.path.with_name(self.path.name + ".segments")
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+
+        self.manifest_path = self.root / "manifest.json"
+        self._manifest: Optional[Dict[str, Any]] = None
+        self._mkey: Any = None
+        self._checked = -1      # 이 잠금 구간(lock.epoch)에서 이미 manifest 를 확인했는지
+        self._repaired = False  # _check_active 가 메모리에서만 고치고 아직 기록하지 않았는지
+        self._blocks: Dict[str, List[List[int]]] = {}
+        self._fh = None
+        self.lock = FileLock(self.path.with_name(self.path.name + ".lock"))
+
+    # ---- manifest ----
+
+    def segment_path(self, name: str) -> Path:
+        return self.root / f"{name}.jsonl.gz"
+
+    def _empty_manifest(self) -> Dict[str, Any]:
+        return {
+            "version": MANIFEST_VERSION,
+            "generation": "0",
+            "next_seq": 1,
+            "active_base": 0,
+            "active_offset": 0,
+            "active_since": _now(),
+            "segments": [],
+        }
+
+    def manifest(self) -> Dict[str, Any]:
+        """
+        파일이 바뀌었을 때(mtime/size/inode)만 다시 읽는다.
+        잠금을 잡고 있는 동안에는 다른 프로세스가 바꿀 수 없으므로 한 번만 확인한다.
+        """
+        if self._manifest is not None and self.lock.held and self._checked == self.lock.epoch:
+            return self._manifest
+        try:
+            st = self.manifest_path.stat()
+            key = (st.st_mtime_ns, st.st_size, st.st_ino)
+        except FileNotFoundError:
+            key = None
+
+        if self._manifest is None or key != self._mkey:
+            m = None
+            if key is not None:
+                try:
+                    m = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+                except (OSError, ValueError):
+                    m = None
+            if not isinstance(m, dict) or m.get("version") != MANIFEST_VERSION:
+                m = self._empty_manifest()
+            self._manifest = m
+            self._mkey = key
+        self._check_active()
+        if self.lock.held:
+            self._checked = self.lock.epoch
+        return self._manifest
+
+    def _check_active(self) -> None:
+        """
+        봉인 중 활성 파일을 자른 뒤 manifest 를 기록하기 전에 죽으면 active_offset 이
+        파일 크기보다 큰 채로 남는다 (_drop_active_prefix 참고). 그때 파일에는 꼬리만 남아 있으므로
+        active_offset 을 0 으로 되돌린다. 메모리에서 먼저 고치고 exclusive 잠금 안에서 기록한다.
+        append 는 exclusive 잠금을 잡고 manifest() 부터 부르므로 파일이 다시 자라기 전에 기록된다.
+        """
+        m = self._manifest
+        if m["active_offset"] and m["active_offset"] > self._active_size():
+            self._manifest = dict(m, active_offset=0)
+            self._repaired = True
+        if self._repaired and self.lock.held_exclusive:
+            self._repaired = False
+            self._save_manifest(self._manifest)
+
+    def _save_manifest(self, m: Dict[str, Any]) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        _atomic_write(self.manifest_path, json.dumps(m, ensure_ascii=False).encode("utf-8"))
+        st = self.manifest_path.stat()
+        self._manifest = m
+        self._mkey = (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def segments(self) -> List[Dict[str, Any]]:
+        return self.manifest()["segments"]
+
+    def blocks(self, name: str) -> List[List[int]]:
+        b = self._blocks.get(name)
+        if b is None:
+            b = self._blocks[name] = json.loads((self.root / f"{name}.blocks").read_text(encoding="utf-8"))
+        return b
+
+    # ---- 크기 / 식별자 ----
+
+    def _active_size(self) -> int:
+        try:
+            return self.path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def size(self) -> int:
+        """논리 끝 오프셋 (봉인된 세그먼트 + 활성 세그먼트)."""
+        m = self.manifest()
+        return m["active_base"] + max(0, self._active_size() - m["active_offset"])
+
+    def disk_size(self) -> int:
+        """실제 디스크 사용량 (gzip 세그먼트 + 활성 파일)."""
+        total = self._active_size()
+        for seg in self.segments():
+            try:
+                total += self.segment_path(seg["name"]).stat().st_size
+            except FileNotFoundError:
+                pass
+        return total
+
+    def ident(self) -> str:
+        """
+        오프셋 공간의 식별자. compact(세대 변경)나 활성 파일 교체(바깥에서 지움 등) 때 바뀐다.
+        봉인은 오프셋을 바꾸지 않으므로 그대로다.
+        """
+        try:
+            ino = self.path.stat().st_ino
+        except FileNotFoundError:
+            ino = 0
+        return f"{self.manifest()['generation']}:{ino}"
+
+    # ---- 쓰기 ----
+
+    def _handle(self):
+        """열어 둔 활성 파일 핸들. 파일이 바깥에서 지워지거나 바뀌었으면 다시 연다."""
+        fh = self._fh
+        if fh is not None:
+            try:
+                if os.fstat(fh.fileno()).st_ino == os.stat(self.path).st_ino:
+                    return fh
+            except FileNotFoundError:
+                pass
+            fh.close()
+        self._fh = self.path.open("ab")
+        return self._fh
+
+    def append(self, data: bytes, *, fsync: bool = False) -> int:
+        """완결된 줄(들)을 한 번의 write 로 덧붙이고 시작 논리 오프셋을 돌려준다."""
+        with self.lock.exclusive():
+            m = self.manifest()
+            fh = self._handle()
+            phys = os.fstat(fh.fileno()).st_size
+            fh.write(data)
+            fh.flush()
+            if fsync:
+                os.fsync(fh.fileno())
+            return m["active_base"] + phys - m["active_offset"]
+
+    def sync(self) -> None:
+        if self._fh is not None:
+            self._fh.flush()
+            os.fsync(self._fh.fileno())
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+        self.lock.close()
+
+    def should_rotate(self) -> bool:
+        m = self.manifest()
+        active = self._active_size() - m["active_offset"]
+        if active <= 0:
+            return False
+        if self.max_bytes and active >= self.max_bytes:
+            return True
+        if self.max_age:
+            since = time.mktime(time.strptime(m["active_since"], "%Y-%m-%dT%H:%M:%S"))
+            return time.time() - since >= self.max_age
+        return False
+
+    def seal(self) -> Optional[Dict[str, Any]]:
+        """활성 세그먼트의 완결된 줄을 gzip 세그먼트로 옮긴다. 논리 오프셋은 그대로 유지된다."""
+        with self.lock.exclusive():
+            return self._seal()
+
+    def _seal(self) -> Optional[Dict[str, Any]]:
+        m = json.loads(json.dumps(self.manifest()))
+        if not self.path.exists():
+            return None
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        name = f"{m['generation'][:8]}-{m['next_seq']:06d}"
+        w = _SegmentWriter(self.root, name, m["active_since"])
+        try:
+            with self.path.open("rb") as f:
+                f.seek(m["active_offset"])
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    w.add(line, _parse(line))
+        except BaseException:
+            w.abort()
+            raise
+        if w.size == 0:
+            w.abort()
+            return None
+
+        seg = w.close(m["active_base"])
+        m["segments"].append(seg)
+        m["next_seq"] += 1
+        m["active_base"] += seg["size"]
+        m["active_offset"] += seg["size"]
+        m["active_since"] = _now()
+        # 1) 봉인된 바이트를 건너뛰도록 manifest 먼저 기록
+        #    (여기까지 죽으면 세그먼트 파일만 남거나 manifest 가 예전 그대로라 중복/유실 없음)
+        self._save_manifest(m)
+        # 2) 활성 파일 앞부분을 잘라낸다. 이 단계에서 죽는 경우는 _drop_active_prefix 참고
+        self._drop_active_prefix(m)
+        return seg
+
+    def _drop_active_prefix(self, m: Dict[str, Any]) -> None:
+        """
+        봉인된 앞부분(active_offset 까지)을 활성 파일에서 잘라낸다. inode 는 유지해
+        오프셋 공간 식별자(ident)가 바뀌지 않게 한다. 꼬리(아직 봉인 안 된 바이트)를 파일 앞에
+        먼저 쓰고, 그 길이로 자른 뒤, active_offset=0 을 기록한다.
+        - 자르기 전에 죽으면: 파일 크기는 그대로이고 꼬리 원본도 그대로라 manifest 대로 읽힌다
+        - 자른 뒤 기록 전에 죽으면: 파일 크기(꼬리 길이) < active_offset 이므로
+          다음 manifest() 에서 _check_active 가 active_offset 을 0 으로 되돌린다
+        꼬리가 앞부분보다 길면 앞에 쓰는 동안 원본 꼬리를 덮게 되므로 이번에는 자르지 않는다
+        (manifest 는 이미 맞고, 다음 봉인 때 다시 시도한다).
+        """
+        with self.path.open("r+b") as f:
+            f.seek(m["active_offset"])
+            tail = f.read()
+            if len(tail) >= m["active_offset"]:
+                return
+            f.seek(0)
+            f.write(tail)
+            f.flush()
+            f.truncate(len(tail))
+        m["active_offset"] = 0
+        self._save_manifest(m)
+
+    def maybe_rotate(self) -> Optional[Dict[str, Any]]:
+        with self.lock.exclusive():
+            if self.should_rotate():
+                return self._seal()
+        return None
+
+    def rewrite(self, lines: Iterable[Tuple[bytes, Optional[Dict[str, Any]]]]) -> int:
+        """
+        compact 용. 주어진 줄들로 새 세대의 봉인 세그먼트를 만들고 기존 세그먼트를 교체한다.
+        lines 는 기존 로그에서 읽으므로 교체 전까지 기존 파일은 지우지 않는다. 새 논리 크기를 돌려준다.
+        """
+        with self.lock.exclusive():
+            return self._rewrite(lines)
+
+    def _rewrite(self, lines: Iterable[Tuple[bytes, Optional[Dict[str, Any]]]]) -> int:
+        old = self.manifest()
+        gen = uuid.uuid4().hex
+        m = self._empty_manifest()
+        m["generation"] = gen
+        self.root.mkdir(parents=True, exist_ok=True)
+
+        segs: List[Dict[str, Any]] = []
+        base = 0
+        w: Optional[_SegmentWriter] = None
+        try:
+            for line, r in lines:
+                if w is None:
+                    w = _SegmentWriter(self.root, f"{gen[:8]}-{m['next_seq']:06d}", _now())
+                    m["next_seq"] += 1
+                w.add(line, r)
+                if self.max_bytes and w.size >= self.max_bytes:
+                    segs.append(w.close(base))
+                    base += segs[-1]["size"]
+                    w = None
+            if w is not None and w.size:
+                segs.append(w.close(base))
+                base += segs[-1]["size"]
+                w = None
+        except BaseException:
+            if w is not None:
+                w.abort()
+            for s in segs:
+                self._remove_segment(s["name"])
+            raise
+
+        m["segments"] = segs
+        m["active_base"] = base
+        # 기존 활성 파일 내용은 모두 새 세그먼트에 들어갔으므로 건너뛰게 한 뒤 비운다
+        m["active_offset"] = self._active_size()
+        self._save_manifest(m)
+        if self.path.exists():
+            self._drop_active_prefix(m)
+
+        keep = {s["name"] for s in segs}
+        for s in old["segments"]:
+            if s["name"] not in keep:
+                self._remove_segment(s["name"])
+        self._blocks.clear()
+        return base
+
+    def _remove_segment(self, name: str) -> None:
+        for p in (self.segment_path(name), self.root / f"{name}.blocks"):
+            if p.exists():
+                p.unlink()
+
+    def clear(self) -> None:
+        with self.lock.exclusive():
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+            if self.path.exists():
+                self.path.unlink()
+            if self.root.exists():
+                for p in self.root.iterdir():
+                    p.unlink()
+                self.root.rmdir()
+            self._manifest = None
+            self._mkey = None
+            self._blocks.clear()
+
+    # ---- 읽기 ----
+
+    def reader(self) -> LogReader:
+        return LogReader(self)
+
+    def scan_lines(
+        self,
+        start: int = 0,
+        *,
+        skip: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    ) -> Iterator[Tuple[int, bytes]]:
+        """
+        start 논리 오프셋부터 완결된 줄을 (offset, line)으로 읽는다.
+        skip(segment_summary)가 True 인 봉인 세그먼트는 풀지 않고 건너뛴다.
+
+        봉인된 세그먼트는 바뀌지 않으므로 잠금 없이 읽고, 활성 파일은 공유 잠금 안에서
+        SCAN_CHUNK 씩 읽은 뒤 잠금을 풀고 내보낸다. 그 사이 다른 프로세스가 봉인했으면
+        이어지는 부분을 새 세그먼트에서 읽는다. compact 로 세대가 바뀌면 거기서 멈춘다.
+        """
+        pos = start
+        gen = None
+        while True:
+            with self.lock.shared():
+                m = self.manifest()
+                if gen is None:
+                    gen = m["generation"]
+                elif m["generation"] != gen:
+                    return
+                chunk = self._read_active(m, pos) if pos >= m["active_base"] else b""
+
+            if pos < m["active_base"]:
+                for seg in m["segments"]:
+                    end = seg["base"] + seg["size"]
+                    if end <= pos:
+                        continue
+                    if skip is None or not skip(seg):
+                        yield from self._scan_segment(seg, pos)
+                    pos = end
+                continue
+
+            if not chunk:
+                return
+            for line in io.BytesIO(chunk):
+                yield pos, line
+                pos += len(line)
+
+    def _read_active(self, m: Dict[str, Any], pos: int) -> bytes:
+        """활성 파일에서 pos 부터 완결된 줄들을 약 SCAN_CHUNK 만큼 읽는다."""
+        if not self.path.exists():
+            return b""
+        with self.path.open("rb") as f:
+            f.seek(pos - m["active_base"] + m["active_offset"])
+            data = f.read(SCAN_CHUNK)
+            if len(data) == SCAN_CHUNK and not data.endswith(b"\n"):
+                # 덩어리 경계에 걸친 줄은 끝까지 읽는다
+                data += f.readline()
+        cut = data.rfind(b"\n")
+        return data[:cut + 1]
+
+    def _scan_segment(self, seg: Dict[str, Any], start: int) -> Iterator[Tuple[int, bytes]]:
+        try:
+            blocks = self.blocks(seg["name"])
+            f = self.segment_path(seg["name"]).open("rb")
+        except FileNotFoundError:
+            # 읽는 사이 compact 로 지워졌다. 다음 바퀴에서 세대가 바뀐 것을 보고 멈춘다
+            return
+        with f:
+            for (u, c), (u_next, c_next) in zip(blocks, blocks[1:]):
+                if seg["base"] + u_next <= start:
+                    continue
+                f.seek(c)
+                data = gzip.decompress(f.read(c_next - c))
+                off = seg["base"] + u
+                for line in io.BytesIO(data):
+                    if off >= start:
+                        yield off, line
+                    off += len(line)
+
+    def scan(
+        self,
+        start: int = 0,
+        *,
+        skip: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    ) -> Iterator[Tuple[int, int, Optional[Dict[str, Any]]]]:
+        """scan_lines 와 같되 (offset, length, record)를 돌려준다. 빈 줄/깨진 줄은 record=None."""
+        for off, line in self.scan_lines(start, skip=skip):
+            yield off, len(line), _parse(line)
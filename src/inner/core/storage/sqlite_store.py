@@ -0,0 +1,689 @@
+from __future__ import annotations
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from inner.core.artifacts import ArtifactMerger, merge_artifacts
+from inner.core.result_schema import SEVERITY_ORDER, validate_result, validate_results, ResultSchemaError
+from inner.core.storage.result_store import parse_sort
+from inner.core.storage.search_index import matches, tokenize
+from inner.core.storage.target_index import TargetIndex
+
+"""
+sqlite3 저장소. TargetStore / ResultStore 와 같은 API를 제공한다.
+
+- WAL 모드: 읽기는 쓰기를 막지 않고, 쓰기는 BEGIN IMMEDIATE 로 직렬화한다.
+- busy_timeout 동안 잠금을 기다리므로 병렬 실행(run all, pipeline)이나
+  여러 프로세스가 동시에 append 해도 "database is locked" 없이 순서대로 들어간다.
+- 연결은 스레드마다 따로 연다 (sqlite3 연결은 스레드 간 공유 불가).
+"""
+
+SCHEMA_VERSION = 4
+BUSY_TIMEOUT_MS = 10000
+IMPORT_BATCH = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS targets (
+    seq  INTEGER PRIMARY KEY AUTOINCREMENT,
+    id   TEXT NOT NULL UNIQUE,
+    data TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS results (
+    seq       INTEGER PRIMARY KEY AUTOINCREMENT,
+    result_id TEXT NOT NULL,
+    target_id TEXT,
+    module_id TEXT,
+    status    TEXT,
+    severity  TEXT,
+    timestamp TEXT,
+    artifacts TEXT,
+    data      TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS ix_results_result_id ON results(result_id);
+CREATE INDEX IF NOT EXISTS ix_results_target    ON results(target_id, module_id);
+CREATE INDEX IF NOT EXISTS ix_results_module    ON results(module_id);
+CREATE INDEX IF NOT EXISTS ix_results_status    ON results(status);
+CREATE INDEX IF NOT EXISTS ix_results_severity  ON results(severity);
+CREATE INDEX IF NOT EXISTS ix_results_timestamp ON results(timestamp);
+
+-- 타겟(+모듈)별 아티팩트 병합 결과. covered = 반영한 마지막 results.seq, module_id '' = 타겟 전체
+CREATE TABLE IF NOT EXISTS artifact_views (
+    target_id TEXT NOT NULL,
+    module_id TEXT NOT NULL,
+    covered   INTEGER NOT NULL,
+    data      TEXT NOT NULL,
+    PRIMARY KEY (target_id, module_id)
+);
+
+-- targets_version: 타겟 테이블이 바뀔 때마다 트리거가 1씩 올린다 (SqliteTargetStore 캐시 무효화용)
+-- targets_normalized: 저장된 타겟이 TargetModel.normalize 를 거쳤는지
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+_META_SCHEMA = [
+    "INSERT OR IGNORE INTO meta (key, value) VALUES ('targets_version', 0)",
+] + [
+    f"CREATE TRIGGER IF NOT EXISTS targets_version_{op.lower()} AFTER {op} ON targets BEGIN "
+    "UPDATE meta SET value = value + 1 WHERE key = 'targets_version'; END"
+    for op in ("INSERT", "UPDATE", "DELETE")
+]
+
+
+def _fts_text(row: str) -> str:
+    cols = [f"{row}.{c}" for c in ("result_id", "module_id", "target_id", "status", "severity")]
+    cols += [f"json_extract({row}.data, '$.{k}')" for k in ("title", "description", "tags")]
+    return " || ' ' || ".join(f"coalesce({c}, '')" for c in cols)
+
+
+# results search 용 FTS5 색인. 토큰 규칙은 search_index.tokenize(\w+, 소문자)와 맞춘다.
+# FTS5가 없는 sqlite 빌드에서는 만들지 않고 search()가 전체 순회로 대신한다.
+_FTS_SCHEMA = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS results_fts USING fts5("
+    "text, tokenize = \"unicode61 remove_diacritics 0 tokenchars '_'\")",
+    "CREATE TRIGGER IF NOT EXISTS results_fts_ai AFTER INSERT ON results BEGIN "
+    f"INSERT INTO results_fts (rowid, text) VALUES (new.seq, {_fts_text('new')}); END",
+    "CREATE TRIGGER IF NOT EXISTS results_fts_ad AFTER DELETE ON results BEGIN "
+    "DELETE FROM results_fts WHERE rowid = old.seq; END",
+    f"INSERT INTO results_fts (rowid, text) SELECT r.seq, {_fts_text('r')} FROM results r "
+    "WHERE r.seq NOT IN (SELECT rowid FROM results_fts)",
+]
+
+
+class SqliteDatabase:
+    """스레드별 연결과 쓰기 트랜잭션을 관리한다. 여러 저장소가 같은 파일을 공유해도 된다."""
+
+    def __init__(self, path: str = "data/inner.db"):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+        self.fts = False
+
+    def conn(self) -> sqlite3.Connection:
+        c = getattr(self._local, "conn", None)
+        if c is None:
+            c = sqlite3.connect(str(self.path), timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+            c.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+            c.execute("PRAGMA journal_mode = WAL")
+            c.execute("PRAGMA synchronous = NORMAL")
+            self._local.conn = c
+            self._ensure_schema(c)
+        return c
+
+    def _ensure_schema(self, c: sqlite3.Connection) -> None:
+        with self._init_lock:
+            if self._initialized:
+                return
+            version = c.execute("PRAGMA user_version").fetchone()[0]
+            if version < SCHEMA_VERSION:
+                c.execute("BEGIN IMMEDIATE")
+                try:
+                    for stmt in _SCHEMA.split(";"):
+                        if stmt.strip():
+                            c.execute(stmt)
+                    for stmt in _META_SCHEMA:
+                        c.execute(stmt)
+                    try:
+                        for stmt in _FTS_SCHEMA:
+                            c.execute(stmt)
+                    except sqlite3.OperationalError:
+                        pass
+                    c.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+                    c.execute("COMMIT")
+                except BaseException:
+                    c.execute("ROLLBACK")
+                    raise
+            self.fts = c.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'results_fts'"
+            ).fetchone() is not None
+            self._initialized = True
+
+    @contextmanager
+    def write(self) -> Iterator[sqlite3.Connection]:
+        """BEGIN IMMEDIATE 로 쓰기 잠금을 먼저 잡아, 동시 쓰기끼리 교착 없이 줄 세운다."""
+        c = self.conn()
+        c.execute("BEGIN IMMEDIATE")
+        try:
+            yield c
+        except BaseException:
+            c.execute("ROLLBACK")
+            raise
+        c.execute("COMMIT")
+
+    def close(self) -> None:
+        c = getattr(self._local, "conn", None)
+        if c is not None:
+            c.close()
+            self._local.conn = None
+
+
+class SqliteTargetStore:
+    """
+    TargetStore 와 같이 id/host/url/tag 색인을 메모리에 두고,
+    meta.targets_version 이 바뀌었을 때(다른 연결/프로세스가 썼을 때)만 다시 읽는다.
+    """
+
+    def __init__(self, path: str = "data/inner.db", *, db: Optional[SqliteDatabase] = None):
+        self.db = db or SqliteDatabase(path)
+        self.path = self.db.path
+        self._index = TargetIndex()
+        self._version = None
+        self._cache_lock = threading.Lock()
+
+    @staticmethod
+    def _current_version(c: sqlite3.Connection):
+        return c.execute("SELECT value FROM meta WHERE key = 'targets_version'").fetchone()[0]
+
+    def _load(self) -> TargetIndex:
+        c = self.db.conn()
+        version = self._current_version(c)
+        with self._cache_lock:
+            if version != self._version:
+                # 버전과 내용을 같은 스냅샷에서 읽는다 (이미 트랜잭션 안이면 그 스냅샷 그대로)
+                own = not c.in_transaction
+                if own:
+                    c.execute("BEGIN")
+                try:
+                    version = self._current_version(c)
+                    rows = c.execute("SELECT data FROM targets ORDER BY seq").fetchall()
+                finally:
+                    if own:
+                        c.execute("COMMIT")
+                self._index = TargetIndex(json.loads(d) for (d,) in rows)
+                self._version = version
+            return self._index
+
+    def _after_write(self, c: sqlite3.Connection, before, apply) -> None:
+        """쓰기 트랜잭션 안에서 호출. 우리 쓰기만 반영됐으면 캐시를 바로 고치고, 아니면 버린다."""
+        after = self._current_version(c)
+        with self._cache_lock:
+            if self._version is not None and before == self._version:
+                apply(self._index)
+                self._version = after
+            else:
+                self._version = None
+
+    @property
+    def normalized(self) -> bool:
+        c = self.db.conn()
+        row = c.execute("SELECT value FROM meta WHERE key = 'targets_normalized'").fetchone()
+        if row and row[0] == "1":
+            return True
+        return c.execute("SELECT 1 FROM targets LIMIT 1").fetchone() is None
+
+    def normalize_all(self, normalize: Callable[[dict], dict]) -> int:
+        """TargetStore.normalize_all 과 같다."""
+        changed = 0
+        with self.db.write() as c:
+            for tid, d in c.execute("SELECT id, data FROM targets ORDER BY seq").fetchall():
+                t = json.loads(d)
+                try:
+                    n = normalize(t)
+                except ValueError:
+                    continue
+                if n != t:
+                    c.execute(
+                        "UPDATE targets SET data = ? WHERE id = ?",
+                        (json.dumps(n, ensure_ascii=False), tid),
+                    )
+                    changed += 1
+            c.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('targets_normalized', '1')")
+        with self._cache_lock:
+            self._version = None
+        return changed
+
+    def list(self) -> list[dict]:
+        return self._load().list()
+
+    def get(self, target_id: str) -> dict | None:
+        return self._load().get(target_id)
+
+    def find(
+        self,
+        *,
+        host: Optional[str] = None,
+        url: Optional[str] = None,
+        tags: Iterable[str] = (),
+        type: Optional[str] = None,
+    ) -> list[dict]:
+        return self._load().find(host=host, url=url, tags=tags, type=type)
+
+    def select(self, query: str) -> list[dict]:
+        return self._load().select(query)
+
+    def add(self, target: dict) -> None:
+        if not target.get("id"):
+            raise ValueError("target.id is required")
+
+        try:
+            with self.db.write() as c:
+                before = self._current_version(c)
+                c.execute(
+                    "INSERT INTO targets (id, data) VALUES (?, ?)",
+                    (target["id"], json.dumps(target, ensure_ascii=False)),
+                )
+                self._after_write(c, before, lambda ix: ix.add(target))
+        except sqlite3.IntegrityError:
+            raise ValueError(f"target id already exists: {target['id']}") from None
+
+    def add_many(self, targets: Iterable[dict]) -> Tuple[int, int]:
+        """이미 있는 id는 건너뛴다. (추가, 건너뜀) 개수를 돌려준다."""
+        added = skipped = 0
+        with self.db.write() as c:
+            for t in targets:
+                if not isinstance(t, dict) or not t.get("id"):
+                    skipped += 1
+                    continue
+                cur = c.execute(
+                    "INSERT OR IGNORE INTO targets (id, data) VALUES (?, ?)",
+                    (t["id"], json.dumps(t, ensure_ascii=False)),
+                )
+                if cur.rowcount:
+                    added += 1
+                else:
+                    skipped += 1
+        with self._cache_lock:
+            self._version = None
+        return added, skipped
+
+    def update(self, target_id: str, new_target: dict) -> None:
+        if not target_id:
+            raise ValueError("target_id is required")
+        if not new_target or new_target.get("id") != target_id:
+            raise ValueError("new_target.id must match target_id")
+
+        with self.db.write() as c:
+            before = self._current_version(c)
+            cur = c.execute(
+                "UPDATE targets SET data = ? WHERE id = ?",
+                (json.dumps(new_target, ensure_ascii=False), target_id),
+            )
+            if cur.rowcount == 0:
+                raise ValueError(f"target not found: {target_id}")
+            self._after_write(c, before, lambda ix: ix.update(new_target))
+
+    def remove(self, target_id: str) -> None:
+        if not target_id:
+            raise ValueError("target_id is required")
+
+        with self.db.write() as c:
+            before = self._current_version(c)
+            cur = c.execute("DELETE FROM targets WHERE id = ?", (target_id,))
+            if cur.rowcount == 0:
+                raise ValueError(f"target not found: {target_id}")
+            self._after_write(c, before, lambda ix: ix.remove(target_id))
+
+
+class SqliteResultStore:
+    def __init__(self, path: str = "data/inner.db", *, db: Optional[SqliteDatabase] = None):
+        self.db = db or SqliteDatabase(path)
+        self.path = self.db.path
+
+    def _assign_result_id(self, result: dict) -> dict:
+        if "result_id" not in result or not result["result_id"]:
+            result["result_id"] = uuid.uuid4().hex[:12]
+        return result
+
+    @staticmethod
+    def _row(result: Dict[str, Any]) -> tuple:
+        arts = result.get("artifacts")
+        return (
+            result["result_id"],
+            result.get("target_id"),
+            result.get("module_id"),
+            result.get("status"),
+            result.get("severity"),
+            result.get("timestamp"),
+            json.dumps(arts, ensure_ascii=False) if isinstance(arts, dict) and arts else None,
+            json.dumps(result, ensure_ascii=False),
+        )
+
+    def append(self, result: Dict[str, Any], *, validated: bool = False) -> None:
+        if not validated:
+            validate_result(result)
+
+        result = self._assign_result_id(result)
+        if not result.get("timestamp"):
+            result["timestamp"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+        with self.db.write() as c:
+            c.execute(
+                "INSERT INTO results (result_id, target_id, module_id, status, severity, timestamp, artifacts, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                self._row(result),
+            )
+            if result.get("artifacts"):
+                self._refresh_views(c, [result.get("target_id")])
+
+    def append_many(
+        self, results: List[Dict[str, Any]], *, fsync: bool = False, validated: bool = False
+    ) -> int:
+        """
+        한 트랜잭션으로 여러 건을 넣는다. 하나라도 스키마가 틀리면 아무것도 넣지 않는다.
+        fsync=True 면 커밋 뒤 WAL 을 체크포인트해 디스크까지 내린다 (기본 synchronous=NORMAL).
+        validated=True 면 이미 검사한 결과로 보고 다시 검사하지 않는다.
+        """
+        if not validated:
+            validate_results(results)
+        if not results:
+            return 0
+
+        rows = []
+        for result in results:
+            result = self._assign_result_id(result)
+            if not result.get("timestamp"):
+                result["timestamp"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+            rows.append(self._row(result))
+        with self.db.write() as c:
+            c.executemany(
+                "INSERT INTO results (result_id, target_id, module_id, status, severity, timestamp, artifacts, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._refresh_views(c, [row[1] for row in rows if row[6]])
+        if fsync:
+            self.db.conn().execute("PRAGMA wal_checkpoint(FULL)")
+        return len(rows)
+
+    def sync(self) -> None:
+        self.db.conn().execute("PRAGMA wal_checkpoint(FULL)")
+
+    def close(self) -> None:
+        pass
+
+    def import_many(self, results: Iterable[Dict[str, Any]]) -> Tuple[int, int]:
+        """
+        마이그레이션용. 검증에 실패하거나 같은 result_id가 이미 있으면 건너뛴다.
+        IMPORT_BATCH 건마다 커밋해서 다른 쓰기가 오래 기다리지 않게 한다.
+        """
+        added = skipped = 0
+        batch: list = []
+
+        def _flush() -> int:
+            n = 0
+            with self.db.write() as c:
+                for row in batch:
+                    cur = c.execute(
+                        "INSERT INTO results (result_id, target_id, module_id, status, severity, timestamp, artifacts, data) "
+                        "SELECT ?, ?, ?, ?, ?, ?, ?, ? "
+                        "WHERE NOT EXISTS (SELECT 1 FROM results WHERE result_id = ?)",
+                        row + (row[0],),
+                    )
+                    n += cur.rowcount
+                self._refresh_views(c, [row[1] for row in batch if row[6]])
+            batch.clear()
+            return n
+
+        for r in results:
+            try:
+                validate_result(r)
+            except ResultSchemaError:
+                skipped += 1
+                continue
+            batch.append(self._row(self._assign_result_id(r)))
+            if len(batch) >= IMPORT_BATCH:
+                size = len(batch)
+                n = _flush()
+                added += n
+                skipped += size - n
+        if batch:
+            size = len(batch)
+            n = _flush()
+            added += n
+            skipped += size - n
+        return added, skipped
+
+    @staticmethod
+    def _time_where(since: Optional[str], until: Optional[str], where: list, params: list) -> None:
+        # ResultStore 와 같은 규칙: until 은 앞자리만 비교해 "2024-05-01" 이면 그날 전체를 포함한다
+        if since:
+            where.append("timestamp >= ?")
+            params.append(since)
+        if until:
+            where.append("substr(timestamp, 1, ?) <= ?")
+            params.extend([len(until), until])
+
+    def iter_all(
+        self,
+        *,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        target_id: Optional[str] = None,
+    ) -> Iterable[Dict[str, Any]]:
+        where: list = []
+        params: list = []
+        if target_id:
+            where.append("target_id = ?")
+            params.append(target_id)
+        self._time_where(since, until, where, params)
+        sql = "SELECT data FROM results"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        for (d,) in self.db.conn().execute(sql + " ORDER BY seq", params):
+            yield json.loads(d)
+
+    def get(self, result_id: str) -> Optional[Dict[str, Any]]:
+        if not result_id:
+            return None
+        row = self.db.conn().execute(
+            "SELECT data FROM results WHERE result_id = ? ORDER BY seq LIMIT 1", (result_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _where(
+        self,
+        target_id: Optional[str],
+        module_id: Optional[str],
+        status: Optional[str],
+        severity: Optional[str],
+        since: Optional[str],
+        until: Optional[str],
+    ) -> Tuple[str, list]:
+        where, params = [], []
+        for col, v in (("target_id", target_id), ("module_id", module_id), ("status", status), ("severity", severity)):
+            if v:
+                where.append(f"{col} = ?")
+                params.append(v)
+        self._time_where(since, until, where, params)
+        return (" WHERE " + " AND ".join(where)) if where else "", params
+
+    @staticmethod
+    def _order_by(sort: Optional[str]) -> str:
+        """ResultStore 와 같은 순서: 값이 없는 것이 앞, severity 는 NONE < ... < CRITICAL, 같으면 기록 순서."""
+        field, desc = parse_sort(sort)
+        if not field:
+            return " ORDER BY seq"
+        d = " DESC" if desc else ""
+        if field == "severity":
+            ranks = " ".join(f"WHEN '{v}' THEN {i}" for i, v in enumerate(SEVERITY_ORDER))
+            expr = f"CASE severity {ranks} ELSE -1 END"
+        else:
+            expr = field
+        return f" ORDER BY {field} IS NOT NULL{d}, {expr}{d}, seq"
+
+    def query(
+        self,
+        *,
+        target_id: Optional[str] = None,
+        module_id: Optional[str] = None,
+        status: Optional[str] = None,
+        severity: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        sort: Optional[str] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        where, params = self._where(target_id, module_id, status, severity, since, until)
+        sql = "SELECT data FROM results" + where + self._order_by(sort)
+        sql += " LIMIT ? OFFSET ?"
+        params += [-1 if limit is None else max(0, limit), max(0, offset)]
+        for (d,) in self.db.conn().execute(sql, params):
+            yield json.loads(d)
+
+    def count(
+        self,
+        *,
+        target_id: Optional[str] = None,
+        module_id: Optional[str] = None,
+        status: Optional[str] = None,
+        severity: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> int:
+        where, params = self._where(target_id, module_id, status, severity, since, until)
+        return self.db.conn().execute("SELECT COUNT(*) FROM results" + where, params).fetchone()[0]
+
+    def list(
+        self,
+        *,
+        target_id: Optional[str] = None,
+        module_id: Optional[str] = None,
+        status: Optional[str] = None,
+        severity: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        sort: Optional[str] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> list[Dict[str, Any]]:
+        return list(self.query(
+            target_id=target_id,
+            module_id=module_id,
+            status=status,
+            severity=severity,
+            since=since,
+            until=until,
+            sort=sort,
+            offset=offset,
+            limit=limit,
+        ))
+
+    def search(self, query: str) -> list[Dict[str, Any]]:
+        """단어마다 prefix 일치, 모든 단어 AND (ResultStore.search 와 같은 규칙)."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+
+        c = self.db.conn()
+        if not self.db.fts:
+            return [r for r in self.iter_all() if matches(r, terms)]
+
+        match = " ".join(f'"{t}"*' for t in terms)
+        rows = c.execute(
+            "SELECT r.data FROM results_fts f JOIN results r ON r.seq = f.rowid "
+            "WHERE results_fts MATCH ? ORDER BY r.seq",
+            (match,),
+        )
+        return [json.loads(d) for (d,) in rows]
+
+    def segments(self) -> list[Dict[str, Any]]:
+        """SQLite 는 세그먼트를 나누지 않는다 (timestamp 인덱스로 범위 조회)."""
+        return []
+
+    def seal(self) -> Optional[Dict[str, Any]]:
+        return None
+
+    def clear(self) -> None:
+        with self.db.write() as c:
+            c.execute("DELETE FROM results")
+            c.execute("DELETE FROM artifact_views")
+
+    def remove_by_id(self, result_id: str) -> int:
+        with self.db.write() as c:
+            # 병합된 아티팩트는 빼낼 수 없으므로 해당 타겟의 뷰를 지우고 같은 트랜잭션에서 다시 만든다
+            tids = [r[0] for r in c.execute(
+                "SELECT DISTINCT target_id FROM results WHERE result_id = ?", (result_id,)
+            )]
+            c.executemany("DELETE FROM artifact_views WHERE target_id = ?", [(t,) for t in tids])
+            n = c.execute("DELETE FROM results WHERE result_id = ?", (result_id,)).rowcount
+            self._refresh_views(c, tids)
+            return n
+
+    def compact(self) -> Dict[str, int]:
+        """삭제는 바로 반영되므로 여기서는 WAL을 비우고 VACUUM 으로 파일 크기만 줄인다."""
+        c = self.db.conn()
+        before = self._size()
+        c.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        c.execute("VACUUM")
+        kept = c.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        return {"kept": kept, "dropped": 0, "bytes_before": before, "bytes_after": self._size()}
+
+    def _size(self) -> int:
+        total = 0
+        for suffix in ("", "-wal"):
+            p = self.path.with_name(self.path.name + suffix)
+            if p.exists():
+                total += p.stat().st_size
+        return total
+
+    def aggregate_artifacts(
+            self,
+            target_id: str,
+            *,
+            module_id: Optional[str] = None,
+        ) -> Dict[str, Any]:
+
+        if not target_id:
+            raise ValueError("target_id is required")
+
+        # 읽기만 한다. 뷰는 쓰기 트랜잭션(append/import/remove) 안에서만 저장하므로
+        # 뷰가 없거나 뒤처져 있으면 covered 이후 결과만 이어 붙여 돌려주고 저장하지 않는다
+        _, _, merged = self._catch_up(self.db.conn(), target_id, module_id or "")
+        return merged.data
+
+    def _catch_up(self, c: sqlite3.Connection, target_id: str, mkey: str) -> Tuple[int, int, ArtifactMerger]:
+        """저장된 뷰에 covered 이후 결과를 병합한 (저장된 covered, 새 covered, merger). 뷰가 없으면 처음부터."""
+        row = c.execute(
+            "SELECT covered, data FROM artifact_views WHERE target_id = ? AND module_id = ?",
+            (target_id, mkey),
+        ).fetchone()
+        start = covered = row[0] if row else 0
+        merged = ArtifactMerger(json.loads(row[1]) if row else {})
+
+        sql = "SELECT seq, artifacts FROM results WHERE target_id = ? AND seq > ? AND artifacts IS NOT NULL"
+        params: list = [target_id, covered]
+        if mkey:
+            sql += " AND module_id = ?"
+            params.append(mkey)
+        sql += " ORDER BY seq"
+
+        for seq, a in c.execute(sql, params):
+            covered = seq
+            a = json.loads(a)
+            if a and isinstance(a, dict):
+                merged.merge(a)
+        return start, covered, merged
+
+    def _refresh_views(self, c: sqlite3.Connection, target_ids: Iterable[Optional[str]]) -> None:
+        """
+        쓰기 트랜잭션 안에서 부른다. 타겟 전체 뷰('')는 없으면 만들고, 모듈별 뷰는 이미 있는 것만 따라잡는다.
+        뷰가 최신이면 결과 조회 한 번으로 끝난다.
+        """
+        for tid in dict.fromkeys(t for t in target_ids if t):
+            mkeys = [r[0] for r in c.execute(
+                "SELECT module_id FROM artifact_views WHERE target_id = ?", (tid,)
+            )]
+            if "" not in mkeys:
+                mkeys.append("")
+            for mkey in mkeys:
+                start, covered, merged = self._catch_up(c, tid, mkey)
+                if covered == start:
+                    continue
+                c.execute(
+                    "INSERT OR REPLACE INTO artifact_views (target_id, module_id, covered, data) VALUES (?, ?, ?, ?)",
+                    (tid, mkey, covered, json.dumps(merged.data, ensure_ascii=False)),
+                )
+
+    def _deep_merge(self, base: Dict[str, Any], inc: Dict[str, Any]) -> None:
+        merge_artifacts(base, inc)
@@ -0,0 +1,143 @@
+from __future__ import annotations
+from typing import Dict, Iterable, List, Optional
+
+from inner.core.target_query import Term, norm_value, parse_query
+
+"""
+타겟 저장소가 메모리에 들고 있는 색인.
+
+    by_id           id -> target (저장 순서)
+    inv[field]      값 -> {id}   (field: host, url, tag, type, os_guess)
+
+select() 는 target_query 질의를 이 역색인으로 평가한다.
+색인이 돌려주는 dict 는 저장소 캐시와 같은 객체이므로 호출하는 쪽에서 고치면 안 된다.
+고쳐야 하면 복사해서 update 로 다시 넣는다.
+"""
+
+INDEXED = ("host", "url", "tag", "type", "os_guess")
+
+
+def _values(t: dict, field: str) -> List[str]:
+    if field == "tag":
+        tags = t.get("tags")
+        return [x for x in tags if isinstance(x, str)] if isinstance(tags, list) else []
+    if field == "os_guess":
+        v = (t.get("meta") or {}).get("os_guess") if isinstance(t.get("meta"), dict) else None
+    else:
+        v = t.get(field)
+    if not isinstance(v, str) or not v.strip():
+        return []
+    return [norm_value(field, v.strip() if field == "host" else v)]
+
+
+class TargetIndex:
+    def __init__(self, targets: Iterable[dict] = ()):
+        self.by_id: Dict[str, dict] = {}
+        self.inv: Dict[str, Dict[str, Dict[str, None]]] = {f: {} for f in INDEXED}
+        self._seq: Dict[str, int] = {}   # 저장 순서 (결과 정렬용)
+        self._next = 0
+        for t in targets:
+            self.add(t)
+
+    def _link(self, tid: str, t: dict) -> None:
+        for f in INDEXED:
+            table = self.inv[f]
+            for v in _values(t, f):
+                table.setdefault(v, {})[tid] = None
+
+    def _unlink(self, tid: str, t: dict) -> None:
+        for f in INDEXED:
+            table = self.inv[f]
+            for v in _values(t, f):
+                ids = table.get(v)
+                if ids is not None:
+                    ids.pop(tid, None)
+                    if not ids:
+                        del table[v]
+
+    def add(self, t: dict) -> None:
+        """새 타겟은 맨 뒤에 붙고, 이미 있는 id 면 제자리에서 바꾼다."""
+        tid = t.get("id")
+        if not tid:
+            return
+        old = self.by_id.get(tid)
+        if old is not None:
+            self._unlink(tid, old)
+        else:
+            self._seq[tid] = self._next
+            self._next += 1
+        self.by_id[tid] = t
+        self._link(tid, t)
+
+    update = add
+
+    def remove(self, tid: str) -> Optional[dict]:
+        t = self.by_id.pop(tid, None)
+        if t is None:
+            return None
+        self._seq.pop(tid, None)
+        self._unlink(tid, t)
+        return t
+
+    def get(self, tid: str) -> Optional[dict]:
+        return self.by_id.get(tid)
+
+    def list(self) -> List[dict]:
+        return list(self.by_id.values())
+
+    # ---- 질의 ----
+
+    def _ids(self, term: Term) -> Dict[str, None]:
+        """한 조건(값들은 OR)에 맞는 id 집합."""
+        if term.field == "id":
+            return {v: None for v in term.values if v in self.by_id}
+        table = self.inv[term.field]
+        if len(term.values) == 1:
+            return table.get(term.values[0]) or {}
+        out: Dict[str, None] = {}
+        for v in term.values:
+            out.update(table.get(v) or {})
+        return out
+
+    def select(self, query: str | List[Term]) -> List[dict]:
+        """
+        질의에 맞는 타겟을 저장소 순서대로. 긍정 조건은 작은 집합부터 교집합을 좁히고,
+        제외 조건은 마지막에 뺀다. 긍정 조건이 없을 때만 전체에서 시작한다.
+        """
+        terms = parse_query(query) if isinstance(query, str) else list(query)
+        if not terms:
+            return self.list()
+
+        pos = sorted((self._ids(t) for t in terms if not t.negate), key=len)
+        neg = [self._ids(t) for t in terms if t.negate]
+
+        if pos:
+            ids = set(pos[0])
+            for s in pos[1:]:
+                if not ids:
+                    break
+                ids &= s.keys()
+            for s in neg:
+                ids -= s.keys()
+            return [self.by_id[tid] for tid in sorted(ids, key=self._seq.__getitem__)]
+        return [t for tid, t in self.by_id.items() if not any(tid in s for s in neg)]
+
+    def find(
+        self,
+        *,
+        host: Optional[str] = None,
+        url: Optional[str] = None,
+        tags: Iterable[str] = (),
+        type: Optional[str] = None,
+    ) -> List[dict]:
+        """조건은 모두 AND. tags 는 전부 가진 타겟만. 저장 순서대로 돌려준다."""
+        terms = []
+        if host:
+            terms.append(Term("host", (norm_value("host", host.strip()),), False))
+        if url:
+            terms.append(Term("url", (url,), False))
+        for tag in tags or ():
+            terms.append(Term("tag", (tag,), False))
+        if type:
+            terms.append(Term("type", (norm_value("type", type),), False))
+        return self.select(terms)
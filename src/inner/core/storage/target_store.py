@@ -1,48 +1,150 @@
+from __future__ import annotations
 import json
+import os
+import tempfile
 from pathlib import Path
+from typing import Callable, Iterable, Optional, Tuple
+
+from inner.core.storage.target_index import TargetIndex
 
 class TargetStore:
+    """
+    targets.json 저장소. 파싱한 내용과 색인(TargetIndex)을 메모리에 두고
+    파일의 (mtime, size, inode)가 바뀌었을 때만 다시 읽는다.
+    저장은 임시 파일 + replace 로 하므로 다른 프로세스가 쓰면 inode 가 바뀌어 바로 알아챈다.
+
+    "normalized": true 인 파일의 타겟은 TargetModel.normalize 를 거친 상태로 저장되어 있어
+    읽을 때 다시 정규화하지 않는다 (예전 파일은 Scanner 가 처음 한 번 normalize_all 로 바꾼다).
+    list/get/find 가 돌려주는 dict 는 캐시와 같은 객체이므로 고치지 말 것.
+    """
+
     def __init__(self, path: str = "data/targets.json"):
         self.path = Path(path)
+        self._data: Optional[dict] = None
+        self._index = TargetIndex()
+        self._key = None
+
+    def _stat_key(self):
+        try:
+            st = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
 
     def _load(self) -> dict:
-        if not self.path.exists():
-            return {"schema_version": 1, "targets": []}
-        data = json.loads(self.path.read_text(encoding="utf-8"))
-        if "targets" not in data:
-            data["targets"] = []
-        if "schema_version" not in data:
-            data["schema_version"] = 1
+        key = self._stat_key()
+        if self._data is not None and key == self._key:
+            return self._data
+
+        if key is None:
+            data = {"schema_version": 1, "normalized": True, "targets": []}
+        else:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if "targets" not in data:
+                data["targets"] = []
+            if "schema_version" not in data:
+                data["schema_version"] = 1
+        self._data = data
+        self._index = TargetIndex(data["targets"])
+        self._key = key
         return data
 
     def _save(self, data: dict) -> None:
-        self.path.write_text(
-            json.dumps(data, ensure_ascii=False, indent=2),
-            encoding="utf-8",
-        )
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(json.dumps(data, ensure_ascii=False, indent=2))
+            os.replace(tmp, self.path)
+        finally:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+        self._data = data
+        self._key = self._stat_key()
+
+    @property
+    def normalized(self) -> bool:
+        return bool(self._load().get("normalized"))
+
+    def normalize_all(self, normalize: Callable[[dict], dict]) -> int:
+        """
+        저장된 타겟을 모두 normalize 해 다시 저장하고 "normalized" 표시를 남긴다.
+        정규화에 실패하는 타겟(예전 형식 오류)은 그대로 둔다. 바뀐 개수를 돌려준다.
+        """
+        data = self._load()
+        changed = 0
+        out = []
+        for t in data.get("targets", []):
+            try:
+                n = normalize(t)
+            except ValueError:
+                n = t
+            changed += n != t
+            out.append(n)
+        data["targets"] = out
+        data["normalized"] = True
+        self._save(data)
+        self._index = TargetIndex(out)
+        return changed
 
     def list(self) -> list[dict]:
-        return self._load().get("targets", [])
+        self._load()
+        return self._index.list()
 
     def get(self, target_id: str) -> dict | None:
-        for t in self.list():
-            if t.get("id") == target_id:
-                return t
-        return None
+        self._load()
+        return self._index.get(target_id)
+
+    def find(
+        self,
+        *,
+        host: Optional[str] = None,
+        url: Optional[str] = None,
+        tags: Iterable[str] = (),
+        type: Optional[str] = None,
+    ) -> list[dict]:
+        self._load()
+        return self._index.find(host=host, url=url, tags=tags, type=type)
+
+    def select(self, query: str) -> list[dict]:
+        """target_query 질의 (예: "tag:prod type:url"). 잘못된 질의는 TargetQueryError."""
+        self._load()
+        return self._index.select(query)
 
     def add(self, target: dict) -> None:
         if not target.get("id"):
             raise ValueError("target.id is required")
 
         data = self._load()
-        targets = data.get("targets", [])
-
-        if any(t.get("id") == target["id"] for t in targets):
+        if self._index.get(target["id"]) is not None:
             raise ValueError(f"target id already exists: {target['id']}")
 
-        targets.append(target)
-        data["targets"] = targets
+        data["targets"].append(target)
         self._save(data)
+        self._index.add(target)
+
+    def add_many(self, targets: Iterable[dict]) -> Tuple[int, int]:
+        """
+        targets 를 하나씩 받아 색인에 넣고 파일은 끝에 한 번만 쓴다.
+        이미 있는 id는 건너뛴다. (추가, 건너뜀) 개수를 돌려준다.
+        """
+        data = self._load()
+        added = skipped = 0
+        try:
+            for t in targets:
+                if not isinstance(t, dict) or not t.get("id") or self._index.get(t["id"]) is not None:
+                    skipped += 1
+                    continue
+                data["targets"].append(t)
+                self._index.add(t)
+                added += 1
+        except BaseException:
+            # 중간에 실패하면 캐시를 버리고 다음 조회 때 파일에서 다시 읽는다
+            self._data = None
+            raise
+        if added:
+            self._save(data)
+        return added, skipped
 
     def update(self, target_id: str, new_target: dict) -> None:
         if not target_id:
@@ -58,6 +160,7 @@ class TargetStore:
                 targets[i] = new_target
                 data["targets"] = targets
                 self._save(data)
+                self._index.update(new_target)
                 return
 
         raise ValueError(f"target not found: {target_id}")
@@ -75,3 +178,4 @@ class TargetStore:
 
         data["targets"] = new_targets
         self._save(data)
+        self._index.remove(target_id)
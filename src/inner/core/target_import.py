@@ -0,0 +1,214 @@
+from __future__ import annotations
+import csv
+import ipaddress
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+"""
+targets import 용 파일 읽기.
+
+형식 (format 을 안 주면 확장자로, 그래도 모르면 hosts 로 본다)
+    csv    헤더 있는 CSV. 열: id, host, url, tags(; 또는 , 구분), note, os_guess (그 밖의 열은 무시)
+    jsonl  줄마다 타겟 JSON 객체 하나
+    hosts  줄마다 host 또는 URL 하나. 빈 줄과 # 주석은 건너뛴다
+
+host 에는 CIDR(10.0.0.0/16)나 범위(10.0.0.1-10.0.0.50, 10.0.0.1-50)를 쓸 수 있다.
+전개는 필요할 때 하나씩 만들어 내므로 큰 대역도 주소 목록을 한꺼번에 메모리에 올리지 않는다.
+전개된 타겟의 id 는 주소 자체이고, 레코드에 id 가 있으면 "<id>-<주소>" 다.
+
+모든 단계는 generator 라 파일을 읽으며 바로 검증/중복 검사 후 저장소 add_many 로 흘려보낸다.
+"""
+
+FORMATS = ("csv", "jsonl", "hosts")
+MAX_EXPAND = 1 << 20        # 레코드 하나가 전개할 수 있는 최대 주소 수 (/12)
+MAX_ERRORS = 20             # 보고서에 남길 오류 줄 수
+
+_EXT = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".txt": "hosts", ".lst": "hosts"}
+
+
+class ImportReport:
+    def __init__(self):
+        self.read = 0          # 전개 후 레코드 수
+        self.added = 0
+        self.duplicates = 0
+        self.invalid = 0
+        self.errors: List[str] = []
+
+    def error(self, where: str, msg: Any) -> None:
+        self.invalid += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append(f"{where}: {msg}")
+
+
+def detect_format(path: Path) -> str:
+    return _EXT.get(path.suffix.lower(), "hosts")
+
+
+def _parse_ip(s: str):
+    try:
+        return ipaddress.ip_address(s)
+    except ValueError:
+        return None
+
+
+def expand_host(host: str) -> Iterator[str]:
+    """CIDR/범위면 주소를 하나씩, 아니면 host 그대로 내보낸다. 너무 크면 ValueError."""
+    host = host.strip()
+    if "/" in host and _parse_ip(host.split("/", 1)[0]):
+        net = ipaddress.ip_network(host, strict=False)
+        if net.num_addresses > MAX_EXPAND:
+            raise ValueError(f"network too large: {host} ({net.num_addresses} addresses, max {MAX_EXPAND})")
+        for ip in net.hosts():
+            yield str(ip)
+        return
+
+    if "-" in host:
+        left, right = host.split("-", 1)
+        start = _parse_ip(left.strip())
+        if start is not None:
+            right = right.strip()
+            if right.isdigit() and start.version == 4:
+                end = _parse_ip(".".join(left.strip().split(".")[:3] + [right]))
+            else:
+                end = _parse_ip(right)
+            if end is None or end.version != start.version or int(end) < int(start):
+                raise ValueError(f"invalid range: {host}")
+            if int(end) - int(start) + 1 > MAX_EXPAND:
+                raise ValueError(f"range too large: {host} (max {MAX_EXPAND})")
+            cls = type(start)
+            for n in range(int(start), int(end) + 1):
+                yield str(cls(n))
+            return
+
+    yield host
+
+
+def _is_pattern(host: Any) -> bool:
+    if not isinstance(host, str):
+        return False
+    head = host.split("/", 1)[0].split("-", 1)[0].strip()
+    return ("/" in host or "-" in host) and _parse_ip(head) is not None
+
+
+def expand_record(raw: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    host = raw.get("host")
+    if not _is_pattern(host):
+        yield raw
+        return
+    prefix = raw.get("id")
+    for ip in expand_host(host):
+        t = dict(raw)
+        t["host"] = ip
+        t["id"] = f"{prefix}-{ip}" if prefix else ip
+        yield t
+
+
+def _split_tags(v: Any) -> List[str]:
+    if isinstance(v, list):
+        return [str(x).strip() for x in v if str(x).strip()]
+    if not v:
+        return []
+    return [x.strip() for x in str(v).replace(";", ",").split(",") if x.strip()]
+
+
+def _read_csv(f) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    for n, row in enumerate(csv.DictReader(f), start=2):
+        # 헤더보다 필드가 많으면 DictReader 가 남는 값을 None 키에 리스트로 담는다 (따옴표 없는 쉼표 등)
+        extra = row.pop(None, None)
+        if extra:
+            yield f"line {n}", {"__error__": f"too many fields: {len(extra)} more than header"}
+            continue
+        row = {(k or "").strip().lower(): (v or "").strip() for k, v in row.items()}
+        raw: Dict[str, Any] = {
+            "id": row.get("id") or None,
+            "host": row.get("host") or None,
+            "url": row.get("url") or None,
+            "tags": _split_tags(row.get("tags")),
+        }
+        meta = {k: row[k] for k in ("note", "os_guess") if row.get(k)}
+        if meta:
+            raw["meta"] = meta
+        yield f"line {n}", raw
+
+
+def _read_jsonl(f) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    for n, line in enumerate(f, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            raw = json.loads(line)
+        except ValueError as e:
+            yield f"line {n}", {"__error__": f"invalid json: {e}"}
+            continue
+        if not isinstance(raw, dict):
+            yield f"line {n}", {"__error__": "target must be an object"}
+            continue
+        yield f"line {n}", raw
+
+
+def _read_hosts(f) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    for n, line in enumerate(f, start=1):
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        if "://" in line:
+            yield f"line {n}", {"id": line, "url": line}
+        else:
+            yield f"line {n}", {"host": line}
+
+
+_READERS = {"csv": _read_csv, "jsonl": _read_jsonl, "hosts": _read_hosts}
+
+
+def read_records(path: Path, fmt: Optional[str] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """(위치, raw target) 을 파일 순서대로. 파싱 오류는 {"__error__": 메시지} 로 넘긴다."""
+    fmt = fmt or detect_format(path)
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown format: {fmt} (allowed: {', '.join(FORMATS)})")
+    with path.open("r", encoding="utf-8-sig", newline="") as f:
+        yield from _READERS[fmt](f)
+
+
+def prepare_targets(
+    records: Iterable[Tuple[str, Dict[str, Any]]],
+    normalize: Callable[[dict], dict],
+    exists: Callable[[str], bool],
+    report: ImportReport,
+    *,
+    tags: Iterable[str] = (),
+) -> Iterator[dict]:
+    """
+    전개 -> TargetModel 검증 -> 중복 검사를 한 번에 흘려 정규화된 타겟만 내보낸다.
+    중복은 저장소에 이미 있는 id(exists) 와 이번 가져오기에서 앞서 나온 id 둘 다 본다.
+    """
+    extra = list(tags)
+    seen: set = set()
+    for where, raw in records:
+        if "__error__" in raw:
+            report.error(where, raw["__error__"])
+            continue
+        if raw.get("url") and not raw.get("id"):
+            raw = dict(raw, id=raw["url"])
+        try:
+            for r in expand_record(raw):
+                report.read += 1
+                if not r.get("id") and r.get("host"):
+                    r = dict(r, id=r["host"])
+                if extra:
+                    r = dict(r, tags=list(dict.fromkeys(_split_tags(r.get("tags")) + extra)))
+                try:
+                    t = normalize(r)
+                except ValueError as e:
+                    report.error(where, e)
+                    continue
+                tid = t["id"]
+                if tid in seen or exists(tid):
+                    report.duplicates += 1
+                    continue
+                seen.add(tid)
+                yield t
+        except ValueError as e:
+            # CIDR/범위 자체가 잘못된 경우
+            report.error(where, e)
@@ -1,10 +1,14 @@
 from __future__ import annotations
-from inner.core.target_schema import new_target
+from inner.core.target_schema import ALLOWED_PATHS, DEFAULT_TARGET
+
+# 스키마 기본값 중 raw 의 dict 와 한 단계 합치는 것 (tags 는 통째로 바꾼다)
+_AUTH = DEFAULT_TARGET["auth"]
+_META = DEFAULT_TARGET["meta"]
 
 class TargetModel:
 
     def __init__(self):
-        self.schema = new_target()
+        self.allowed_paths = ALLOWED_PATHS
 
     # --- public ---
     def normalize(self, raw: dict) -> dict:
@@ -23,7 +27,7 @@ class TargetModel:
         self._assert_patch_allowed(patch)
 
         # patch 적용
-        merged = self._deep_merge(base, patch)
+        merged = self._apply_patch(base, patch)
 
         # unset 적용
         for p in unset_paths:
@@ -37,12 +41,16 @@ class TargetModel:
 
     # --- internal ---
     def _merge_with_schema(self, raw: dict) -> dict:
-        base = new_target()
-        for k, v in (raw or {}).items():
-            if k in ("auth", "meta") and isinstance(v, dict) and isinstance(base.get(k), dict):
-                base[k].update(v)
-            else:
-                base[k] = v
+        # new_target() 에 raw 를 덮어쓰던 것과 같은 결과(같은 키 순서)를 deepcopy 없이 만든다.
+        # 기본값의 컨테이너(tags/auth/meta)만 새로 만들고 raw 의 값은 복사하지 않는다.
+        raw = raw or {}
+        base = {**DEFAULT_TARGET, **raw}
+        if "tags" not in raw:
+            base["tags"] = []
+        v = raw.get("auth", _AUTH)
+        base["auth"] = {**_AUTH, **v} if isinstance(v, dict) else v
+        v = raw.get("meta", _META)
+        base["meta"] = {**_META, **v} if isinstance(v, dict) else v
         return base
 
     def _infer_type(self, t: dict) -> None:
@@ -73,26 +81,36 @@ class TargetModel:
                 raise ValueError("auth.ssh.port must be int")
 
     # ---- schema allowlist checks ----
-    def _assert_patch_allowed(self, patch: dict) -> None:
-        for path in self._leaf_paths(patch):
-            self._assert_path_allowed(path)
-
-    def _assert_path_allowed(self, path: str) -> None:
-        cur = self.schema
-        for part in path.split("."):
-            if not isinstance(cur, dict) or part not in cur:
-                raise ValueError(f"unknown field: {path}")
-            cur = cur[part]
-
-    def _leaf_paths(self, d: dict, prefix: str = "") -> list[str]:
-        out = []
-        for k, v in (d or {}).items():
+    def _assert_patch_allowed(self, patch: dict, prefix: str = "") -> None:
+        # leaf 경로를 순서대로 훑으며 미리 만든 경로 집합에서 찾는다 (첫 번째 잘못된 leaf 에서 멈춤)
+        for k, v in (patch or {}).items():
             p = f"{prefix}.{k}" if prefix else k
             if isinstance(v, dict):
-                out.extend(self._leaf_paths(v, p))
+                self._assert_patch_allowed(v, p)
+            elif p not in self.allowed_paths:
+                raise ValueError(f"unknown field: {p}")
+
+    def _assert_path_allowed(self, path: str) -> None:
+        if path not in self.allowed_paths:
+            raise ValueError(f"unknown field: {path}")
+
+    def _apply_patch(self, base: dict, patch: dict) -> dict:
+        # _deep_merge(base, patch) 와 같은 결과. base 와 그 안의 auth/meta dict 는 _merge_with_schema 가
+        # 새로 만든 것이라 이 두 단계는 복사하지 않고 제자리에서 고친다 (더 깊은 곳은 _deep_merge 로 복사)
+        for k, v in (patch or {}).items():
+            cur = base.get(k)
+            if isinstance(v, dict) and isinstance(cur, dict):
+                if k in ("auth", "meta"):
+                    for kk, vv in v.items():
+                        if isinstance(vv, dict) and isinstance(cur.get(kk), dict):
+                            cur[kk] = self._deep_merge(cur[kk], vv)
+                        else:
+                            cur[kk] = vv
+                else:
+                    base[k] = self._deep_merge(cur, v)
             else:
-                out.append(p)
-        return out
+                base[k] = v
+        return base
 
     def _deep_merge(self, a: dict, b: dict) -> dict:
         out = dict(a)
@@ -0,0 +1,51 @@
+from __future__ import annotations
+from typing import List, NamedTuple, Tuple
+
+"""
+타겟 선택 질의.
+
+    tag:prod type:url os_guess:linux      공백으로 나눈 조건은 모두 AND
+    tag:prod,staging                      쉼표로 나눈 값은 OR
+    -tag:decom                            앞에 - 를 붙이면 제외
+
+필드: tag, type, os_guess, host, url, id
+host/type/os_guess 는 대소문자를 가리지 않고, tag/url/id 는 그대로 비교한다.
+TargetIndex 의 역색인으로 평가하므로 긍정 조건이 하나라도 있으면 전체 타겟을 훑지 않는다.
+"""
+
+FIELDS = ("tag", "type", "os_guess", "host", "url", "id")
+CASE_INSENSITIVE = ("type", "os_guess", "host")
+
+_ALIASES = {"tags": "tag", "os": "os_guess", "meta.os_guess": "os_guess"}
+
+
+class TargetQueryError(ValueError):
+    pass
+
+
+class Term(NamedTuple):
+    field: str
+    values: Tuple[str, ...]
+    negate: bool
+
+
+def norm_value(field: str, value: str) -> str:
+    return value.lower() if field in CASE_INSENSITIVE else value
+
+
+def parse_query(text: str) -> List[Term]:
+    terms: List[Term] = []
+    for tok in (text or "").split():
+        negate = tok.startswith("-")
+        body = tok[1:] if negate else tok
+        if ":" not in body:
+            raise TargetQueryError(f"invalid query term: {tok} (use field:value)")
+        field, raw = body.split(":", 1)
+        field = _ALIASES.get(field.lower(), field.lower())
+        if field not in FIELDS:
+            raise TargetQueryError(f"unknown query field: {field} (allowed: {', '.join(FIELDS)})")
+        values = tuple(norm_value(field, v) for v in raw.split(",") if v)
+        if not values:
+            raise TargetQueryError(f"empty value: {tok}")
+        terms.append(Term(field, values, negate))
+    return terms
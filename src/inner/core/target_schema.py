@@ -1,5 +1,4 @@
 from __future__ import annotations
-from copy import deepcopy
 
 SCHEMA_VERSION = 1
 
@@ -19,5 +18,25 @@ DEFAULT_TARGET: dict = {
     }
 }
 
+
+def _paths(d: dict, prefix: str = ""):
+    for k, v in d.items():
+        p = f"{prefix}.{k}" if prefix else k
+        yield p
+        if isinstance(v, dict):
+            yield from _paths(v, p)
+
+
+# 스키마에 있는 모든 경로 (중간 경로 포함: "auth", "auth.ssh", "meta.note" ...)
+ALLOWED_PATHS = frozenset(_paths(DEFAULT_TARGET))
+
+# 기본값의 dict/list 값을 가진 키. 새 타겟마다 이 컨테이너만 새로 만든다.
+# (그 안은 None 같은 불변 값뿐이라 한 단계 복사로 충분하다)
+NESTED_KEYS = tuple(k for k, v in DEFAULT_TARGET.items() if isinstance(v, (dict, list)))
+
+
 def new_target() -> dict:
-    return deepcopy(DEFAULT_TARGET)
+    t = DEFAULT_TARGET.copy()
+    for k in NESTED_KEYS:
+        t[k] = t[k].copy()
+    return t
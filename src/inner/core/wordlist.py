@@ -0,0 +1,244 @@
+from __future__ import annotations
+import hashlib
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+from array import array
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, Optional, Sequence
+
+"""
+워드리스트 로더.
+
+원본 파일을 한 줄씩 읽어 정규화("/" 접두, 주석/빈 줄 제거)와 중복 제거를 한 뒤
+바이너리 캐시로 저장하고, 이후에는 그 캐시를 mmap 해서 바로 쓴다.
+캐시 키는 (절대경로, mtime, size)이므로 원본이 바뀌면 자동으로 다시 만든다.
+
+캐시 파일 형식 (little-endian):
+    magic(8) | count(u64) | offsets[count + 1](u64) | data
+    i번째 항목 = data[offsets[i]:offsets[i + 1]] (utf-8)
+"""
+
+DEFAULT_CACHE_DIR = "data/cache/wordlists"
+MAGIC = b"INWL\x00\x00\x00\x01"
+_HEADER = struct.Struct("<8sQ")
+
+
+def normalize_word(line: str) -> Optional[str]:
+    s = line.strip()
+    if not s or s.startswith("#"):
+        return None
+    if not s.startswith("/"):
+        s = "/" + s
+    return s
+
+
+def word_hash(word: str) -> int:
+    """중복 제거용 64bit 해시 (문자열 대신 int만 set에 보관)."""
+    return int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def iter_source(path: str) -> Iterator[str]:
+    """원본 워드리스트를 정규화/중복 제거하며 스트리밍한다 (캐시 없이)."""
+    seen: set = set()
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            w = normalize_word(line)
+            if w is None:
+                continue
+            h = word_hash(w)
+            if h in seen:
+                continue
+            seen.add(h)
+            yield w
+
+
+class Wordlist:
+    """mmap 된 워드리스트 캐시. 인덱스 접근과 임의 위치부터의 순회를 지원한다."""
+
+    def __init__(self, cache_path: Path, source: str):
+        self.path = Path(cache_path)
+        self.source = source
+
+        self._offsets = None
+        self._f = self.path.open("rb")
+        self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, count = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"invalid wordlist cache: {self.path}")
+
+        self._count = count
+        off_start = _HEADER.size
+        self._data_start = off_start + (count + 1) * 8
+
+        if sys.byteorder == "little":
+            self._offsets = memoryview(self._mm)[off_start:self._data_start].cast("Q")
+        else:
+            self._offsets = array("Q", self._mm[off_start:self._data_start])
+            self._offsets.byteswap()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i: int) -> str:
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        a = self._data_start + self._offsets[i]
+        b = self._data_start + self._offsets[i + 1]
+        return self._mm[a:b].decode("utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        return self.iter_from(0)
+
+    def iter_from(self, start: int) -> Iterator[str]:
+        for i in range(max(0, start), self._count):
+            yield self[i]
+
+    def close(self) -> None:
+        if isinstance(self._offsets, memoryview):
+            self._offsets.release()
+        self._mm.close()
+        self._f.close()
+
+    def __enter__(self) -> "Wordlist":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def cache_path_for(path: str, cache_dir: str = DEFAULT_CACHE_DIR) -> Path:
+    src = Path(path).resolve()
+    st = src.stat()
+    key = hashlib.sha1(str(src).encode("utf-8")).hexdigest()[:16]
+    return Path(cache_dir) / f"{key}-{st.st_mtime_ns}-{st.st_size}.wl"
+
+
+def build_cache(path: str, cache_file: Path) -> Path:
+    """원본을 한 번 스트리밍하며 캐시 파일을 만든다. 같은 원본의 이전 캐시는 지운다."""
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+
+    offsets = array("Q", [0])
+    fd, tmp_name = tempfile.mkstemp(dir=cache_file.parent, suffix=".tmp")
+    data_name = tmp_name + ".data"
+    try:
+        with open(data_name, "wb") as data:
+            pos = 0
+            for w in iter_source(path):
+                b = w.encode("utf-8")
+                data.write(b)
+                pos += len(b)
+                offsets.append(pos)
+
+        if sys.byteorder != "little":
+            offsets.byteswap()
+
+        with os.fdopen(fd, "wb") as out:
+            out.write(_HEADER.pack(MAGIC, len(offsets) - 1))
+            out.write(offsets.tobytes())
+            with open(data_name, "rb") as data:
+                shutil.copyfileobj(data, out)
+
+        os.replace(tmp_name, cache_file)
+    finally:
+        for p in (tmp_name, data_name):
+            if os.path.exists(p):
+                os.unlink(p)
+
+    prefix = cache_file.name.split("-", 1)[0] + "-"
+    for old in cache_file.parent.glob(prefix + "*.wl"):
+        if old != cache_file:
+            try:
+                old.unlink()
+            except OSError:
+                pass
+    return cache_file
+
+
+def load_wordlist(path: str, *, cache_dir: str = DEFAULT_CACHE_DIR) -> Wordlist:
+    if not os.path.exists(path):
+        raise ValueError(f"wordlist not found: {path}")
+
+    cache_file = cache_path_for(path, cache_dir)
+    if not cache_file.exists():
+        build_cache(path, cache_file)
+    return Wordlist(cache_file, path)
+
+
+def _capitalize_last(word: str) -> str:
+    head, sep, last = word.rpartition("/")
+    return head + sep + last.capitalize()
+
+
+MUTATIONS: Dict[str, Callable[[str], str]] = {
+    "lower": str.lower,
+    "upper": str.upper,
+    "capitalize": _capitalize_last,
+}
+
+
+def normalize_extension(ext: str) -> str:
+    ext = ext.strip()
+    if ext and ext[0].isalnum():
+        return "." + ext
+    return ext
+
+
+def expand(
+    words: Iterable[str],
+    *,
+    extensions: Sequence[str] = (),
+    mutations: Sequence[str] = (),
+) -> Iterator[str]:
+    """
+    단어마다 (원형 + mutations) x ("" + extensions) 후보를 순서대로 lazy 하게 만든다.
+
+    중복 제거는 후보 전체가 아니라 이미 내보낸 stem(변형된 단어)의 해시만으로 한다.
+    후보 c가 이전 stem s와 어떤 확장자 e에 대해 c == s + e 이면 이미 나온 후보이므로,
+    메모리는 words x mutations에 비례하고 extensions 배수만큼 커지지 않는다.
+    """
+    exts = [""]
+    for e in extensions:
+        e = normalize_extension(e)
+        if e not in exts:
+            exts.append(e)
+
+    funcs = []
+    for m in mutations:
+        if m not in MUTATIONS:
+            raise ValueError(f"unknown mutation: {m} (allowed: {', '.join(MUTATIONS)})")
+        funcs.append(MUTATIONS[m])
+
+    seen_stems: set = set()
+
+    def emitted(candidate: str) -> bool:
+        for e in exts:
+            if candidate.endswith(e):
+                stem = candidate[: len(candidate) - len(e)] if e else candidate
+                if word_hash(stem) in seen_stems:
+                    return True
+        return False
+
+    for word in words:
+        stems = [word]
+        for f in funcs:
+            v = f(word)
+            if v not in stems:
+                stems.append(v)
+
+        for stem in stems:
+            h = word_hash(stem)
+            if h in seen_stems:
+                continue
+            for e in exts:
+                c = stem + e
+                if not emitted(c):
+                    yield c
+            seen_stems.add(h)
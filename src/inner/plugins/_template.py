@@ -8,6 +8,8 @@ MODULE = {
     "category": "category",
     "description": "",
     "targets": ["host", "url"],
+    "inputs": [],    # 읽는 아티팩트 경로 (예: "web.urls")
+    "outputs": [],   # 만드는 아티팩트 경로
     "options": {},
     "tags": [],
 }
@@ -0,0 +1,98 @@
+"""
+dir_bruteforce용 soft-404 / 와일드카드 응답 핑거프린트.
+
+존재하지 않을 무작위 경로를 몇 번 요청해 기준 응답을 기록하고,
+이후 응답이 그 기준과 같은 모양이면 발견(HIT)에서 제외한다.
+"""
+from __future__ import annotations
+import hashlib
+import uuid
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+LENGTH_BUCKET = 64
+CALIBRATION_LENGTHS = (8, 16, 24, 12, 20, 32)
+
+# (bucket, body_hash | None)
+_Key = Tuple[int, Optional[str]]
+
+
+class _Group:
+    """같은 (status, header_sig)를 갖는 기준 응답 묶음."""
+
+    def __init__(self):
+        self.samples: List[Tuple[int, int, Optional[str]]] = []  # (path_len, length, body_hash)
+        self.reflect = 0          # 본문이 없을 때 경로 길이 1당 증가하는 Content-Length
+        self.use_body = False     # 기준 본문 해시가 모두 같을 때만 본문 해시로 비교
+        self.keys: Set[_Key] = set()
+
+    def seal(self) -> None:
+        hashes = {h for _, _, h in self.samples}
+        self.use_body = None not in hashes and len(hashes) == 1
+
+        # 본문 없이 길이만 있을 때: 경로 길이 차이로 반사(reflection) 계수를 추정
+        if not self.use_body and len(self.samples) >= 2:
+            (l1, c1, _), (l2, c2, _) = self.samples[0], self.samples[1]
+            if l1 != l2 and (c2 - c1) % (l2 - l1) == 0 and (c2 - c1) // (l2 - l1) >= 0:
+                self.reflect = (c2 - c1) // (l2 - l1)
+
+        self.keys = {self.key(pl, length, h) for pl, length, h in self.samples}
+
+    def key(self, path_len: int, length: int, body_hash: Optional[str]) -> _Key:
+        norm = length - self.reflect * path_len
+        return norm // LENGTH_BUCKET, (body_hash if self.use_body else None)
+
+
+class Soft404Filter:
+    def __init__(self):
+        self._groups: Dict[Tuple[int, str], _Group] = {}
+
+    def __len__(self) -> int:
+        return sum(len(g.keys) for g in self._groups.values())
+
+    @staticmethod
+    def random_paths(count: int) -> List[str]:
+        return [
+            "/" + (uuid.uuid4().hex * 2)[: CALIBRATION_LENGTHS[i % len(CALIBRATION_LENGTHS)]]
+            for i in range(count)
+        ]
+
+    def calibrate(self, samples: Iterable[Tuple[str, int, dict, int, Optional[bytes]]]) -> None:
+        """samples: (path, status, headers, content_length, body | None)"""
+        for path, status, headers, length, body in samples:
+            sig, norm_len, h = self._shape(path, headers, length, body)
+            g = self._groups.setdefault((status, sig), _Group())
+            g.samples.append((len(path), norm_len, h))
+
+        for g in self._groups.values():
+            g.seal()
+
+    def matches(self, path: str, status: int, headers: dict, length: int, body: Optional[bytes]) -> bool:
+        """기준 응답과 같은 모양이면 True. 그룹 조회 + 최대 3번의 set 조회로 끝난다."""
+        if not self._groups:
+            return False
+
+        sig, norm_len, h = self._shape(path, headers, length, body)
+        g = self._groups.get((status, sig))
+        if g is None:
+            return False
+
+        bucket, bh = g.key(len(path), norm_len, h)
+        return any((b, bh) in g.keys for b in (bucket - 1, bucket, bucket + 1))
+
+    # --- internal ---
+    def _shape(self, path: str, headers: dict, length: int, body: Optional[bytes]):
+        token = path.strip("/")
+
+        ctype = (headers.get("Content-Type") or "").split(";", 1)[0].strip().lower()
+        location = headers.get("Location") or ""
+        if token:
+            location = location.replace(token, "{p}")
+        sig = f"{ctype}|{location}"
+
+        if body is None:
+            return sig, length, None
+
+        # 본문에 요청 경로가 반사되는 경우를 제거한 뒤 길이/해시를 잰다
+        if token:
+            body = body.replace(token.encode("utf-8", errors="ignore"), b"")
+        return sig, len(body), hashlib.blake2b(body, digest_size=8).hexdigest()
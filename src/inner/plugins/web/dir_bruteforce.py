@@ -1,7 +1,12 @@
 from __future__ import annotations
 from typing import Any, Dict, List
-from urllib.parse import urljoin
-import os
+from urllib.parse import urljoin, urlsplit
+import hashlib
+import json
+
+from inner.core.pool import ordered_map
+from inner.core.wordlist import expand, load_wordlist, word_hash
+from inner.plugins.web._soft404 import Soft404Filter
 
 MODULE = {
     "id": "web/dir_bruteforce",
@@ -10,6 +15,8 @@ MODULE = {
     "description": "Discover common directories/files using a wordlist.",
     "transport": ["http"],
     "targets": ["url", "host"],
+    "inputs": [],
+    "outputs": ["web.urls"],
 
     "options": {
         "base_url": {
@@ -24,6 +31,18 @@ MODULE = {
             "default": "data/wordlists/common.txt",
             "help": "브루트포싱할 경로 워드리스트 파일"
         },
+        "extensions": {
+            "type": "list[str]",
+            "required": False,
+            "default": [],
+            "help": "단어마다 추가로 붙여 볼 확장자 (예: .php,.bak,.old,/) - 원래 단어는 항상 포함"
+        },
+        "mutations": {
+            "type": "list[str]",
+            "required": False,
+            "default": [],
+            "help": "대소문자 변형: lower, upper, capitalize"
+        },
         "timeout": {
             "type": "int",
             "required": False,
@@ -42,6 +61,84 @@ MODULE = {
             "default": 50,
             "help": "최대 발견 개수 제한"
         },
+        "threads": {
+            "type": "int",
+            "required": False,
+            "default": 1,
+            "help": "동시 요청 워커 수 (HttpClient 세션 공유)"
+        },
+        "rate_limit": {
+            "type": "int",
+            "required": False,
+            "default": 0,
+            "help": "호스트별 초당 최대 요청 수 (0이면 제한 없음)"
+        },
+        "burst": {
+            "type": "int",
+            "required": False,
+            "default": 1,
+            "help": "rate_limit 토큰 버킷의 최대 버스트 크기"
+        },
+        "adaptive": {
+            "type": "bool",
+            "required": False,
+            "default": False,
+            "help": "true면 지연(p95)과 429/503 응답에 따라 동시 요청 수를 threads 이내에서 자동 조절"
+        },
+        "keep_alive": {
+            "type": "bool",
+            "required": False,
+            "default": True,
+            "help": "false면 요청마다 커넥션을 닫음 (Connection: close)"
+        },
+        "retries": {
+            "type": "int",
+            "required": False,
+            "default": 0,
+            "help": "연결 오류/5xx 응답 재시도 횟수"
+        },
+        "backoff": {
+            "type": "float",
+            "required": False,
+            "default": 0.0,
+            "help": "재시도 지수 백오프 계수(초)"
+        },
+        "probe": {
+            "type": "str",
+            "required": False,
+            "default": "get",
+            "help": "요청 방식: get | head(405/501이면 GET 재시도) | stream(헤더와 작은 본문만 받음, 본문이 크면 연결을 끊고 다음 요청에서 다시 연결)"
+        },
+        "calibrate": {
+            "type": "int",
+            "required": False,
+            "default": 3,
+            "help": "soft-404 기준 응답을 잡기 위한 무작위 경로 요청 수 (0이면 비활성화)"
+        },
+        "recursive": {
+            "type": "bool",
+            "required": False,
+            "default": False,
+            "help": "true면 발견한 디렉터리(3xx -> 슬래시, 403 등)를 BFS로 재귀 탐색"
+        },
+        "max_depth": {
+            "type": "int",
+            "required": False,
+            "default": 2,
+            "help": "재귀 탐색 최대 깊이 (base_url 바로 아래가 0)"
+        },
+        "resume": {
+            "type": "bool",
+            "required": False,
+            "default": False,
+            "help": "true면 같은 설정으로 중단된 이전 실행의 체크포인트부터 이어서 실행"
+        },
+        "checkpoint_every": {
+            "type": "int",
+            "required": False,
+            "default": 500,
+            "help": "N개 후보를 처리할 때마다 체크포인트 저장 (0이면 중단 시에만 저장)"
+        },
         "dry_run": {
             "type": "bool",
             "required": False,
@@ -72,20 +169,84 @@ def _infer_base_url(target: Dict[str, Any], opt_base: str) -> str:
     return ""
 
 
-def _read_wordlist(path: str) -> List[str]:
-    if not os.path.exists(path):
-        raise ValueError(f"wordlist not found: {path}")
+PROBE_MODES = ("get", "head", "stream")
+HEAD_FALLBACK_STATUS = {405, 501}
+STREAM_DRAIN_LIMIT = 1024
+REDIRECT_STATUS = {"301", "302", "307", "308"}
+
+def _probe(http, url: str, mode: str):
+    """
+    (response, 수신 바이트, 본문 | None)을 반환한다.
+    head/stream 모드에서 본문을 받지 않았으면 본문은 None이다.
+    """
+    if mode == "head":
+        r = http.head(url, allow_redirects=False)
+        if r.status_code not in HEAD_FALLBACK_STATUS:
+            return r, http.response_bytes(r), None
+        used = http.response_bytes(r)
+        r = http.get(url, allow_redirects=False)
+        return r, used + http.response_bytes(r, r.content), r.content
+
+    if mode == "stream":
+        r = http.get(url, allow_redirects=False, stream=True)
+        try:
+            body = _drain(r, STREAM_DRAIN_LIMIT)
+            return r, http.response_bytes(r, body), body
+        finally:
+            r.close()
 
-    words: List[str] = []
-    with open(path, "r", encoding="utf-8", errors="ignore") as f:
-        for line in f:
-            s = line.strip()
-            if not s or s.startswith("#"):
-                continue
-            if not s.startswith("/"):
-                s = "/" + s
-            words.append(s)
-    return words
+    r = http.get(url, allow_redirects=False)
+    return r, http.response_bytes(r, r.content), r.content
+
+def _drain(r, limit: int):
+    """
+    stream 응답의 본문을 limit 바이트까지만 읽는다. 끝까지 읽었으면 본문을, 더 길면 None 을 돌려준다.
+    끝까지 읽은 응답은 close 해도 커넥션이 keep-alive 풀로 돌아간다.
+    limit 보다 긴 본문(Content-Length 로 미리 알거나 읽다가 넘친 경우)은 나머지를 받지 않고
+    연결을 끊으므로, 그 요청 다음에는 새 연결을 하나 연다 (큰 catch-all 페이지를 받는 것보다 싸다).
+    """
+    size = r.headers.get("Content-Length", "")
+    if size.isdigit() and int(size) > limit:
+        return None
+    buf = bytearray()
+    for chunk in r.iter_content(chunk_size=limit + 1):
+        buf += chunk
+        if len(buf) > limit:
+            return None
+    return bytes(buf)
+
+def _shape(url: str, r, body):
+    """Soft404Filter 입력 형태: (path, status, headers, length, body)"""
+    length = len(body) if body is not None else int(r.headers.get("Content-Length") or 0)
+    return urlsplit(url).path, r.status_code, r.headers, length, body
+
+def _as_directory(full: str, code: str, location) -> str:
+    """
+    디렉터리로 보이는 응답이면 "/"로 끝나는 디렉터리 URL을, 아니면 ""를 반환한다.
+      - 3xx 이면서 Location이 같은 경로 + "/" 를 가리킴
+      - 403 이면서 마지막 경로 조각에 확장자가 없음
+      - 200/403 이면서 요청 URL 자체가 "/"로 끝남
+    """
+    slashed = full.rstrip("/") + "/"
+    if code in REDIRECT_STATUS:
+        if location and urljoin(full, location).split("?", 1)[0] == slashed:
+            return slashed
+        return ""
+    if code in ("200", "403") and full.endswith("/"):
+        return full
+    if code == "403" and "." not in urlsplit(full).path.rsplit("/", 1)[-1]:
+        return slashed
+    return ""
+
+def _signature(base_url: str, words, allow_set, probe_mode: str, extensions, mutations,
+               recursive: bool, max_depth: int) -> str:
+    """체크포인트가 같은 조건의 실행에서 나온 것인지 확인하기 위한 키."""
+    raw = json.dumps(
+        [base_url, str(words.path), sorted(allow_set), probe_mode, extensions, mutations,
+         recursive, max_depth],
+        ensure_ascii=False,
+    )
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
 
 def run(ctx: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -93,6 +254,7 @@ def run(ctx: Dict[str, Any]) -> Dict[str, Any]:
       - target
       - options
       - clients["http"]
+      - checkpoint (optional, resume용)
       - artifacts (unused here)
     """
 
@@ -124,36 +286,189 @@ def run(ctx: Dict[str, Any]) -> Dict[str, Any]:
     allow_set = {str(x) for x in (options.get("status_allow") or [])}
     max_hits = int(options.get("max_hits", 50))
     dry_run = bool(options.get("dry_run", False))
+    threads = max(1, int(options.get("threads", 1) or 1))
+    probe_mode = str(options.get("probe") or "get").strip().lower()
+    calibrate = max(0, int(options.get("calibrate", 3) or 0))
+    if probe_mode not in PROBE_MODES:
+        raise ValueError(f"invalid probe mode: {probe_mode} (allowed: {', '.join(PROBE_MODES)})")
+
+    resume = bool(options.get("resume", False))
+    checkpoint_every = max(0, int(options.get("checkpoint_every", 500) or 0))
+    checkpoint = ctx.get("checkpoint")
 
-    words = _read_wordlist(wordlist_path)
+    recursive = bool(options.get("recursive", False))
+    max_depth = max(0, int(options.get("max_depth", 2) or 0))
 
-    hits: List[str] = []
-    evidence: List[str] = [
+    extensions = [str(x) for x in (options.get("extensions") or [])]
+    mutations = [str(x).strip().lower() for x in (options.get("mutations") or [])]
+
+    words = load_wordlist(wordlist_path)
+
+    header: List[str] = [
         f"base_url={base_url}",
         f"wordlist={wordlist_path}",
+        f"words={len(words)}",
+        f"extensions={','.join(extensions)}",
+        f"mutations={','.join(mutations)}",
         f"max_hits={max_hits}",
         f"dry_run={dry_run}",
+        f"threads={threads}",
+        f"probe={probe_mode}",
+        f"recursive={recursive} max_depth={max_depth}",
     ]
 
-    for path in words:
-        if len(hits) >= max_hits:
-            break
+    root = base_url.rstrip("/") + "/"
+
+    # 체크포인트로 저장/복원되는 진행 상태.
+    # BFS 단계(depth)별로 frontier 디렉터리 x 후보를 처리하며, cursor는 현재 단계에서 처리 완료한 요청 수다.
+    # done 은 앞 단계에서 다 훑은 디렉터리들로, 재개할 때 visited/known_dirs 를 다시 만드는 데 쓴다.
+    scan: Dict[str, Any] = {
+        "signature": _signature(
+            base_url, words, allow_set, probe_mode, extensions, mutations, recursive, max_depth
+        ),
+        "depth": 0,
+        "frontier": [root],
+        "next": [],
+        "done": [],
+        "cursor": 0,
+        "hits": [],
+        "found": [],
+        "calibrated": {},
+        "errors": 0,
+        "probes": 0,
+        "bytes_total": 0,
+        "wildcard_filtered": 0,
+    }
+    resumed_from = 0
+    if resume and checkpoint is not None:
+        saved = checkpoint.load()
+        if saved and saved.get("signature") == scan["signature"]:
+            scan.update(saved)
+            resumed_from = scan["probes"]
+            header.append(f"resumed_from={resumed_from}")
+
+    hits: List[str] = scan["hits"]
+    found: List[str] = scan["found"]
 
-        full = urljoin(base_url.rstrip("/") + "/", path.lstrip("/"))
+    filters: Dict[str, Soft404Filter] = {}
+    visited: set = set()                                   # 요청한 URL의 64bit 해시
+    known_dirs = {root, *scan["done"], *scan["frontier"], *scan["next"]}
 
-        if dry_run:
-            continue
+    # 재개: 앞 단계에서 요청한 URL 도 visited 에 넣어 둔다 (요청 없이 해시만 다시 계산).
+    # 현재 단계의 이미 처리한 부분은 jobs 가 skip 으로 복원한다.
+    for d in scan["done"]:
+        for c in expand(words, extensions=extensions, mutations=mutations):
+            visited.add(word_hash(urljoin(d, c.lstrip("/"))))
 
+    def calibrate_dir(d: str) -> Soft404Filter:
+        f = Soft404Filter()
+        if calibrate > 0:
+            samples = []
+            for path in Soft404Filter.random_paths(calibrate):
+                full = urljoin(d, path.lstrip("/"))
+                try:
+                    r, n, body = _probe(http, full, probe_mode)
+                except Exception as e:
+                    header.append(f"ERR {full} {type(e).__name__}")
+                    continue
+                scan["bytes_total"] += n
+                samples.append(_shape(full, r, body))
+            f.calibrate(samples)
+            scan["calibrated"][d] = len(f)
+        filters[d] = f
+        return f
+
+    def jobs(dirs: List[str], skip: int):
+        """
+        (dir, url)을 BFS 순서로 생성한다. 이미 요청한 URL은 건너뛴다.
+        재개 시 앞의 skip개는 요청 없이 흘려보내며 visited만 복원한다.
+        soft-404 보정은 디렉터리의 첫 요청 직전에 (소비 스레드에서) 한 번 수행한다.
+        """
+        n = 0
+        for d in dirs:
+            for c in expand(words, extensions=extensions, mutations=mutations):
+                full = urljoin(d, c.lstrip("/"))
+                h = word_hash(full)
+                if h in visited:
+                    continue
+                visited.add(h)
+
+                n += 1
+                if n <= skip:
+                    continue
+                if d not in filters:
+                    calibrate_dir(d)
+                yield d, full
+
+    def probe(job):
+        d, full = job
         try:
-            r = http.get(full, allow_redirects=False)
+            r, n, body = _probe(http, full, probe_mode)
             code = str(r.status_code)
+            wild = code in allow_set and filters[d].matches(*_shape(full, r, body))
+            return code, n, wild, r.headers.get("Location"), None
+        except Exception as e:
+            return None, 0, False, None, e
 
-            if code in allow_set:
-                hits.append(full)
-                evidence.append(f"HIT {code} {full}")
+    results = None
+    try:
+        while not dry_run and len(hits) < max_hits and scan["frontier"]:
+            # 결과는 생성 순서대로 소비되므로 max_hits 도달 시점과 다음 단계 frontier 순서가 결정적이다.
+            results = ordered_map(probe, jobs(scan["frontier"], scan["cursor"]), workers=threads)
+            for _, (d, full), (code, n, wild, location, err) in results:
+                scan["cursor"] += 1
+                scan["probes"] += 1
+                scan["bytes_total"] += n
 
-        except Exception as e:
-            evidence.append(f"ERR {full} {type(e).__name__}")
+                if err is not None:
+                    scan["errors"] += 1
+                    found.append(f"ERR {full} {type(err).__name__}")
+                elif wild:
+                    scan["wildcard_filtered"] += 1
+                elif code in allow_set:
+                    hits.append(full)
+                    found.append(f"HIT {code} {full}")
+
+                    child = _as_directory(full, code, location)
+                    if recursive and child and scan["depth"] < max_depth and child not in known_dirs:
+                        known_dirs.add(child)
+                        scan["next"].append(child)
+                        found.append(f"DIR depth={scan['depth'] + 1} {child}")
+
+                if len(hits) >= max_hits:
+                    break
+
+                if checkpoint is not None and checkpoint_every and scan["probes"] % checkpoint_every == 0:
+                    checkpoint.save(scan)
+
+            results.close()
+            results = None
+
+            if len(hits) >= max_hits or not scan["next"]:
+                break
+            scan["depth"] += 1
+            scan["done"].extend(scan["frontier"])
+            scan["frontier"], scan["next"], scan["cursor"] = scan["next"], [], 0
+
+    except BaseException:
+        # Ctrl-C / 크래시 시 마지막으로 처리한 위치까지 저장해 resume=true로 이어서 실행
+        if checkpoint is not None and not dry_run and scan["probes"] > resumed_from:
+            checkpoint.save(scan)
+        raise
+    else:
+        if checkpoint is not None and not dry_run:
+            checkpoint.clear()
+    finally:
+        if results is not None:
+            results.close()
+        words.close()
+
+    for d, count in scan["calibrated"].items():
+        header.append(f"calibrate={calibrate} dir={d} fingerprints={count}")
+
+    evidence = header + found
+    probes = scan["probes"]
+    bytes_total = scan["bytes_total"]
 
     status = "PASS"
     severity = "NONE"
@@ -184,9 +499,27 @@ def run(ctx: Dict[str, Any]) -> Dict[str, Any]:
         "meta": {
             "base_url": base_url,
             "hits": len(hits),
+            "threads": threads,
+            "probe": probe_mode,
+            "probes": probes,
+            "bytes_total": bytes_total,
+            "bytes_per_probe": round(bytes_total / probes, 1) if probes else 0,
+            "wildcard_filtered": scan["wildcard_filtered"],
+            "errors": scan["errors"],
+            "resumed_from": resumed_from,
+            "depth": scan["depth"],
+            "dirs": len(known_dirs),
         },
     }
 
+    limits = http.limiter_stats() if hasattr(http, "limiter_stats") else {}
+    if limits:
+        result["meta"]["limits"] = limits
+
+    pools = http.pool_stats() if hasattr(http, "pool_stats") else {}
+    if pools:
+        result["meta"]["pools"] = pools
+
     if hits:
         result["artifacts"] = {
             "web": {